@@ -0,0 +1,133 @@
+"""
+Per-call cost of building statements on every call against reusing a cached
+statement with bind parameters, as AsyncCrud and the use-case queries do.
+
+    python benchmarks/statement_cache.py [iterations]
+
+"build" measures the Python side only, the statement construction plus the
+cache key lookup SQLAlchemy does before using its compiled cache. "execute"
+runs them through an ORM session on in-memory SQLite, with a stand-in model
+since the persistence models use Postgres server defaults.
+"""
+
+import sys
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import String, bindparam, create_engine, select, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from bakery_ecommerce.internal.store.persistence.product import Product
+from bakery_ecommerce.internal.store.statement_cache import StatementCache
+
+
+class Base(DeclarativeBase): ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+    price: Mapped[int]
+
+
+def timed(name: str, iterations: int, fn: Callable[[int], object]) -> float:
+    for i in range(min(iterations, 1000)):
+        fn(i)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+
+    print(f"{name:<40} {per_call_us:>10.2f} us/call")
+    return per_call_us
+
+
+def build(iterations: int):
+    cache = StatementCache()
+
+    def select_per_call(_: int):
+        stmt = select(Product).where(getattr(Product, "id") == uuid.uuid4())
+        stmt._generate_cache_key()
+
+    def select_cached(_: int):
+        stmt = cache.get(
+            (Product, "get_one_by_field", "id"),
+            lambda: select(Product).where(getattr(Product, "id") == bindparam("value")),
+        )
+        stmt._generate_cache_key()
+
+    def update_per_call(_: int):
+        stmt = (
+            update(Product)
+            .where(getattr(Product, "id") == uuid.uuid4())
+            .values({"name": "name", "price": 10})
+            .returning(Product)
+        )
+        stmt._generate_cache_key()
+
+    def update_cached(_: int):
+        stmt = cache.get(
+            (Product, "update_partial", "id", ("name", "price")),
+            lambda: update(Product)
+            .where(getattr(Product, "id") == bindparam("id_value"))
+            .values({"name": bindparam("set_name"), "price": bindparam("set_price")})
+            .returning(Product),
+        )
+        stmt._generate_cache_key()
+
+    print("build")
+    report(
+        timed("  select per call", iterations, select_per_call),
+        timed("  select cached", iterations, select_cached),
+    )
+    report(
+        timed("  update per call", iterations, update_per_call),
+        timed("  update cached", iterations, update_cached),
+    )
+
+
+def execute(iterations: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    ids = [uuid.uuid4() for _ in range(100)]
+    with Session(engine) as session:
+        session.add_all([Item(id=id, name=str(id), price=1) for id in ids])
+        session.commit()
+
+    cache = StatementCache()
+
+    with Session(engine) as session:
+
+        def per_call(i: int):
+            stmt = select(Item).where(getattr(Item, "id") == ids[i % len(ids)])
+            session.execute(stmt).scalar_one()
+            session.expunge_all()
+
+        def cached(i: int):
+            stmt = cache.get(
+                (Item, "get_one_by_field", "id"),
+                lambda: select(Item).where(getattr(Item, "id") == bindparam("value")),
+            )
+            session.execute(stmt, {"value": ids[i % len(ids)]}).scalar_one()
+            session.expunge_all()
+
+        print("execute")
+        report(
+            timed("  select per call", iterations, per_call),
+            timed("  select cached", iterations, cached),
+        )
+
+
+def report(before: float, after: float):
+    print(f"{'  saved':<40} {before - after:>10.2f} us/call")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    build(iterations)
+    execute(iterations)
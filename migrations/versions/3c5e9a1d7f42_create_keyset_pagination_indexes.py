@@ -0,0 +1,31 @@
+"""create keyset pagination indexes
+
+Revision ID: 3c5e9a1d7f42
+Revises: 6dba110440f9
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5e9a1d7f42"
+down_revision: Union[str, None] = "6dba110440f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+products_created_at_id = "idx_products_created_at_id"
+orders_user_id_id = "idx_orders_user_id_id"
+
+
+def upgrade() -> None:
+    op.create_index(products_created_at_id, "products", ["created_at", "id"])
+    op.create_index(orders_user_id_id, "orders", ["user_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index(orders_user_id_id, table_name="orders")
+    op.drop_index(products_created_at_id, table_name="products")
@@ -0,0 +1,57 @@
+"""add orders timestamps and admin listing indexes
+
+Revision ID: 8b1f4d2c6e93
+Revises: 3c5e9a1d7f42
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b1f4d2c6e93"
+down_revision: Union[str, None] = "3c5e9a1d7f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+orders = "orders"
+orders_created_at_id = "idx_orders_created_at_id"
+orders_status_created_at_id = "idx_orders_order_status_created_at_id"
+
+
+def upgrade() -> None:
+    op.add_column(
+        orders,
+        sa.Column(
+            "created_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.add_column(
+        orders,
+        sa.Column(
+            "updated_at",
+            sa.DateTime,
+            nullable=True,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+    op.create_index(orders_created_at_id, orders, ["created_at", "id"])
+    op.create_index(
+        orders_status_created_at_id, orders, ["order_status", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(orders_status_created_at_id, table_name=orders)
+    op.drop_index(orders_created_at_id, table_name=orders)
+
+    op.drop_column(orders, "updated_at")
+    op.drop_column(orders, "created_at")
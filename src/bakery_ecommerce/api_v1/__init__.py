@@ -6,3 +6,5 @@ from . import cart as cart
 from . import payment as payment
 from . import order as order
 from . import image as image
+from . import health as health
+from . import metrics as metrics
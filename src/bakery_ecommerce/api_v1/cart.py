@@ -8,7 +8,7 @@ from bakery_ecommerce.composable import Composable, set_key
 from bakery_ecommerce.context_bus import (
     ContextBus,
     ContextEventProtocol,
-    ContextExecutor,
+    ContextGraph,
     impl_event,
 )
 from bakery_ecommerce import dependencies
@@ -37,14 +37,14 @@ from bakery_ecommerce.token_middleware import verify_access_token
 api = APIRouter()
 
 
+_get_cart_graph = ContextGraph[GetUserCart]().on(GetUserCartEvent, GetUserCart.execute)
+
+
 def _get_cart_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_user_cart = GetUserCart(context, queries)
-    return context | ContextExecutor(
-        GetUserCartEvent, lambda e: get_user_cart.execute(e)
-    )
+    return context.bind(_get_cart_graph, GetUserCart(context, queries))
 
 
 @api.get(path="/", dependencies=[Depends(verify_access_token)])
@@ -82,26 +82,24 @@ class AddCartItemComposableEvent:
         return self
 
 
-def _add_cart_item_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    _get_user_cart = GetUserCart(context, queries)
-    _user_cart_add_cart_item = UserCartAddCartItem(queries)
-    _get_product_by_id = GetProductById(context, queries)
-
-    root_event: AddCartItemComposableEvent
+class _AddCartItemFlow:
+    def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
+        self.context = context
+        self.get_user_cart = GetUserCart(context, queries)
+        self.user_cart_add_cart_item = UserCartAddCartItem(queries)
+        self.get_product_by_id = GetProductById(context, queries)
+        self.root_event: AddCartItemComposableEvent
 
-    async def publish_get_user_cart_event(e: AddCartItemComposableEvent):
-        nonlocal root_event
-        root_event = e
-        await context.publish(GetUserCartEvent(e.user_id))
-        await context.publish(GetProductByIdEvent(e.product_id))
+    async def publish_get_user_cart_event(self, e: AddCartItemComposableEvent):
+        self.root_event = e
+        await self.context.publish(GetUserCartEvent(e.user_id))
+        await self.context.publish(GetProductByIdEvent(e.product_id))
 
-    async def addCartItemComposableWaiter(
+    async def add_cart_item_composable_waiter(
+        self,
         e: UserCartRetrievedEvent | ProductByIdRetrievedEvent,
     ):
-        nonlocal root_event
+        root_event = self.root_event
 
         if isinstance(e, UserCartRetrievedEvent):
             root_event.cart = e.cart
@@ -110,7 +108,7 @@ def _add_cart_item_request__context_bus(
             root_event.product = e.product
 
         if root_event.product and root_event.cart:
-            await context.publish(
+            await self.context.publish(
                 UserCartAddCartItemEvent(
                     quantity=root_event.quantity,
                     user_id=root_event.user_id,
@@ -119,15 +117,26 @@ def _add_cart_item_request__context_bus(
                 )
             )
 
-    return (
-        context
-        | ContextExecutor(AddCartItemComposableEvent, publish_get_user_cart_event)
-        | ContextExecutor(GetUserCartEvent, _get_user_cart.execute)
-        | ContextExecutor(GetProductByIdEvent, _get_product_by_id.execute)
-        | ContextExecutor(UserCartRetrievedEvent, addCartItemComposableWaiter)
-        | ContextExecutor(ProductByIdRetrievedEvent, addCartItemComposableWaiter)
-        | ContextExecutor(UserCartAddCartItemEvent, _user_cart_add_cart_item.execute)
+
+_add_cart_item_graph = (
+    ContextGraph[_AddCartItemFlow]()
+    .on(AddCartItemComposableEvent, _AddCartItemFlow.publish_get_user_cart_event)
+    .on(GetUserCartEvent, lambda flow, e: flow.get_user_cart.execute(e))
+    .on(GetProductByIdEvent, lambda flow, e: flow.get_product_by_id.execute(e))
+    .on(UserCartRetrievedEvent, _AddCartItemFlow.add_cart_item_composable_waiter)
+    .on(ProductByIdRetrievedEvent, _AddCartItemFlow.add_cart_item_composable_waiter)
+    .on(
+        UserCartAddCartItemEvent,
+        lambda flow, e: flow.user_cart_add_cart_item.execute(e),
     )
+)
+
+
+def _add_cart_item_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_add_cart_item_graph, _AddCartItemFlow(context, queries))
 
 
 class AddCartItemRequestBody(BaseModel):
@@ -176,38 +185,43 @@ class DeleteCartItemEvent:
         return self
 
 
-def delete_cart_item_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    _get_user_cart = GetUserCart(context, queries)
-    _user_cart_delete_cart_item = UserCartDeleteCartItem(queries)
-
-    root_event: DeleteCartItemEvent
+class _DeleteCartItemFlow:
+    def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
+        self.context = context
+        self.get_user_cart = GetUserCart(context, queries)
+        self.user_cart_delete_cart_item = UserCartDeleteCartItem(queries)
+        self.root_event: DeleteCartItemEvent
 
-    async def dispatch(e: DeleteCartItemEvent):
-        nonlocal root_event
-        root_event = e
-        await context.publish(GetUserCartEvent(user_id=e.user_id))
+    async def dispatch(self, e: DeleteCartItemEvent):
+        self.root_event = e
+        await self.context.publish(GetUserCartEvent(user_id=e.user_id))
 
-    async def waiter(e: UserCartRetrievedEvent):
-        nonlocal root_event
-        await context.publish(
+    async def waiter(self, e: UserCartRetrievedEvent):
+        await self.context.publish(
             UserCartDeleteCartItemEvent(
                 cart=e.cart,
-                product_id=root_event.product_id,
+                product_id=self.root_event.product_id,
             )
         )
 
-    return (
-        context
-        | ContextExecutor(DeleteCartItemEvent, dispatch)
-        | ContextExecutor(GetUserCartEvent, _get_user_cart.execute)
-        | ContextExecutor(UserCartRetrievedEvent, waiter)
-        | ContextExecutor(
-            UserCartDeleteCartItemEvent, _user_cart_delete_cart_item.execute
-        )
+
+_delete_cart_item_graph = (
+    ContextGraph[_DeleteCartItemFlow]()
+    .on(DeleteCartItemEvent, _DeleteCartItemFlow.dispatch)
+    .on(GetUserCartEvent, lambda flow, e: flow.get_user_cart.execute(e))
+    .on(UserCartRetrievedEvent, _DeleteCartItemFlow.waiter)
+    .on(
+        UserCartDeleteCartItemEvent,
+        lambda flow, e: flow.user_cart_delete_cart_item.execute(e),
     )
+)
+
+
+def delete_cart_item_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_delete_cart_item_graph, _DeleteCartItemFlow(context, queries))
 
 
 @api.delete(path="/cart-item/{product_id}", dependencies=[Depends(verify_access_token)])
@@ -1,11 +1,11 @@
 from typing import Annotated, Any
-from fastapi import Depends
+from fastapi import Depends, Query
 from fastapi.routing import APIRouter
 from pydantic import BaseModel, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bakery_ecommerce.composable import Composable, set_key
-from bakery_ecommerce.context_bus import ContextBus, ContextExecutor
+from bakery_ecommerce.context_bus import ContextBus, ContextGraph
 from bakery_ecommerce import dependencies
 from bakery_ecommerce.internal.catalog.catalog import (
     CreateCatalog,
@@ -20,6 +20,9 @@ from bakery_ecommerce.internal.catalog.catalog import (
     GetCatalogById,
     GetCatalogByIdEvent,
     GetCatalogByIdResult,
+    GetCatalogCursorList,
+    GetCatalogCursorListEvent,
+    GetCatalogCursorListResult,
     GetCatalogList,
     GetCatalogListEvent,
     GetCatalogListResult,
@@ -36,15 +39,17 @@ from bakery_ecommerce.internal.store.query import QueryProcessor
 api = APIRouter()
 
 
+_create_catalog_graph = ContextGraph[CreateCatalog]().on(
+    CreateCatalogEvent, CreateCatalog.execute
+)
+
+
 def _create_catalog_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    create_catalog = CreateCatalog(tx, queries)
-    return context | ContextExecutor(
-        CreateCatalogEvent, lambda e: create_catalog.execute(e)
-    )
+    return context.bind(_create_catalog_graph, CreateCatalog(tx, queries))
 
 
 class CreateCatalogRequestBody(BaseModel):
@@ -68,15 +73,17 @@ async def create_catalog(
     return cmp.reduce(result.flatten())
 
 
+_get_catalog_list_graph = ContextGraph[GetCatalogList]().on(
+    GetCatalogListEvent, GetCatalogList.execute
+)
+
+
 def _get_catalog_list_request__context_bus(
     context: Annotated[ContextBus, Depends(dependencies.request_context_bus)],
-    tx: AsyncSession = Depends(dependencies.request_transaction),
+    tx: AsyncSession = Depends(dependencies.read_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_catalog_list = GetCatalogList(tx, queries)
-    return context | ContextExecutor(
-        GetCatalogListEvent, lambda e: get_catalog_list.execute(e)
-    )
+    return context.bind(_get_catalog_list_graph, GetCatalogList(tx, queries))
 
 
 @api.get(path="/")
@@ -96,17 +103,56 @@ async def get_catalog_list(
     return cmp.reduce(result.flatten())
 
 
-def _get_catalog_by_id_request__context_bus(
+_get_catalog_cursor_list_graph = ContextGraph[GetCatalogCursorList]().on(
+    GetCatalogCursorListEvent, GetCatalogCursorList.execute
+)
+
+
+def _get_catalog_cursor_list_request__context_bus(
     context: Annotated[ContextBus, Depends(dependencies.request_context_bus)],
-    tx: AsyncSession = Depends(dependencies.request_transaction),
+    tx: AsyncSession = Depends(dependencies.read_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_catalog_by_id = GetCatalogById(tx, queries)
-    return context | ContextExecutor(
-        GetCatalogByIdEvent, lambda e: get_catalog_by_id.execute(e)
+    return context.bind(
+        _get_catalog_cursor_list_graph, GetCatalogCursorList(tx, queries)
     )
 
 
+# Registered before /{catalog_id} so "cursor" isn't taken for an id
+@api.get(path="/cursor")
+async def get_catalog_cursor_list(
+    context: Annotated[
+        ContextBus, Depends(_get_catalog_cursor_list_request__context_bus)
+    ],
+    cursor: str | None = None,
+    page_size: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    await context.publish(GetCatalogCursorListEvent(cursor, page_size))
+
+    result = await context.gather()
+    cmp = Composable(dict[str, Any]())
+
+    def catalog_page_mapper(resp: dict[str, Any], result: GetCatalogCursorListResult):
+        set_key(resp, "catalogs", result.catalogs)
+        set_key(resp, "next_cursor", result.next_cursor)
+
+    cmp.reducer(GetCatalogCursorListResult, catalog_page_mapper)
+    return cmp.reduce(result.flatten())
+
+
+_get_catalog_by_id_graph = ContextGraph[GetCatalogById]().on(
+    GetCatalogByIdEvent, GetCatalogById.execute
+)
+
+
+def _get_catalog_by_id_request__context_bus(
+    context: Annotated[ContextBus, Depends(dependencies.request_context_bus)],
+    tx: AsyncSession = Depends(dependencies.read_transaction),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_get_catalog_by_id_graph, GetCatalogById(tx, queries))
+
+
 @api.get(path="/{catalog_id}")
 async def get_catalog_by_id(
     catalog_id: str,
@@ -129,15 +175,17 @@ async def get_catalog_by_id(
     return cmp.reduce(result.flatten())
 
 
+_update_catalog_by_id_graph = ContextGraph[UpdateCatalog]().on(
+    UpdateCatalogEvent, UpdateCatalog.execute
+)
+
+
 def _update_catalog_by_id_request__context_bus(
     context: Annotated[ContextBus, Depends(dependencies.request_context_bus)],
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    update_catalog = UpdateCatalog(tx, queries)
-    return context | ContextExecutor(
-        UpdateCatalogEvent, lambda e: update_catalog.execute(e)
-    )
+    return context.bind(_update_catalog_by_id_graph, UpdateCatalog(tx, queries))
 
 
 class UpdateCatalogByIdRequestBody(BaseModel):
@@ -178,15 +226,17 @@ async def update_catalog_by_id(
     return cmp.reduce(result.flatten())
 
 
+_create_catalog_item_graph = ContextGraph[CreateCatalogItem]().on(
+    CreateCatalogItemEvent, CreateCatalogItem.execute
+)
+
+
 def _create_catalog_item_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _create_catalog_item = CreateCatalogItem(tx, queries)
-    return context | ContextExecutor(
-        CreateCatalogItemEvent, lambda e: _create_catalog_item.execute(e)
-    )
+    return context.bind(_create_catalog_item_graph, CreateCatalogItem(tx, queries))
 
 
 @api.post(path="/{catalog_id}/catalog-item")
@@ -205,14 +255,18 @@ async def create_catalog_item(
     return cmp.reduce(result.flatten())
 
 
+_delete_catalog_item_graph = ContextGraph[DeleteCatalogItem]().on(
+    DeleteCatalogItemEvent, DeleteCatalogItem.execute
+)
+
+
 def _delete_catalog_item_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _delete_catalog_item = DeleteCatalogItem(tx, queries)
-    return context | ContextExecutor(
-        DeleteCatalogItemEvent, lambda e: _delete_catalog_item.execute(e)
+    return context.bind(
+        _delete_catalog_item_graph, DeleteCatalogItem(context, tx, queries)
     )
 
 
@@ -238,14 +292,18 @@ class ChangeCatalogItemProductRequestBody(BaseModel):
     product_id: str
 
 
+_change_catalog_item_product_graph = ContextGraph[UpdateCatalogItemProduct]().on(
+    UpdateCatalogItemProductEvent, UpdateCatalogItemProduct.execute
+)
+
+
 def _change_catalog_item_product_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    update_catalog_item_product = UpdateCatalogItemProduct(tx, queries)
-    return context | ContextExecutor(
-        UpdateCatalogItemProductEvent, lambda q: update_catalog_item_product.execute(q)
+    return context.bind(
+        _change_catalog_item_product_graph, UpdateCatalogItemProduct(tx, queries)
     )
 
 
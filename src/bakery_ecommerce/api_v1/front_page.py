@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bakery_ecommerce.composable import Composable, set_key
-from bakery_ecommerce.context_bus import ContextBus, ContextExecutor
+from bakery_ecommerce.context_bus import ContextBus, ContextGraph
 from bakery_ecommerce import dependencies
 from bakery_ecommerce.internal.catalog.front_page import (
     GetFrontPage,
@@ -20,15 +20,17 @@ from bakery_ecommerce.internal.store.query import QueryProcessor
 api = APIRouter()
 
 
+_update_front_page_graph = ContextGraph[SetFrontPageCatalog]().on(
+    SetFrontPageCatalogEvent, SetFrontPageCatalog.execute
+)
+
+
 def _update_front_page_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    set_front_page_catalog = SetFrontPageCatalog(tx, queries)
-    return context | ContextExecutor(
-        SetFrontPageCatalogEvent, lambda e: set_front_page_catalog.execute(e)
-    )
+    return context.bind(_update_front_page_graph, SetFrontPageCatalog(tx, queries))
 
 
 class UpdateFrontPageRequestBody(BaseModel):
@@ -57,15 +59,17 @@ async def update_front_page(
     return cmp.reduce(result.flatten())
 
 
+_get_front_page_graph = ContextGraph[GetFrontPage]().on(
+    GetFrontPageEvent, GetFrontPage.execute
+)
+
+
 def _get_front_page_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
-    tx: AsyncSession = Depends(dependencies.request_transaction),
+    tx: AsyncSession = Depends(dependencies.read_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_front_page = GetFrontPage(tx, queries)
-    return context | ContextExecutor(
-        GetFrontPageEvent, lambda e: get_front_page.execute(e)
-    )
+    return context.bind(_get_front_page_graph, GetFrontPage(tx, queries))
 
 
 @api.get("/")
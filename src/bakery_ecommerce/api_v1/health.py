@@ -0,0 +1,31 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Response, status
+
+from bakery_ecommerce import dependencies
+
+
+api = APIRouter()
+
+
+@api.get("/nats")
+async def nats_health(response: Response):
+    health = await dependencies.nats_connection.health()
+    if not health.connected or health.error:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return asdict(health)
+
+
+@api.get("/query-cache")
+async def query_cache_health():
+    return asdict(dependencies.query_local_cache.stats())
+
+
+@api.get("/db-replicas")
+async def db_replicas_health():
+    statuses = dependencies.session_manager.replica_statuses()
+    return [asdict(status) for status in statuses]
+
+
+def register_handler(router: APIRouter):
+    router.include_router(api, prefix="/health")
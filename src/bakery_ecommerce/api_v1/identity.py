@@ -8,7 +8,7 @@ from starlette.status import HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
 
 from bakery_ecommerce import dependencies
 from bakery_ecommerce.composable import Composable, set_key
-from bakery_ecommerce.context_bus import ContextBus, ContextExecutor
+from bakery_ecommerce.context_bus import ContextBus, ContextGraph
 
 from bakery_ecommerce.internal.identity import (
     private_key_use_case,
@@ -31,48 +31,76 @@ api = APIRouter()
 route = "/"
 
 
-def _login_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    tx: AsyncSession = Depends(dependencies.request_transaction),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    validate_user_password = user_use_cases.ValidateUserPassword(context, tx, queries)
-    create_private_key = private_key_use_case.CreatePrivateKey(context, tx, queries)
-    create_access_token = token_use_case.CreateAccessToken()
-    create_refresh_token = token_use_case.CreateRefreshToken()
-    return (
-        context
-        | ContextExecutor(
-            user_use_cases.ValidateUserPasswordEvent,
-            lambda e: validate_user_password.execute(e),
+# Stateless, shared by the requests
+_create_access_token = token_use_case.CreateAccessToken()
+_create_refresh_token = token_use_case.CreateRefreshToken()
+
+
+def _create_refresh_token_for_private_key(
+    _: Any, e: private_key_use_case.PrivateKeyCreatedEvent
+):
+    return _create_refresh_token.execute(
+        token_use_case.CreateRefreshTokenEvent(
+            pkey=e.pkey,
+            user_id=e.user_id,
         )
-        | ContextExecutor(
-            user_use_cases.UserValidPasswordEvent,
-            lambda e: create_private_key.execute(
-                private_key_use_case.CreatePrivateKeyEvent(
-                    user_id=e.user.id,
-                )
-            ),
+    )
+
+
+def _create_access_token_for_private_key(
+    _: Any, e: private_key_use_case.PrivateKeyCreatedEvent
+):
+    return _create_access_token.execute(
+        token_use_case.CreateAccessTokenEvent(
+            pkey=e.pkey,
+            user_id=e.user_id,
         )
-        | ContextExecutor(
-            private_key_use_case.PrivateKeyCreatedEvent,
-            lambda e: create_refresh_token.execute(
-                token_use_case.CreateRefreshTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
+    )
+
+
+class _LoginScope:
+    def __init__(
+        self, context: ContextBus, tx: AsyncSession, queries: QueryProcessor
+    ) -> None:
+        self.validate_user_password = user_use_cases.ValidateUserPassword(
+            context, tx, queries
         )
-        | ContextExecutor(
-            private_key_use_case.PrivateKeyCreatedEvent,
-            lambda e: create_access_token.execute(
-                token_use_case.CreateAccessTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
+        self.create_private_key = private_key_use_case.CreatePrivateKey(
+            context, tx, queries
         )
+
+
+_login_graph = (
+    ContextGraph[_LoginScope]()
+    .on(
+        user_use_cases.ValidateUserPasswordEvent,
+        lambda scope, e: scope.validate_user_password.execute(e),
+    )
+    .on(
+        user_use_cases.UserValidPasswordEvent,
+        lambda scope, e: scope.create_private_key.execute(
+            private_key_use_case.CreatePrivateKeyEvent(
+                user_id=e.user.id,
+            )
+        ),
     )
+    .on(
+        private_key_use_case.PrivateKeyCreatedEvent,
+        _create_refresh_token_for_private_key,
+    )
+    .on(
+        private_key_use_case.PrivateKeyCreatedEvent,
+        _create_access_token_for_private_key,
+    )
+)
+
+
+def _login_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    tx: AsyncSession = Depends(dependencies.request_transaction),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_login_graph, _LoginScope(context, tx, queries))
 
 
 class LoginRequestBody(BaseModel):
@@ -121,46 +149,45 @@ class RegisterRequestBody(BaseModel):
     email: str
 
 
+class _RegisterScope:
+    def __init__(
+        self, context: ContextBus, tx: AsyncSession, queries: QueryProcessor
+    ) -> None:
+        self.create_user = user_use_cases.CreateUser(context, tx, queries)
+        self.create_private_key = private_key_use_case.CreatePrivateKey(
+            context, tx, queries
+        )
+
+
+_register_graph = (
+    ContextGraph[_RegisterScope]()
+    .on(
+        user_use_cases.CreateUserEvent,
+        lambda scope, e: scope.create_user.execute(e),
+    )
+    .on(
+        user_use_cases.UserCreatedEvent,
+        lambda scope, e: scope.create_private_key.execute(
+            private_key_use_case.CreatePrivateKeyEvent(user_id=e.id)
+        ),
+    )
+    .on(
+        private_key_use_case.PrivateKeyCreatedEvent,
+        _create_refresh_token_for_private_key,
+    )
+    .on(
+        private_key_use_case.PrivateKeyCreatedEvent,
+        _create_access_token_for_private_key,
+    )
+)
+
+
 def _register_request__context_bus(
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
     context: ContextBus = Depends(dependencies.request_context_bus),
 ) -> ContextBus:
-    create_user = user_use_cases.CreateUser(context, tx, queries)
-    create_private_key = private_key_use_case.CreatePrivateKey(context, tx, queries)
-    create_access_token = token_use_case.CreateAccessToken()
-    create_refresh_token = token_use_case.CreateRefreshToken()
-    return (
-        context
-        | ContextExecutor(
-            user_use_cases.CreateUserEvent,
-            lambda e: create_user.execute(e),
-        )
-        | ContextExecutor(
-            user_use_cases.UserCreatedEvent,
-            lambda e: create_private_key.execute(
-                private_key_use_case.CreatePrivateKeyEvent(user_id=e.id)
-            ),
-        )
-        | ContextExecutor(
-            private_key_use_case.PrivateKeyCreatedEvent,
-            lambda e: create_refresh_token.execute(
-                token_use_case.CreateRefreshTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
-        )
-        | ContextExecutor(
-            private_key_use_case.PrivateKeyCreatedEvent,
-            lambda e: create_access_token.execute(
-                token_use_case.CreateAccessTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
-        )
-    )
+    return context.bind(_register_graph, _RegisterScope(context, tx, queries))
 
 
 @api.post(path=f"{route}")
@@ -227,32 +254,23 @@ async def token_info(token: Token = Depends(verify_access_token)):
     return {"token": token.info()}
 
 
+_refresh_access_token_graph = (
+    ContextGraph[None]()
+    .on(
+        token_use_case.CreateRefreshTokenEvent,
+        lambda _, e: _create_refresh_token.execute(e),
+    )
+    .on(
+        token_use_case.CreateAccessTokenEvent,
+        lambda _, e: _create_access_token.execute(e),
+    )
+)
+
+
 def _refresh_access_token_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
 ) -> ContextBus:
-    create_access_token = token_use_case.CreateAccessToken()
-    create_refresh_token = token_use_case.CreateRefreshToken()
-    return (
-        context
-        | ContextExecutor(
-            token_use_case.CreateRefreshTokenEvent,
-            lambda e: create_refresh_token.execute(
-                token_use_case.CreateRefreshTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
-        )
-        | ContextExecutor(
-            token_use_case.CreateAccessTokenEvent,
-            lambda e: create_access_token.execute(
-                token_use_case.CreateAccessTokenEvent(
-                    pkey=e.pkey,
-                    user_id=e.user_id,
-                )
-            ),
-        )
-    )
+    return context.bind(_refresh_access_token_graph, None)
 
 
 @api.post(
@@ -8,7 +8,7 @@ from nats.aio.client import Client as NATS
 from bakery_ecommerce.composable import Composable, set_key
 from bakery_ecommerce.context_bus import (
     ContextBus,
-    ContextExecutor,
+    ContextGraph,
 )
 from bakery_ecommerce.internal.store.query import QueryProcessor
 from bakery_ecommerce.internal.upload.image_events import (
@@ -30,13 +30,17 @@ from bakery_ecommerce import dependencies
 api = APIRouter()
 
 
+_upload_image_graph = ContextGraph[GetPresignedUrl]().on(
+    GetPresignedUrlEvent, GetPresignedUrl.execute
+)
+
+
 def upload_image_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
     object_store: ObjectStore = Depends(dependencies.request_object_store),
 ) -> ContextBus:
-    _get_presigned_url = GetPresignedUrl(queries, object_store)
-    return context | ContextExecutor(GetPresignedUrlEvent, _get_presigned_url.execute)
+    return context.bind(_upload_image_graph, GetPresignedUrl(queries, object_store))
 
 
 class UploadImageRequestBody(BaseModel):
@@ -63,15 +67,17 @@ async def upload_image(
     return cmp.reduce(result.flatten())
 
 
+_submit_image_upload_graph = ContextGraph[SubmitImageUpload]().on(
+    SubmitImageUploadEvent, SubmitImageUpload.execute
+)
+
+
 def submit_image_upload_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
     nats: NATS = Depends(dependencies.request_nats_session),
 ) -> ContextBus:
-    _submit_image_upload = SubmitImageUpload(queries, nats)
-    return context | ContextExecutor(
-        SubmitImageUploadEvent, _submit_image_upload.execute
-    )
+    return context.bind(_submit_image_upload_graph, SubmitImageUpload(queries, nats))
 
 
 class SubmitImageUploadRequestBody(BaseModel):
@@ -96,15 +102,16 @@ async def submit_image_upload(
     return {"success": True}
 
 
+_make_featured_image_graph = ContextGraph[SetFeaturedProductImage]().on(
+    SetFeaturedProductImageEvent, SetFeaturedProductImage.execute
+)
+
+
 def make_featured_image_request_context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _set_featured_product_image = SetFeaturedProductImage(queries)
-
-    return context | ContextExecutor(
-        SetFeaturedProductImageEvent, _set_featured_product_image.execute
-    )
+    return context.bind(_make_featured_image_graph, SetFeaturedProductImage(queries))
 
 
 class MakeFeaturedImageRequestBody(BaseModel):
@@ -0,0 +1,32 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from bakery_ecommerce import dependencies
+from bakery_ecommerce.token_middleware import verify_access_token
+
+
+api = APIRouter()
+
+
+@api.get("", response_class=PlainTextResponse)
+async def metrics():
+    return dependencies.query_instrumentation.prometheus()
+
+
+@api.get("/queries")
+async def queries_metrics():
+    return {
+        name: asdict(stats)
+        for name, stats in dependencies.query_instrumentation.snapshot().items()
+    }
+
+
+@api.get("/context-bus", dependencies=[Depends(verify_access_token)])
+async def context_bus_traces():
+    return [asdict(trace) for trace in dependencies.context_trace_log.recent()]
+
+
+def register_handler(router: APIRouter):
+    router.include_router(api, prefix="/metrics")
@@ -1,14 +1,15 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Annotated, Any, Self
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from bakery_ecommerce.composable import Composable, set_key
 from bakery_ecommerce.context_bus import (
     ContextBus,
     ContextEventProtocol,
-    ContextExecutor,
+    ContextGraph,
     impl_event,
 )
 from bakery_ecommerce.internal.cart.cart_events import (
@@ -24,7 +25,9 @@ from bakery_ecommerce.internal.order.order_events import (
     ChangePaymentMethodEvent,
     GetOrdersEvent,
     GetUserDraftOrderEvent,
+    GetUserOrdersCursorEvent,
     GetUserOrdersEvent,
+    Orders_Sort_Enum,
     UserDraftOrderRetrievedEvent,
 )
 from bakery_ecommerce.internal.order.order_use_cases import (
@@ -36,10 +39,13 @@ from bakery_ecommerce.internal.order.order_use_cases import (
     GetUserDraftOrder,
     GetUserDraftOrderResult,
     GetUserOrders,
+    GetUserOrdersCursor,
+    GetUserOrdersCursorResult,
     GetUserOrdersResult,
 )
 from bakery_ecommerce.internal.order.store.order_model import (
     Order,
+    Order_Status_Enum,
     Payment_Provider_Enum,
 )
 from bakery_ecommerce.internal.store.query import QueryProcessor
@@ -50,13 +56,17 @@ from bakery_ecommerce import dependencies
 api = APIRouter()
 
 
+_user_get_or_create_draft_order_graph = ContextGraph[GetUserDraftOrder]().on(
+    GetUserDraftOrderEvent, GetUserDraftOrder.execute
+)
+
+
 def user_get_or_create_draft_order_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _get_user_draft_order = GetUserDraftOrder(context, queries)
-    return context | ContextExecutor(
-        GetUserDraftOrderEvent, _get_user_draft_order.execute
+    return context.bind(
+        _user_get_or_create_draft_order_graph, GetUserDraftOrder(context, queries)
     )
 
 
@@ -93,39 +103,50 @@ class UserChangeDraftPaymentMethodComposableEvent:
         return self
 
 
-def user_change_draft_payment_method_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    _get_user_draft_order = GetUserDraftOrder(context, queries)
-    _change_payment_method = ChangePaymentMethod(queries)
-
-    root_event: UserChangeDraftPaymentMethodComposableEvent
+class _UserChangeDraftPaymentMethodFlow:
+    def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
+        self.context = context
+        self.get_user_draft_order = GetUserDraftOrder(context, queries)
+        self.change_payment_method = ChangePaymentMethod(queries)
+        self.root_event: UserChangeDraftPaymentMethodComposableEvent
 
     async def user_change_draft_payment_method_composable_event(
+        self,
         e: UserChangeDraftPaymentMethodComposableEvent,
     ):
-        nonlocal root_event
-        root_event = e
-        await context.publish(GetUserDraftOrderEvent(e.user_id))
-
-    async def get_user_draft_order_retrieved_event(e: UserDraftOrderRetrievedEvent):
-        nonlocal root_event
-        await context.publish(
-            ChangePaymentMethodEvent(order=e.order, provider=root_event.provider)
-        )
+        self.root_event = e
+        await self.context.publish(GetUserDraftOrderEvent(e.user_id))
 
-    return (
-        context
-        | ContextExecutor(
-            UserChangeDraftPaymentMethodComposableEvent,
-            user_change_draft_payment_method_composable_event,
-        )
-        | ContextExecutor(GetUserDraftOrderEvent, _get_user_draft_order.execute)
-        | ContextExecutor(
-            UserDraftOrderRetrievedEvent, get_user_draft_order_retrieved_event
+    async def get_user_draft_order_retrieved_event(
+        self, e: UserDraftOrderRetrievedEvent
+    ):
+        await self.context.publish(
+            ChangePaymentMethodEvent(order=e.order, provider=self.root_event.provider)
         )
-        | ContextExecutor(ChangePaymentMethodEvent, _change_payment_method.execute)
+
+
+_user_change_draft_payment_method_graph = (
+    ContextGraph[_UserChangeDraftPaymentMethodFlow]()
+    .on(
+        UserChangeDraftPaymentMethodComposableEvent,
+        _UserChangeDraftPaymentMethodFlow.user_change_draft_payment_method_composable_event,
+    )
+    .on(GetUserDraftOrderEvent, lambda flow, e: flow.get_user_draft_order.execute(e))
+    .on(
+        UserDraftOrderRetrievedEvent,
+        _UserChangeDraftPaymentMethodFlow.get_user_draft_order_retrieved_event,
+    )
+    .on(ChangePaymentMethodEvent, lambda flow, e: flow.change_payment_method.execute(e))
+)
+
+
+def user_change_draft_payment_method_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(
+        _user_change_draft_payment_method_graph,
+        _UserChangeDraftPaymentMethodFlow(context, queries),
     )
 
 
@@ -173,50 +194,59 @@ class ConvertCartToDraftOrder:
         return self
 
 
-def user_convert_cart_to_draft_order_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    _get_user_cart = GetUserCart(context, queries)
-    _get_user_draft_order = GetUserDraftOrder(context, queries)
-    # TODO: provide different payment provider
-    _cart_items_to_order_items = CartItemsToOrderItems(
-        context, queries, StripeBilling()
-    )
-
-    root_event: ConvertCartToDraftOrder
+class _ConvertCartToDraftOrderFlow:
+    def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
+        self.context = context
+        self.get_user_cart = GetUserCart(context, queries)
+        self.get_user_draft_order = GetUserDraftOrder(context, queries)
+        # TODO: provide different payment provider
+        self.cart_items_to_order_items = CartItemsToOrderItems(
+            context, queries, StripeBilling()
+        )
+        self.root_event: ConvertCartToDraftOrder
 
-    async def dispatch(e: ConvertCartToDraftOrder):
-        nonlocal root_event
-        root_event = e
-        await context.publish(GetUserCartEvent(e.user_id))
-        await context.publish(GetUserDraftOrderEvent(e.user_id))
+    async def dispatch(self, e: ConvertCartToDraftOrder):
+        self.root_event = e
+        await self.context.publish(GetUserCartEvent(e.user_id))
+        await self.context.publish(GetUserDraftOrderEvent(e.user_id))
 
-    async def waiter(e: UserCartRetrievedEvent | UserDraftOrderRetrievedEvent):
-        nonlocal root_event
+    async def waiter(self, e: UserCartRetrievedEvent | UserDraftOrderRetrievedEvent):
+        root_event = self.root_event
         if isinstance(e, UserCartRetrievedEvent):
             root_event.cart = e.cart
         if isinstance(e, UserDraftOrderRetrievedEvent):
             root_event.order = e.order
 
         if root_event.order and root_event.cart:
-            await context.publish(
+            await self.context.publish(
                 CartItemsToOrderItemsEvent(
                     cart=root_event.cart,
                     order=root_event.order,
                 )
             )
 
-    return (
-        context
-        | ContextExecutor(ConvertCartToDraftOrder, dispatch)
-        | ContextExecutor(GetUserCartEvent, _get_user_cart.execute)
-        | ContextExecutor(GetUserDraftOrderEvent, _get_user_draft_order.execute)
-        | ContextExecutor(UserCartRetrievedEvent, waiter)
-        | ContextExecutor(UserDraftOrderRetrievedEvent, waiter)
-        | ContextExecutor(
-            CartItemsToOrderItemsEvent, _cart_items_to_order_items.execute
-        )
+
+_user_convert_cart_to_draft_order_graph = (
+    ContextGraph[_ConvertCartToDraftOrderFlow]()
+    .on(ConvertCartToDraftOrder, _ConvertCartToDraftOrderFlow.dispatch)
+    .on(GetUserCartEvent, lambda flow, e: flow.get_user_cart.execute(e))
+    .on(GetUserDraftOrderEvent, lambda flow, e: flow.get_user_draft_order.execute(e))
+    .on(UserCartRetrievedEvent, _ConvertCartToDraftOrderFlow.waiter)
+    .on(UserDraftOrderRetrievedEvent, _ConvertCartToDraftOrderFlow.waiter)
+    .on(
+        CartItemsToOrderItemsEvent,
+        lambda flow, e: flow.cart_items_to_order_items.execute(e),
+    )
+)
+
+
+def user_convert_cart_to_draft_order_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(
+        _user_convert_cart_to_draft_order_graph,
+        _ConvertCartToDraftOrderFlow(context, queries),
     )
 
 
@@ -236,20 +266,27 @@ async def user_convert_cart_to_draft_order(
     return {"ok": True}
 
 
+_orders_graph = ContextGraph[GetOrders]().on(GetOrdersEvent, GetOrders.execute)
+
+
 def orders_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
+    context: ContextBus = Depends(dependencies.request_read_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _get_orders = GetOrders(queries)
-    return context | ContextExecutor(GetOrdersEvent, _get_orders.execute)
+    return context.bind(_orders_graph, GetOrders(queries))
 
 
 @api.get("/", dependencies=[Depends(verify_access_token)])
 async def orders(
     token: Annotated[Token, Depends(verify_access_token)],
     context: Annotated[ContextBus, Depends(orders_request__context_bus)],
-    page: int = 0,
+    page: int = 1,
     page_size: int = 20,
+    order_status: Order_Status_Enum | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    sort: Orders_Sort_Enum = Orders_Sort_Enum.CREATED_AT,
+    descending: bool = True,
 ):
     user_id = token.user_id()
     if not user_id:
@@ -258,25 +295,37 @@ async def orders(
     await context.publish(
         GetOrdersEvent(
             page=page,
-            page_size=page_size,
+            page_size=min(page_size, 100),
+            order_status=order_status,
+            created_from=created_from,
+            created_to=created_to,
+            sort=sort,
+            descending=descending,
         )
     )
 
     result = await context.gather()
     cmp = Composable(dict[str, Any]())
-    cmp.reducer(
-        GetOrdersResult,
-        lambda resp, result: set_key(resp, "orders", result.orders_with_customers),
-    )
+
+    def set_orders(resp: dict[str, Any], result: GetOrdersResult):
+        set_key(resp, "orders", result.orders_with_customers)
+        set_key(resp, "total", result.total)
+        set_key(resp, "total_exact", result.total_exact)
+
+    cmp.reducer(GetOrdersResult, set_orders)
     return cmp.reduce(result.flatten())
 
 
+_user_orders_graph = ContextGraph[GetUserOrders]().on(
+    GetUserOrdersEvent, GetUserOrders.execute
+)
+
+
 def user_orders_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
+    context: ContextBus = Depends(dependencies.request_read_context_bus),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    _get_user_orders = GetUserOrders(queries)
-    return context | ContextExecutor(GetUserOrdersEvent, _get_user_orders.execute)
+    return context.bind(_user_orders_graph, GetUserOrders(queries))
 
 
 @api.get("/user", dependencies=[Depends(verify_access_token)])
@@ -306,5 +355,49 @@ async def user_orders(
     return cmp.reduce(result.flatten())
 
 
+_user_orders_cursor_graph = ContextGraph[GetUserOrdersCursor]().on(
+    GetUserOrdersCursorEvent, GetUserOrdersCursor.execute
+)
+
+
+def user_orders_cursor_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_read_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_user_orders_cursor_graph, GetUserOrdersCursor(queries))
+
+
+@api.get("/user/cursor", dependencies=[Depends(verify_access_token)])
+async def user_orders_cursor(
+    token: Annotated[Token, Depends(verify_access_token)],
+    context: Annotated[ContextBus, Depends(user_orders_cursor_request__context_bus)],
+    cursor: str | None = None,
+    page_size: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    user_id = token.user_id()
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Not found user_id")
+
+    await context.publish(
+        GetUserOrdersCursorEvent(
+            cursor=cursor,
+            page_size=page_size,
+            user_id=user_id,
+        )
+    )
+
+    result = await context.gather()
+    cmp = Composable(dict[str, Any]())
+
+    def user_orders_page_mapper(
+        resp: dict[str, Any], result: GetUserOrdersCursorResult
+    ):
+        set_key(resp, "orders", result.orders)
+        set_key(resp, "next_cursor", result.next_cursor)
+
+    cmp.reducer(GetUserOrdersCursorResult, user_orders_page_mapper)
+    return cmp.reduce(result.flatten())
+
+
 def register_handler(router: APIRouter):
     router.include_router(api, prefix="/orders")
@@ -9,7 +9,7 @@ from bakery_ecommerce.composable import Composable, set_key
 from bakery_ecommerce.context_bus import (
     ContextBus,
     ContextEventProtocol,
-    ContextExecutor,
+    ContextGraph,
     impl_event,
 )
 from bakery_ecommerce.internal.cart.cart_events import (
@@ -99,72 +99,89 @@ class StripeCreatePaymentIntentEvent:
         return self
 
 
-# TODO: Half of the code is the same as in `user_convert_cart_to_draft_order_request__context_bus`
-def stripe_create_payment_intent_request__context_bus(
-    context: ContextBus = Depends(dependencies.request_context_bus),
-    queries: QueryProcessor = Depends(dependencies.request_query_processor),
-) -> ContextBus:
-    _get_user_cart = GetUserCart(context, queries)
-    _get_user_draft_order = GetUserDraftOrder(context, queries)
-    # TODO: provide different payment provider
-    _cart_items_to_order_items = CartItemsToOrderItems(
-        context, queries, StripeBilling()
-    )
-    _stripe_create_payment_intent = StripeCreateOrderPaymentIntent()
+# Seconds for the Stripe API call, it holds the request transaction
+STRIPE_PAYMENT_INTENT_TIMEOUT = 10.0
+
 
-    root_event: StripeCreatePaymentIntentEvent
+# TODO: Half of the code is the same as in `_ConvertCartToDraftOrderFlow`
+class _StripeCreatePaymentIntentFlow:
+    def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
+        self.context = context
+        self.get_user_cart = GetUserCart(context, queries)
+        self.get_user_draft_order = GetUserDraftOrder(context, queries)
+        # TODO: provide different payment provider
+        self.cart_items_to_order_items = CartItemsToOrderItems(
+            context, queries, StripeBilling()
+        )
+        self.stripe_create_payment_intent = StripeCreateOrderPaymentIntent()
+        self.root_event: StripeCreatePaymentIntentEvent
 
-    async def dispatch(e: StripeCreatePaymentIntentEvent):
-        nonlocal root_event
-        root_event = e
-        await context.publish(GetUserCartEvent(e.user_id))
-        await context.publish(GetUserDraftOrderEvent(e.user_id))
+    async def dispatch(self, e: StripeCreatePaymentIntentEvent):
+        self.root_event = e
+        await self.context.publish(GetUserCartEvent(e.user_id))
+        await self.context.publish(GetUserDraftOrderEvent(e.user_id))
 
     async def cart_items_to_order_items_event_waiter(
+        self,
         e: UserCartRetrievedEvent | UserDraftOrderRetrievedEvent,
     ):
-        nonlocal root_event
+        root_event = self.root_event
         if isinstance(e, UserCartRetrievedEvent):
             root_event.cart = e.cart
         if isinstance(e, UserDraftOrderRetrievedEvent):
             root_event.order = e.order
 
         if root_event.order and root_event.cart:
-            await context.publish(
+            await self.context.publish(
                 CartItemsToOrderItemsEvent(
                     cart=root_event.cart,
                     order=root_event.order,
                 )
             )
 
-    async def waiter(e: CartItemsToOrderItemsConvertedEvent):
-        nonlocal root_event
+    async def waiter(self, e: CartItemsToOrderItemsConvertedEvent):
         if not e.order:
             raise ValueError("Not found order after cart to order converted")
-        await context.publish(
+        await self.context.publish(
             StripeCreateOrderPaymentIntentEvent(
-                order=e.order, user_id=root_event.user_id
+                order=e.order, user_id=self.root_event.user_id
             )
         )
 
-    return (
-        context
-        | ContextExecutor(StripeCreatePaymentIntentEvent, dispatch)
-        | ContextExecutor(GetUserCartEvent, _get_user_cart.execute)
-        | ContextExecutor(GetUserDraftOrderEvent, _get_user_draft_order.execute)
-        | ContextExecutor(
-            UserCartRetrievedEvent, cart_items_to_order_items_event_waiter
-        )
-        | ContextExecutor(
-            UserDraftOrderRetrievedEvent, cart_items_to_order_items_event_waiter
-        )
-        | ContextExecutor(
-            CartItemsToOrderItemsEvent, _cart_items_to_order_items.execute
-        )
-        | ContextExecutor(CartItemsToOrderItemsConvertedEvent, waiter)
-        | ContextExecutor(
-            StripeCreateOrderPaymentIntentEvent, _stripe_create_payment_intent.execute
-        )
+
+_stripe_create_payment_intent_graph = (
+    ContextGraph[_StripeCreatePaymentIntentFlow]()
+    .on(StripeCreatePaymentIntentEvent, _StripeCreatePaymentIntentFlow.dispatch)
+    .on(GetUserCartEvent, lambda flow, e: flow.get_user_cart.execute(e))
+    .on(GetUserDraftOrderEvent, lambda flow, e: flow.get_user_draft_order.execute(e))
+    .on(
+        UserCartRetrievedEvent,
+        _StripeCreatePaymentIntentFlow.cart_items_to_order_items_event_waiter,
+    )
+    .on(
+        UserDraftOrderRetrievedEvent,
+        _StripeCreatePaymentIntentFlow.cart_items_to_order_items_event_waiter,
+    )
+    .on(
+        CartItemsToOrderItemsEvent,
+        lambda flow, e: flow.cart_items_to_order_items.execute(e),
+    )
+    .on(CartItemsToOrderItemsConvertedEvent, _StripeCreatePaymentIntentFlow.waiter)
+    .on(
+        StripeCreateOrderPaymentIntentEvent,
+        lambda flow, e: flow.stripe_create_payment_intent.execute(e),
+        timeout=STRIPE_PAYMENT_INTENT_TIMEOUT,
+    )
+)
+
+
+def stripe_create_payment_intent_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(
+        _stripe_create_payment_intent_graph,
+        _StripeCreatePaymentIntentFlow(context, queries),
     )
 
 
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bakery_ecommerce import dependencies
 from bakery_ecommerce.composable import Composable, set_key
-from bakery_ecommerce.context_bus import ContextBus, ContextExecutor
+from bakery_ecommerce.context_bus import ContextBus, ContextGraph
 from bakery_ecommerce.internal.inventory import (
     CreateInventoryProduct,
     CreateInventoryProductEvent,
@@ -15,6 +15,9 @@ from bakery_ecommerce.internal.inventory import (
 from bakery_ecommerce.internal.product import (
     CreateProductEvent,
     GetProductById,
+    GetProductCursorList,
+    GetProductCursorListEvent,
+    GetProductCursorListResult,
     GetProductByIdEvent,
     GetProductByIdResult,
     GetProductList,
@@ -59,6 +62,28 @@ def _product_create_request__create_inventory_product(
     return dependencies.cache_request_attr(request, CreateInventoryProduct(tx, queries))
 
 
+class _ProductCreateScope:
+    def __init__(
+        self,
+        create_product: CreateProduct,
+        create_inventory_product: CreateInventoryProduct,
+    ) -> None:
+        self.create_product = create_product
+        self.create_inventory_product = create_inventory_product
+
+
+_product_create_graph = (
+    ContextGraph[_ProductCreateScope]()
+    .on(CreateProductEvent, lambda scope, e: scope.create_product.execute(e))
+    .on(
+        ProductCreatedEvent,
+        lambda scope, e: scope.create_inventory_product.execute(
+            CreateInventoryProductEvent(e.id)
+        ),
+    )
+)
+
+
 def _product_create_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     create_product: CreateProduct = Depends(_product_create_request__create_product),
@@ -66,22 +91,10 @@ def _product_create_request__context_bus(
         _product_create_request__create_inventory_product
     ),
 ) -> ContextBus:
-    context.add_executor(
-        for_event=CreateProductEvent,
-        executor=ContextExecutor(
-            CreateProductEvent, lambda e: create_product.execute(e)
-        ),
-    )
-    context.add_executor(
-        for_event=ProductCreatedEvent,
-        executor=ContextExecutor(
-            ProductCreatedEvent,
-            lambda e: create_inventory_product.execute(
-                CreateInventoryProductEvent(e.id)
-            ),
-        ),
+    return context.bind(
+        _product_create_graph,
+        _ProductCreateScope(create_product, create_inventory_product),
     )
-    return context
 
 
 @api.post(path="/products", dependencies=[Depends(verify_access_token)])
@@ -108,16 +121,17 @@ async def product_create(
         print("Error occured on product_create context. Err:", e)
 
 
+_product_list_graph = ContextGraph[GetProductList]().on(
+    GetProductListEvent, GetProductList.execute
+)
+
+
 def _product_list_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
-    tx: AsyncSession = Depends(dependencies.request_transaction),
+    tx: AsyncSession = Depends(dependencies.read_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_product_list = GetProductList(tx, queries)
-
-    return context | ContextExecutor(
-        GetProductListEvent, lambda e: get_product_list.execute(e)
-    )
+    return context.bind(_product_list_graph, GetProductList(tx, queries))
 
 
 @api.get(path="/products")
@@ -126,12 +140,14 @@ async def product_list(
     page: int = 0,
     page_size: int = 20,
     name: str | None = None,
+    images: bool = True,
 ):
     await context.publish(
         GetProductListEvent(
             page=page,
             page_size=page_size,
             name=name,
+            images=images,
         )
     )
 
@@ -148,16 +164,60 @@ async def product_list(
     return cmp.reduce(result.flatten())
 
 
-def _product_by_id_request__context_bus(
+_product_cursor_list_graph = ContextGraph[GetProductCursorList]().on(
+    GetProductCursorListEvent, GetProductCursorList.execute
+)
+
+
+def _product_cursor_list_request__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
+    tx: AsyncSession = Depends(dependencies.read_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    get_product_by_id = GetProductById(context, queries)
-    return context | ContextExecutor(
-        GetProductByIdEvent,
-        lambda e: get_product_by_id.execute(e),
+    return context.bind(_product_cursor_list_graph, GetProductCursorList(tx, queries))
+
+
+# Registered before /products/{product_id} so "cursor" isn't taken for an id
+@api.get(path="/products/cursor")
+async def product_cursor_list(
+    context: ContextBus = Depends(_product_cursor_list_request__context_bus),
+    cursor: str | None = None,
+    page_size: Annotated[int, fastapi.Query(ge=1, le=100)] = 20,
+    name: str | None = None,
+    images: bool = True,
+):
+    await context.publish(
+        GetProductCursorListEvent(
+            cursor=cursor,
+            page_size=page_size,
+            name=name,
+            images=images,
+        )
     )
 
+    result = await context.gather()
+
+    cmp = Composable(dict[str, Any]())
+
+    def product_page_mapper(resp: dict[str, Any], result: GetProductCursorListResult):
+        set_key(resp, "products", result.products)
+        set_key(resp, "next_cursor", result.next_cursor)
+
+    cmp.reducer(GetProductCursorListResult, product_page_mapper)
+    return cmp.reduce(result.flatten())
+
+
+_product_by_id_graph = ContextGraph[GetProductById]().on(
+    GetProductByIdEvent, GetProductById.execute
+)
+
+
+def _product_by_id_request__context_bus(
+    context: ContextBus = Depends(dependencies.request_read_context_bus),
+    queries: QueryProcessor = Depends(dependencies.request_query_processor),
+) -> ContextBus:
+    return context.bind(_product_by_id_graph, GetProductById(context, queries))
+
 
 @api.get(path="/products/{product_id}")
 async def product_by_id(
@@ -184,15 +244,17 @@ async def product_by_id(
     return resp
 
 
+_update_product_by_id_graph = ContextGraph[UpdateProduct]().on(
+    UpdateProductEvent, UpdateProduct.execute
+)
+
+
 def _update_product_by_id__context_bus(
     context: ContextBus = Depends(dependencies.request_context_bus),
     tx: AsyncSession = Depends(dependencies.request_transaction),
     queries: QueryProcessor = Depends(dependencies.request_query_processor),
 ) -> ContextBus:
-    update_product = UpdateProduct(tx, queries)
-    return context | ContextExecutor(
-        UpdateProductEvent, lambda e: update_product.execute(e)
-    )
+    return context.bind(_update_product_by_id_graph, UpdateProduct(tx, queries))
 
 
 class UpdateProductByIdRequestBody(BaseModel):
@@ -1,8 +1,12 @@
 import fastapi
 import fastapi.middleware.cors
+from fastapi.responses import JSONResponse
 
 from . import api_v1
 from . import dependencies
+from .context_bus import ContextDeadlineExceeded
+from .context_trace import ContextTrace
+from .internal.store.pagination import InvalidCursorException
 
 from dotenv import load_dotenv
 
@@ -22,6 +26,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def context_bus_server_timing(request: fastapi.Request, call_next):
+    # Filled by the request ContextBus dependencies
+    traces = list[ContextTrace]()
+    request.state.context_traces = traces
+
+    response = await call_next(request)
+
+    for trace in traces:
+        if trace.spans():
+            response.headers.append("Server-Timing", trace.server_timing())
+    dependencies.context_trace_log.record(request.method, request.url.path, traces)
+    return response
+
+
+@app.exception_handler(ContextDeadlineExceeded)
+async def context_deadline_handler(_: fastapi.Request, e: ContextDeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": str(e)})
+
+
+@app.exception_handler(InvalidCursorException)
+async def invalid_cursor_handler(_: fastapi.Request, e: InvalidCursorException):
+    return JSONResponse(status_code=400, content={"detail": str(e)})
+
+
 __api_v1 = fastapi.APIRouter(prefix="/api")
 api_v1.product.register_handler(__api_v1)
 api_v1.identity.register_handler(__api_v1)
@@ -31,5 +61,7 @@ api_v1.cart.register_handler(__api_v1)
 api_v1.payment.register_handler(__api_v1)
 api_v1.order.register_handler(__api_v1)
 api_v1.image.register_handler(__api_v1)
+api_v1.health.register_handler(__api_v1)
+api_v1.metrics.register_handler(__api_v1)
 
 app.include_router(__api_v1)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import functools
 import inspect
 from typing import Coroutine, Generic, Protocol, Any, Self, TypeVar, Type, Callable
 
@@ -9,6 +10,9 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 
+from bakery_ecommerce.context_session import ContextSessions
+from bakery_ecommerce.context_trace import ContextTrace, handler_name
+
 EventPayload_T = TypeVar("EventPayload_T", covariant=True)
 
 
@@ -21,9 +25,21 @@ class ContextPersistenceEvent:
     session: AsyncSession
 
 
+class ContextReadEvent(ContextPersistenceEvent):
+    """
+    Event of a handler which only reads. Its session is read only and shares
+    the snapshot of the other read branches of the bus, so they run in
+    parallel on their own connections.
+    """
+
+
 _HandlerReturn_T = TypeVar("_HandlerReturn_T", bound=Any)
 
 
+class ContextDeadlineExceeded(TimeoutError):
+    pass
+
+
 @dataclass
 class ExecutorTask(Generic[_HandlerReturn_T]):
     task: asyncio.Task[_HandlerReturn_T]
@@ -35,27 +51,145 @@ class ContextExecutor(Generic[_HandlerReturn_T]):
         self,
         event_type: type[ContextEventProtocol[EventPayload_T]],
         handler: Callable[[EventPayload_T], Coroutine[Any, Any, _HandlerReturn_T]],
+        timeout: float | None = None,
     ) -> None:
         self.event_type = event_type
         self.handler = handler
+        self.name = handler_name(handler)
+        # Seconds the handler may run, its transaction included
+        self.timeout = timeout
 
     def start(
         self,
         event: ContextEventProtocol,
         loop: asyncio.AbstractEventLoop,
-        session_maker: async_sessionmaker[AsyncSession],
+        sessions: ContextSessions,
+        scope: Any = None,
+        trace: ContextTrace | None = None,
     ) -> ExecutorTask[_HandlerReturn_T]:
         async def executor_session_proxy():
-            if isinstance(event, ContextPersistenceEvent):
-                async with session_maker.begin() as tx:
+            if isinstance(event, ContextReadEvent):
+                async with sessions.read() as session:
+                    event.session = session
+                    return await self.call(event.payload, scope)
+            elif isinstance(event, ContextPersistenceEvent):
+                async with sessions.write() as tx:
                     event.session = tx
-                    return await self.handler(event.payload)
+                    return await self.call(event.payload, scope)
             else:
-                return await self.handler(event.payload)
-
-        task = loop.create_task(executor_session_proxy())
+                return await self.call(event.payload, scope)
+
+        async def executor_timeout_proxy():
+            if self.timeout is None:
+                return await executor_session_proxy()
+
+            deadline = asyncio.timeout(self.timeout)
+            try:
+                async with deadline:
+                    return await executor_session_proxy()
+            except TimeoutError as e:
+                if not deadline.expired():
+                    raise
+                raise ContextDeadlineExceeded(
+                    f"{type(event).__name__} {self.name} exceeded {self.timeout}s"
+                ) from e
+
+        async def executor_trace_proxy():
+            if trace is None:
+                return await executor_timeout_proxy()
+
+            span = trace.start(type(event).__name__, self.name)
+            try:
+                result = await executor_timeout_proxy()
+            except BaseException as e:
+                trace.finish(span, e)
+                raise
+            trace.finish(span)
+            return result
+
+        task = loop.create_task(executor_trace_proxy())
         return ExecutorTask(task, event)
 
+    def call(self, payload: Any, scope: Any) -> Coroutine[Any, Any, _HandlerReturn_T]:
+        return self.handler(payload)
+
+
+_Scope_T = TypeVar("_Scope_T")
+
+
+class ScopedContextExecutor(
+    ContextExecutor[_HandlerReturn_T], Generic[_Scope_T, _HandlerReturn_T]
+):
+    """
+    Executor of a ContextGraph, the handler takes the request scope the graph
+    is bound with and the event payload.
+    """
+
+    def __init__(
+        self,
+        event_type: type[ContextEventProtocol[EventPayload_T]],
+        handler: Callable[
+            [_Scope_T, EventPayload_T], Coroutine[Any, Any, _HandlerReturn_T]
+        ],
+        timeout: float | None = None,
+    ) -> None:
+        self.event_type = event_type
+        self.scoped_handler = handler
+        self.name = handler_name(handler)
+        self.timeout = timeout
+
+    def call(
+        self, payload: Any, scope: _Scope_T
+    ) -> Coroutine[Any, Any, _HandlerReturn_T]:
+        return self.scoped_handler(scope, payload)
+
+
+@functools.cache
+def event_key(event_type: type) -> str:
+    return str(event_type)
+
+
+class ContextGraph(Generic[_Scope_T]):
+    """
+    Executors of a route, declared once at import. A request binds the graph
+    to its bus with a scope, usually the use case or the flow object holding
+    the request state, instead of registering new executors and closures.
+
+        _graph = ContextGraph[GetCatalogList]().on(
+            GetCatalogListEvent, GetCatalogList.execute
+        )
+        context.bind(_graph, GetCatalogList(tx, queries))
+    """
+
+    def __init__(self) -> None:
+        self.__executors = dict[str, tuple[ScopedContextExecutor, ...]]()
+
+    def on(
+        self,
+        event_type: type[ContextEventProtocol[EventPayload_T]],
+        handler: Callable[[_Scope_T, EventPayload_T], Coroutine[Any, Any, Any]],
+        timeout: float | None = None,
+    ) -> Self:
+        key = event_key(event_type)
+        executor = ScopedContextExecutor(event_type, handler, timeout)
+        self.__executors[key] = (*self.__executors.get(key, ()), executor)
+        return self
+
+    def executors(self, event_type_str: str) -> tuple[ScopedContextExecutor, ...]:
+        return self.__executors.get(event_type_str, ())
+
+
+class ContextDeliveryProtocol(Protocol):
+    """
+    Asynchronous executors of a bus, their events are handed over to publish
+    once gather succeeds instead of running in the request. The request
+    outbox holds them until its transaction commits.
+    """
+
+    def executors(self, event_type_str: str) -> tuple[ScopedContextExecutor, ...]: ...
+
+    async def publish(self, events: list[ContextEventProtocol]): ...
+
 
 class ResultBox(Generic[_HandlerReturn_T]):
     def __init__(self, value: _HandlerReturn_T) -> None:
@@ -79,22 +213,50 @@ class Result(Generic[_HandlerReturn_T]):
 
 # Compensating Actions: Define undo actions for each step to handle failures gracefully.
 # Error Handling: Implement error handling to trigger compensating actions and manage the overall state of the Saga.
-# TODO: use NATS based
 class ContextBus(Generic[_HandlerReturn_T]):
+    """
+    Runs the executors of the published events as tasks. Handlers may publish
+    events themselves, gather waits for the whole graph of spawned tasks,
+    which is done once no task is in flight.
+
+    Tasks are awaited as they complete, not per published batch, so a slow
+    branch doesn't hold the collection of the others. Results keep the
+    publish order.
+
+    Like a TaskGroup, when a task fails, the timeout since the first publish
+    passes or gather is cancelled, the tasks still in flight are cancelled
+    and awaited before gather raises, so their sessions are closed.
+
+    The read branches share a snapshot held until gather returns, see
+    ContextReadEvent.
+
+    Events of the delivery executors are collected and handed to the
+    delivery once gather succeeds, a failed or cancelled bus drops them.
+    """
+
     def __init__(
         self,
         session_maker: async_sessionmaker[AsyncSession],
         executors: dict[str, list[ContextExecutor[_HandlerReturn_T]]] | None = None,
+        trace: ContextTrace | None = None,
+        timeout: float | None = None,
+        delivery: ContextDeliveryProtocol | None = None,
     ) -> None:
         if executors:
             self.__executors = executors
         else:
             self.__executors = dict[str, list[ContextExecutor[_HandlerReturn_T]]]()
 
-        self.__session_maker = session_maker
-        self.__running_tasks = list[ExecutorTask[_HandlerReturn_T]]()
-        self.__tasks = asyncio.Queue[tuple[str, list[ExecutorTask[_HandlerReturn_T]]]]()
-        self.__lock = asyncio.Lock()
+        self.__sessions = ContextSessions(session_maker)
+        # Event type of the in flight and not yet gathered tasks, in publish order
+        self.__tasks = dict[asyncio.Task[_HandlerReturn_T], str]()
+        self.__pending = set[asyncio.Task[_HandlerReturn_T]]()
+        self.__graphs = list[tuple[ContextGraph, Any]]()
+        self.trace = trace
+        self.__timeout = timeout
+        self.__deadline: float | None = None
+        self.__delivery = delivery
+        self.__deferred = list[ContextEventProtocol]()
 
     def __or__(
         self,
@@ -108,60 +270,108 @@ class ContextBus(Generic[_HandlerReturn_T]):
         for_event: type[ContextEventProtocol[EventPayload_T]],
         executor: ContextExecutor[_HandlerReturn_T],
     ):
-        event_type_str = str(for_event)
+        event_type_str = event_key(for_event)
 
         if not self.__executors.get(event_type_str):
             self.__executors[event_type_str] = list[ContextExecutor[_HandlerReturn_T]]()
 
         self.__executors[event_type_str].append(executor)
 
+    def bind(self, graph: ContextGraph[_Scope_T], scope: _Scope_T) -> Self:
+        self.__graphs.append((graph, scope))
+        return self
+
     async def publish(self, event: ContextEventProtocol):
-        event_type_str = str(type(event))
-        async with self.__lock:
-            if executors := self.__executors.get(event_type_str):
-                tasks = list[ExecutorTask[_HandlerReturn_T]]()
-                for executor in executors:
-                    task = executor.start(
-                        event,
-                        asyncio.get_running_loop(),
-                        self.__session_maker,
-                    )
-                    self.__running_tasks.append(task)
-                    tasks.append(task)
-                await self.__tasks.put((event_type_str, tasks))
+        event_type_str = event_key(type(event))
+        loop = asyncio.get_running_loop()
+        if self.__deadline is None and self.__timeout is not None:
+            self.__deadline = loop.time() + self.__timeout
+
+        for executor in self.__executors.get(event_type_str, ()):
+            task = executor.start(event, loop, self.__sessions, trace=self.trace).task
+            self.__start(task, event_type_str)
+
+        for graph, scope in self.__graphs:
+            for executor in graph.executors(event_type_str):
+                task = executor.start(
+                    event, loop, self.__sessions, scope, self.trace
+                ).task
+                self.__start(task, event_type_str)
+
+        if self.__delivery and self.__delivery.executors(event_type_str):
+            self.__deferred.append(event)
+
+    def __start(self, task: asyncio.Task[_HandlerReturn_T], event_type_str: str):
+        self.__tasks[task] = event_type_str
+        self.__pending.add(task)
+        task.add_done_callback(self.__pending.discard)
 
     async def gather(self) -> Result[_HandlerReturn_T]:
-        results: dict[str, list[ResultBox[_HandlerReturn_T]]] = {}
+        try:
+            await self.__wait()
+        except BaseException:
+            await self.__cancel()
+            self.__tasks.clear()
+            self.__deferred.clear()
+            raise
+        finally:
+            await self.__sessions.close()
 
-        while True:
-            event: tuple[str, list[ExecutorTask[_HandlerReturn_T]]] | None = None
-
-            async with self.__lock:
-                if not self.__tasks.empty():
-                    event = await self.__tasks.get()
-
-            if event:
-                event_type_str, executorTasks = event
-                try:
-                    tasks = map(lambda q: q.task, executorTasks)
-                    completed = await asyncio.gather(*tasks)
-                except Exception as e:
-                    print(f"Exception occurred at event context bus: {e}")
-                    completed = []
-                    raise e
+        results: dict[str, list[ResultBox[_HandlerReturn_T]]] = {}
+        for task, event_type_str in self.__tasks.items():
+            if event_type_str not in results:
+                results[event_type_str] = []
 
-                if event_type_str not in results:
-                    results[event_type_str] = []
+            if task.cancelled():
+                continue
+            if (result := task.result()) is not None:
+                results[event_type_str].append(ResultBox(result))
 
-                for result in completed:
-                    if result is not None:
-                        results[event_type_str].append(ResultBox(result))
+        self.__tasks.clear()
 
-            if self.__tasks.empty():
-                break
+        if self.__delivery and self.__deferred:
+            deferred = self.__deferred
+            self.__deferred = list[ContextEventProtocol]()
+            await self.__delivery.publish(deferred)
 
         return Result(results)
 
+    async def __wait(self):
+        deadline = asyncio.timeout_at(self.__deadline)
+        try:
+            async with deadline:
+                # A handler publishes before it returns, so its spawned tasks
+                # are pending before it's done and an empty set means the
+                # graph finished
+                while self.__pending:
+                    done, _ = await asyncio.wait(
+                        self.__pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if not task.cancelled() and (e := task.exception()):
+                            print(f"Exception occurred at event context bus: {e}")
+                            raise e
+        except TimeoutError as e:
+            if not deadline.expired():
+                raise
+            raise ContextDeadlineExceeded(
+                f"Context bus exceeded {self.__timeout}s"
+            ) from e
+
+    async def __cancel(self):
+        # A cancelled handler may still publish from its cleanup. Cancelled in
+        # publish order, the pending set has none
+        while self.__pending:
+            pending = [task for task in self.__tasks if task in self.__pending]
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
+
+        # Retrieved, the first error is already raised
+        for task in self.__tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
+
 
 __ignore_protocol_member = ["copy_with"]
 
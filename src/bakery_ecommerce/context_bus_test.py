@@ -5,8 +5,10 @@ from dataclasses import dataclass
 
 from bakery_ecommerce.context_bus import (
     ContextBus,
+    ContextDeadlineExceeded,
     ContextEventProtocol,
     ContextExecutor,
+    ContextGraph,
     ResultBox,
     impl_event,
 )
@@ -118,3 +120,140 @@ async def test_context_executors_with_dynamic_spawn():
     check_valid_seq(payload_return)
 
     print(result.items)
+
+
+@pytest.mark.asyncio
+async def test_context_gather_waits_spawned_chains():
+    async def chain(payload: CustomPayload):
+        await asyncio.sleep(0.05)
+        if payload.value > 0:
+            await bus.publish(CustomPayloadCreated(CustomPayload(payload.value - 1)))
+        return payload.value
+
+    async def slow_read(payload: CustomPayload):
+        await asyncio.sleep(0.1)
+        return payload.value
+
+    bus = ContextBus(None)  # pyright: ignore
+    bus = bus | ContextExecutor(CustomPayloadCreated, chain)
+    bus = bus | ContextExecutor(CustomPayloadRead, slow_read)
+
+    await bus.publish(CustomPayloadRead(CustomPayload(10)))
+    await bus.publish(CustomPayloadCreated(CustomPayload(3)))
+    result = await bus.gather()
+
+    created = result.items.get(str(CustomPayloadCreated))
+    assert created
+    assert [box.value() for box in created] == [3, 2, 1, 0]
+    assert [box.value() for box in result.flatten()] == [10, 3, 2, 1, 0]
+
+    # Gathered tasks aren't returned again
+    assert (await bus.gather()).items == {}
+
+
+@pytest.mark.asyncio
+async def test_context_gather_raises_handler_exception():
+    async def fail(_: CustomPayload):
+        raise ValueError("fail")
+
+    released = asyncio.Event()
+
+    async def slow_read(payload: CustomPayload):
+        try:
+            await asyncio.sleep(10)
+        finally:
+            released.set()
+
+    bus = ContextBus(None)  # pyright: ignore
+    bus = bus | ContextExecutor(CustomPayloadRead, slow_read)
+    bus = bus | ContextExecutor(CustomPayloadCreated, fail)
+
+    await bus.publish(CustomPayloadRead(CustomPayload(1)))
+    await bus.publish(CustomPayloadCreated(CustomPayload(1)))
+
+    with pytest.raises(ValueError):
+        await bus.gather()
+
+    # The sibling is cancelled and done before gather raises
+    assert released.is_set()
+
+
+class Counter:
+    def __init__(self, bus: ContextBus, start: int) -> None:
+        self.bus = bus
+        self.start = start
+        self.read = list[int]()
+
+    async def created(self, payload: CustomPayload):
+        await self.bus.publish(CustomPayloadRead(CustomPayload(payload.value + 1)))
+        return self.start + payload.value
+
+    async def on_read(self, payload: CustomPayload):
+        self.read.append(payload.value)
+
+
+counter_graph = (
+    ContextGraph[Counter]()
+    .on(CustomPayloadCreated, Counter.created)
+    .on(CustomPayloadRead, Counter.on_read)
+)
+
+
+@pytest.mark.asyncio
+async def test_context_graph_bound_per_bus():
+    first_bus, second_bus = ContextBus(None), ContextBus(None)  # pyright: ignore
+    first, second = Counter(first_bus, 10), Counter(second_bus, 20)
+    first_bus.bind(counter_graph, first)
+    second_bus.bind(counter_graph, second)
+
+    await first_bus.publish(CustomPayloadCreated(CustomPayload(1)))
+    await second_bus.publish(CustomPayloadCreated(CustomPayload(2)))
+
+    first_result = await first_bus.gather()
+    second_result = await second_bus.gather()
+
+    assert [box.value() for box in first_result.flatten()] == [11]
+    assert [box.value() for box in second_result.flatten()] == [22]
+    assert first.read == [2]
+    assert second.read == [3]
+
+
+@pytest.mark.asyncio
+async def test_context_executor_timeout():
+    async def slow(_: CustomPayload):
+        await asyncio.sleep(10)
+
+    async def fast(payload: CustomPayload):
+        return payload.value
+
+    bus = ContextBus(None)  # pyright: ignore
+    bus = bus | ContextExecutor(CustomPayloadCreated, slow, timeout=0.01)
+    bus = bus | ContextExecutor(CustomPayloadRead, fast)
+
+    await bus.publish(CustomPayloadRead(CustomPayload(1)))
+    await bus.publish(CustomPayloadCreated(CustomPayload(1)))
+
+    with pytest.raises(ContextDeadlineExceeded, match="CustomPayloadCreated"):
+        await bus.gather()
+
+
+@pytest.mark.asyncio
+async def test_context_bus_timeout_cancels_tasks():
+    cancelled = list[int]()
+
+    async def slow(payload: CustomPayload):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(payload.value)
+            raise
+
+    bus = ContextBus(None, timeout=0.05)  # pyright: ignore
+    bus = bus | ContextExecutor(CustomPayloadCreated, slow)
+
+    await bus.publish(CustomPayloadCreated(CustomPayload(1)))
+    await bus.publish(CustomPayloadCreated(CustomPayload(2)))
+
+    with pytest.raises(ContextDeadlineExceeded):
+        await bus.gather()
+    assert cancelled == [1, 2]
@@ -0,0 +1,170 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Self, override
+
+from nats.aio.msg import Msg
+from nats.js import JetStreamContext
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bakery_ecommerce.context_bus import (
+    ContextEventProtocol,
+    ContextGraph,
+    EventPayload_T,
+    ScopedContextExecutor,
+    event_key,
+)
+from bakery_ecommerce.internal.store.query import QueryProcessor
+from bakery_ecommerce.internal.store.session import DatabaseSessionManager
+
+
+class ContextEventDecodeError(ValueError):
+    """
+    The message can't be turned into an event, the worker acks and skips it.
+    """
+
+
+class ContextEventHandlerError(Exception):
+    """
+    An executor failed, the message is left unacked for redelivery.
+    """
+
+
+@dataclass
+class ContextDeliveryScope:
+    """
+    Scope of the asynchronous executors, the worker transaction of the message.
+    """
+
+    session: AsyncSession
+    queries: QueryProcessor
+
+
+class ContextEventDelivery(ContextGraph[ContextDeliveryScope]):
+    """
+    Asynchronous executors, kept off the request latency path. A ContextBus
+    collects their events into the ContextDeliveryOutbox of the request,
+    which publishes them to a JetStream stream once the request transaction
+    commits, the worker runs the executors.
+
+    Delivery is at least once, the message is acked after the worker
+    transaction commits and redelivered when a handler fails, so handlers
+    must be idempotent. Events are serialized with pydantic and must be plain
+    data, an event holding models fails at registration.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        subject_prefix: str,
+        jetstream: Callable[[], JetStreamContext],
+    ) -> None:
+        super().__init__()
+        self.__stream = stream
+        self.__subject_prefix = subject_prefix
+        self.__jetstream = jetstream
+        self.__events = dict[str, tuple[type, TypeAdapter]]()
+
+    @override
+    def on(
+        self,
+        event_type: type[ContextEventProtocol[EventPayload_T]],
+        handler: Callable[
+            [ContextDeliveryScope, EventPayload_T], Coroutine[Any, Any, Any]
+        ],
+        timeout: float | None = None,
+    ) -> Self:
+        subject = self.subject(event_type)
+        if (registered := self.__events.get(subject)) and registered[
+            0
+        ] is not event_type:
+            raise ValueError(f"{subject} is already delivered for {registered[0]}")
+
+        self.__events[subject] = (event_type, TypeAdapter(event_type))
+        return super().on(event_type, handler, timeout)
+
+    def subject(self, event_type: type) -> str:
+        return f"{self.__subject_prefix}.{event_type.__name__}"
+
+    def subjects(self) -> str:
+        return f"{self.__subject_prefix}.>"
+
+    def encode(self, event: ContextEventProtocol) -> tuple[str, bytes]:
+        subject = self.subject(type(event))
+        if subject not in self.__events:
+            raise ValueError(f"{type(event).__name__} is not delivered asynchronously")
+
+        _, adapter = self.__events[subject]
+        return subject, adapter.dump_json(event)
+
+    def decode(self, subject: str, data: bytes) -> ContextEventProtocol:
+        if subject not in self.__events:
+            raise ContextEventDecodeError(f"Unknown context event subject {subject}")
+
+        _, adapter = self.__events[subject]
+        try:
+            return adapter.validate_json(data)
+        except ValidationError as e:
+            raise ContextEventDecodeError(
+                f"Malformed context event {subject}: {e}"
+            ) from e
+
+    async def publish(self, events: list[ContextEventProtocol]):
+        js = self.__jetstream()
+        await asyncio.gather(
+            *(
+                js.publish(subject, data, stream=self.__stream)
+                for subject, data in map(self.encode, events)
+            )
+        )
+
+    async def handle(
+        self,
+        msg: Msg,
+        queries: QueryProcessor,
+        session_manager: DatabaseSessionManager,
+    ):
+        """
+        Worker message handler. Only a ContextEventDecodeError acks and skips
+        the message, an executor error leaves it unacked for redelivery.
+        """
+        event = self.decode(msg.subject, msg.data)
+
+        try:
+            async with session_manager.tx() as session:
+                scope = ContextDeliveryScope(session, queries)
+                for executor in self.executors(event_key(type(event))):
+                    async with asyncio.timeout(executor.timeout):
+                        await executor.call(event.payload, scope)
+        except ValueError as e:
+            # The worker acks and skips a ValueError, it would lose the event
+            raise ContextEventHandlerError(
+                f"{type(event).__name__} handler failed: {e}"
+            ) from e
+
+        await msg.ack()
+
+
+class ContextDeliveryOutbox:
+    """
+    Delivery events of one request. The bus hands them over once gather
+    succeeds and flush publishes them after the request transaction commits,
+    so the worker never runs before the writes are visible. A failed request
+    never flushes and drops them.
+    """
+
+    def __init__(self, delivery: ContextEventDelivery) -> None:
+        self.__delivery = delivery
+        self.__events = list[ContextEventProtocol]()
+
+    def executors(self, event_type_str: str) -> tuple[ScopedContextExecutor, ...]:
+        return self.__delivery.executors(event_type_str)
+
+    async def publish(self, events: list[ContextEventProtocol]):
+        self.__events.extend(events)
+
+    async def flush(self):
+        events = self.__events
+        self.__events = list[ContextEventProtocol]()
+        if events:
+            await self.__delivery.publish(events)
@@ -0,0 +1,193 @@
+import contextlib
+from dataclasses import dataclass
+from typing import Self
+from uuid import UUID, uuid4
+
+import pytest
+
+from bakery_ecommerce.context_bus import (
+    ContextBus,
+    ContextEventProtocol,
+    ContextGraph,
+    impl_event,
+)
+from bakery_ecommerce.context_delivery import (
+    ContextDeliveryOutbox,
+    ContextEventDecodeError,
+    ContextEventDelivery,
+    ContextEventHandlerError,
+)
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class ItemDeleted:
+    item_id: UUID
+    position: int
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class DeleteItem:
+    item_id: UUID
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
+class JetStream:
+    def __init__(self) -> None:
+        self.published = list[tuple[str, bytes, str | None]]()
+
+    async def publish(self, subject: str, payload: bytes, stream: str | None = None):
+        self.published.append((subject, payload, stream))
+
+
+class Msg:
+    def __init__(self, subject: str, data: bytes) -> None:
+        self.subject = subject
+        self.data = data
+        self.acked = False
+
+    async def ack(self):
+        self.acked = True
+
+
+class SessionManager:
+    def __init__(self) -> None:
+        self.committed = 0
+
+    @contextlib.asynccontextmanager
+    async def tx(self):
+        yield "session"
+        self.committed += 1
+
+
+def delivery(js: JetStream, handled: list) -> ContextEventDelivery:
+    async def handler(scope, e: ItemDeleted):
+        handled.append((scope.session, e))
+
+    return ContextEventDelivery("EVENTS", "test.event", lambda: js).on(  # pyright: ignore
+        ItemDeleted, handler
+    )
+
+
+@pytest.mark.asyncio
+async def test_context_bus_publishes_delivery_events_after_gather():
+    js = JetStream()
+    handled = []
+    bus = ContextBus(None, delivery=delivery(js, handled))  # pyright: ignore
+
+    async def delete(_, e: DeleteItem):
+        await bus.publish(ItemDeleted(e.item_id, 3))
+        await bus.publish(ItemDeleted(e.item_id, 4))
+        return "deleted"
+
+    graph = ContextGraph().on(DeleteItem, delete)
+    bus.bind(graph, None)
+
+    await bus.publish(DeleteItem(uuid4()))
+    assert js.published == []
+
+    result = await bus.gather()
+
+    assert [box.value() for box in result.flatten()] == ["deleted"]
+    # Not run in the request, each event is published for the worker
+    assert handled == []
+    assert [(subject, stream) for subject, _, stream in js.published] == [
+        ("test.event.ItemDeleted", "EVENTS"),
+        ("test.event.ItemDeleted", "EVENTS"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_context_delivery_outbox_publishes_on_flush():
+    js = JetStream()
+    outbox = ContextDeliveryOutbox(delivery(js, []))
+    bus = ContextBus(None, delivery=outbox)  # pyright: ignore
+
+    async def delete(_, e: DeleteItem):
+        await bus.publish(ItemDeleted(e.item_id, 1))
+
+    bus.bind(ContextGraph().on(DeleteItem, delete), None)
+    await bus.publish(DeleteItem(uuid4()))
+    await bus.gather()
+
+    # Held until the request transaction commits
+    assert js.published == []
+
+    await outbox.flush()
+    assert [subject for subject, _, _ in js.published] == ["test.event.ItemDeleted"]
+
+    await outbox.flush()
+    assert len(js.published) == 1
+
+
+@pytest.mark.asyncio
+async def test_context_bus_drops_delivery_events_on_failure():
+    js = JetStream()
+    bus = ContextBus(None, delivery=delivery(js, []))  # pyright: ignore
+
+    async def fail(_, e: DeleteItem):
+        await bus.publish(ItemDeleted(e.item_id, 1))
+        raise RuntimeError("failed")
+
+    bus.bind(ContextGraph().on(DeleteItem, fail), None)
+    await bus.publish(DeleteItem(uuid4()))
+
+    with pytest.raises(RuntimeError):
+        await bus.gather()
+
+    assert js.published == []
+
+
+@pytest.mark.asyncio
+async def test_context_event_delivery_handles_message():
+    js = JetStream()
+    handled = []
+    events = delivery(js, handled)
+
+    event = ItemDeleted(uuid4(), 7)
+    await events.publish([event])
+    subject, data, _ = js.published[0]
+
+    session_manager = SessionManager()
+    msg = Msg(subject, data)
+    await events.handle(msg, None, session_manager)  # pyright: ignore
+
+    assert handled == [("session", event)]
+    assert session_manager.committed == 1
+    assert msg.acked
+
+
+@pytest.mark.asyncio
+async def test_context_event_delivery_leaves_failed_message_unacked():
+    async def fail(scope, e: ItemDeleted):
+        if e.position == 1:
+            raise RuntimeError("failed")
+        raise ValueError("not found")
+
+    js = JetStream()
+    events = ContextEventDelivery("EVENTS", "test.event", lambda: js).on(  # pyright: ignore
+        ItemDeleted, fail
+    )
+
+    for position, error in ((1, RuntimeError), (2, ContextEventHandlerError)):
+        msg = Msg(*events.encode(ItemDeleted(uuid4(), position)))
+        with pytest.raises(error):
+            await events.handle(msg, None, SessionManager())  # pyright: ignore
+        # A handler ValueError must not be taken for a skip by the worker
+        assert not issubclass(error, ValueError)
+        assert not msg.acked
+
+    # Skipped and acked by the worker
+    subject, _ = events.encode(ItemDeleted(uuid4(), 1))
+    with pytest.raises(ContextEventDecodeError):
+        await events.handle(Msg(subject, b"{}"), None, SessionManager())  # pyright: ignore
+    with pytest.raises(ContextEventDecodeError):
+        await events.handle(Msg("test.event.Unknown", b"{}"), None, SessionManager())  # pyright: ignore
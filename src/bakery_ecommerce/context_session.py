@@ -0,0 +1,98 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+_snapshot_options = {
+    "isolation_level": "REPEATABLE READ",
+    "postgresql_readonly": True,
+}
+
+_export_snapshot_sql = text("SELECT pg_export_snapshot()")
+
+
+class ContextSnapshot:
+    """
+    Read only REPEATABLE READ transactions seeing the same data. The first
+    one exports its snapshot and the others import it, so the reads of
+    parallel branches are consistent while each runs on its own connection.
+
+    The exporting transaction must stay open while the snapshot is imported,
+    every session is kept until close, an idle one is reused by the next read.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.__session_maker = session_maker
+        self.__snapshot_id: str | None = None
+        self.__export_lock = asyncio.Lock()
+        self.__sessions = list[AsyncSession]()
+        self.__idle = list[AsyncSession]()
+
+    async def acquire(self) -> AsyncSession:
+        if self.__idle:
+            return self.__idle.pop()
+
+        session = self.__session_maker()
+        self.__sessions.append(session)
+        await session.connection(execution_options=_snapshot_options)
+
+        async with self.__export_lock:
+            if self.__snapshot_id is None:
+                result = await session.execute(_export_snapshot_sql)
+                self.__snapshot_id = result.scalar_one()
+                return session
+
+        # Exported by the server, the id can't carry a quote
+        await session.execute(text(f"SET TRANSACTION SNAPSHOT '{self.__snapshot_id}'"))
+        return session
+
+    def release(self, session: AsyncSession):
+        # Results leave the branch detached, like after a committed transaction
+        session.expunge_all()
+        self.__idle.append(session)
+
+    async def close(self):
+        sessions = self.__sessions
+        self.__sessions = list[AsyncSession]()
+        self.__idle.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
+
+
+class ContextSessions:
+    """
+    Sessions of the ContextBus branches. A read branch gets a session of the
+    current snapshot, a write branch its own transaction, committed when the
+    branch ends. Reads started after a write commits take a new snapshot.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.__session_maker = session_maker
+        self.__snapshot: ContextSnapshot | None = None
+        self.__snapshots = list[ContextSnapshot]()
+
+    @contextlib.asynccontextmanager
+    async def read(self) -> AsyncIterator[AsyncSession]:
+        if self.__snapshot is None:
+            self.__snapshot = ContextSnapshot(self.__session_maker)
+            self.__snapshots.append(self.__snapshot)
+
+        snapshot = self.__snapshot
+        session = await snapshot.acquire()
+        yield session
+        # Not reached when the branch failed, the session is only closed
+        snapshot.release(session)
+
+    @contextlib.asynccontextmanager
+    async def write(self) -> AsyncIterator[AsyncSession]:
+        async with self.__session_maker.begin() as tx:
+            yield tx
+        self.__snapshot = None
+
+    async def close(self):
+        snapshots = self.__snapshots
+        self.__snapshot = None
+        self.__snapshots = list[ContextSnapshot]()
+        for snapshot in snapshots:
+            await snapshot.close()
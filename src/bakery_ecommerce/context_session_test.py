@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+
+import pytest
+
+from bakery_ecommerce.context_session import ContextSessions
+
+
+class Result:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def scalar_one(self) -> str:
+        return self.value
+
+
+class Session:
+    def __init__(self, maker: "SessionMaker") -> None:
+        self.id = len(maker.sessions)
+        self.statements = list[str]()
+        self.options = None
+        self.closed = False
+        self.expunged = False
+
+    async def connection(self, execution_options=None):
+        self.options = execution_options
+
+    async def execute(self, stmt) -> Result:
+        self.statements.append(str(stmt))
+        # Lets the other branches acquire while the snapshot is exported
+        await asyncio.sleep(0)
+        return Result(f"snapshot-{self.id}")
+
+    def expunge_all(self):
+        self.expunged = True
+
+    async def close(self):
+        self.closed = True
+
+
+class SessionMaker:
+    def __init__(self) -> None:
+        self.sessions = list[Session]()
+        self.commits = 0
+
+    def __call__(self) -> Session:
+        session = Session(self)
+        self.sessions.append(session)
+        return session
+
+    @contextlib.asynccontextmanager
+    async def begin(self):
+        yield self()
+        self.commits += 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_reads_share_exported_snapshot():
+    maker = SessionMaker()
+    sessions = ContextSessions(maker)  # pyright: ignore
+    released = asyncio.Event()
+
+    async def read():
+        async with sessions.read() as session:
+            await released.wait()
+            return session
+
+    branches = [asyncio.create_task(read()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    released.set()
+    first, *others = await asyncio.gather(*branches)
+
+    # One connection per parallel branch
+    assert len({first.id, *(session.id for session in others)}) == 3
+    assert first.options == {
+        "isolation_level": "REPEATABLE READ",
+        "postgresql_readonly": True,
+    }
+    assert first.statements == ["SELECT pg_export_snapshot()"]
+    for session in others:
+        assert session.statements == ["SET TRANSACTION SNAPSHOT 'snapshot-0'"]
+
+    await sessions.close()
+    assert all(session.closed for session in maker.sessions)
+
+
+@pytest.mark.asyncio
+async def test_sequential_reads_reuse_session_until_write():
+    maker = SessionMaker()
+    sessions = ContextSessions(maker)  # pyright: ignore
+
+    async with sessions.read() as first:
+        pass
+    async with sessions.read() as second:
+        pass
+
+    assert first is second
+    assert first.expunged
+
+    async with sessions.write():
+        pass
+    assert maker.commits == 1
+
+    # The write is committed, a new snapshot sees it
+    async with sessions.read() as third:
+        pass
+    assert third is not first
+    assert third.statements == ["SELECT pg_export_snapshot()"]
+
+    await sessions.close()
+    assert first.closed and third.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_read_session_is_not_reused():
+    maker = SessionMaker()
+    sessions = ContextSessions(maker)  # pyright: ignore
+
+    with pytest.raises(RuntimeError):
+        async with sessions.read() as failed:
+            raise RuntimeError("failed")
+
+    async with sessions.read() as session:
+        pass
+
+    assert session is not failed
+    assert session.statements == ["SET TRANSACTION SNAPSHOT 'snapshot-0'"]
+    await sessions.close()
@@ -0,0 +1,139 @@
+import collections
+import contextvars
+import itertools
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+_current_span = contextvars.ContextVar["ExecutorSpan | None"](
+    "context_bus_span", default=None
+)
+
+
+@dataclass
+class ExecutorSpan:
+    id: int
+    # Span of the handler which published the event, None for the request
+    parent: int | None
+    event: str
+    handler: str
+    start: float
+    end: float | None = None
+    error: str | None = None
+
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+
+def handler_name(handler: Callable[..., Any]) -> str:
+    name = getattr(handler, "__qualname__", None) or repr(handler)
+    # Graph handlers are often lambdas, the location tells them apart
+    if code := getattr(handler, "__code__", None):
+        if name.endswith("<lambda>"):
+            filename = code.co_filename.rsplit("/", 2)[-2:]
+            return f"<lambda> {'/'.join(filename)}:{code.co_firstlineno}"
+    return name
+
+
+class ContextTrace:
+    """
+    Spans of the executors run by a ContextBus. A span started inside the
+    task of another executor has it as parent, the contextvar is copied to the
+    tasks created by the handler publish.
+    """
+
+    def __init__(self) -> None:
+        self.__ids = itertools.count()
+        self.__spans = list[ExecutorSpan]()
+        self.started_at = time.perf_counter()
+
+    def start(self, event: str, handler: str) -> ExecutorSpan:
+        parent = _current_span.get()
+        span = ExecutorSpan(
+            id=next(self.__ids),
+            parent=parent.id if parent else None,
+            event=event,
+            handler=handler,
+            start=time.perf_counter(),
+        )
+        self.__spans.append(span)
+        _current_span.set(span)
+        return span
+
+    def finish(self, span: ExecutorSpan, error: BaseException | None = None):
+        span.end = time.perf_counter()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+
+    def spans(self) -> list[ExecutorSpan]:
+        return list(self.__spans)
+
+    def critical_path(self) -> list[ExecutorSpan]:
+        """
+        Chain of the spans ending with the last finished one, each step is the
+        handler which published the next event. The root is first.
+        """
+        finished = [span for span in self.__spans if span.end is not None]
+        if not finished:
+            return []
+
+        by_id = {span.id: span for span in self.__spans}
+        path = [max(finished, key=lambda span: span.end or 0)]
+        while (parent := path[-1].parent) is not None:
+            path.append(by_id[parent])
+        path.reverse()
+        return path
+
+    def total_ms(self) -> float:
+        ends = [span.end for span in self.__spans if span.end is not None]
+        if not ends:
+            return 0.0
+        return (max(ends) - self.started_at) * 1000
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value, the total and the critical path spans.
+        The header is public, the handler source location is left to the
+        summary.
+        """
+        metrics = [f"context-bus;dur={self.total_ms():.1f}"]
+        for i, span in enumerate(self.critical_path()):
+            handler = span.handler.split(" ", 1)[0]
+            desc = f"{span.event} {handler}".replace('"', "'")
+            metrics.append(f'cb-{i};desc="{desc}";dur={span.duration_ms():.1f}')
+        return ", ".join(metrics)
+
+    def summary(self) -> dict[str, Any]:
+        def span_dict(span: ExecutorSpan) -> dict[str, Any]:
+            return {**asdict(span), "duration_ms": round(span.duration_ms(), 3)}
+
+        return {
+            "total_ms": round(self.total_ms(), 3),
+            "critical_path": [span_dict(span) for span in self.critical_path()],
+            "spans": [span_dict(span) for span in self.__spans],
+        }
+
+
+@dataclass
+class RequestTrace:
+    method: str
+    path: str
+    summary: dict[str, Any] = field(default_factory=dict)
+
+
+class ContextTraceLog:
+    """
+    Last traced requests, kept for the debug endpoint.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.__traces = collections.deque[RequestTrace](maxlen=max_size)
+
+    def record(self, method: str, path: str, traces: list[ContextTrace]):
+        traced = [trace for trace in traces if trace.spans()]
+        for trace in traced:
+            self.__traces.append(RequestTrace(method, path, trace.summary()))
+
+    def recent(self) -> list[RequestTrace]:
+        return list(reversed(self.__traces))
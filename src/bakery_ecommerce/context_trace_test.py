@@ -0,0 +1,111 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from bakery_ecommerce.context_bus import (
+    ContextBus,
+    ContextEventProtocol,
+    ContextGraph,
+    impl_event,
+)
+from bakery_ecommerce.context_trace import ContextTrace, ContextTraceLog
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class Checkout:
+    @property
+    def payload(self):
+        return self
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class CartLoaded:
+    @property
+    def payload(self):
+        return self
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class PaymentCreated:
+    @property
+    def payload(self):
+        return self
+
+
+class Flow:
+    def __init__(self, bus: ContextBus) -> None:
+        self.bus = bus
+
+    async def checkout(self, _: Checkout):
+        await self.bus.publish(CartLoaded())
+        await asyncio.sleep(0.01)
+
+    async def load_cart(self, _: CartLoaded):
+        await asyncio.sleep(0.03)
+        await self.bus.publish(PaymentCreated())
+
+    async def create_payment(self, _: PaymentCreated):
+        await asyncio.sleep(0.02)
+        return "payment"
+
+
+graph = (
+    ContextGraph[Flow]()
+    .on(Checkout, Flow.checkout)
+    .on(CartLoaded, Flow.load_cart)
+    .on(PaymentCreated, Flow.create_payment)
+)
+
+
+@pytest.mark.asyncio
+async def test_context_trace_critical_path():
+    trace = ContextTrace()
+    bus = ContextBus(None, trace=trace)  # pyright: ignore
+    bus.bind(graph, Flow(bus))
+
+    await bus.publish(Checkout())
+    await bus.gather()
+
+    spans = {span.event: span for span in trace.spans()}
+    assert spans["Checkout"].parent is None
+    assert spans["CartLoaded"].parent == spans["Checkout"].id
+    assert spans["PaymentCreated"].parent == spans["CartLoaded"].id
+    assert spans["PaymentCreated"].handler == "Flow.create_payment"
+
+    path = [span.event for span in trace.critical_path()]
+    assert path == ["Checkout", "CartLoaded", "PaymentCreated"]
+
+    timing = trace.server_timing()
+    assert timing.startswith("context-bus;dur=")
+    assert 'cb-2;desc="PaymentCreated Flow.create_payment";dur=' in timing
+
+
+@pytest.mark.asyncio
+async def test_context_trace_records_error():
+    async def fail(_: Checkout):
+        raise ValueError("no cart")
+
+    trace = ContextTrace()
+    bus = ContextBus(None, trace=trace)  # pyright: ignore
+    bus.bind(ContextGraph[None]().on(Checkout, lambda _, e: fail(e)), None)
+
+    await bus.publish(Checkout())
+    with pytest.raises(ValueError):
+        await bus.gather()
+
+    [span] = trace.spans()
+    assert span.error == "ValueError: no cart"
+    assert span.handler.startswith("<lambda> bakery_ecommerce/context_trace_test.py")
+    # The location stays out of the public header
+    assert 'cb-0;desc="Checkout <lambda>";dur=' in trace.server_timing()
+
+    log = ContextTraceLog(max_size=1)
+    log.record("POST", "/first", [trace])
+    log.record("POST", "/second", [trace, ContextTrace()])
+    [recent] = log.recent()
+    assert recent.path == "/second"
+    assert recent.summary["critical_path"][0]["error"] == "ValueError: no cart"
@@ -1,12 +1,21 @@
 import asyncio
 import contextlib
 import os
-from typing import Any, Callable, Coroutine, Generator, TypeVar
+import weakref
+from typing import Any, Collection, Generator, TypeVar
 
 import fastapi
-import nats
 import stripe
 from bakery_ecommerce.context_bus import ContextBus
+from bakery_ecommerce.context_delivery import (
+    ContextDeliveryOutbox,
+    ContextEventDelivery,
+)
+from bakery_ecommerce.context_trace import ContextTrace, ContextTraceLog
+from bakery_ecommerce.internal.catalog.catalog import (
+    CatalogItemDeletedEvent,
+    NormalizeCatalogItemsPositions,
+)
 from bakery_ecommerce.internal.catalog.store.catalog_queries import (
     NormalizeCatalogItemsPosition,
     NormalizeCatalogItemsPositionHandler,
@@ -14,35 +23,52 @@ from bakery_ecommerce.internal.catalog.store.catalog_queries import (
 from bakery_ecommerce.internal.identity.store.private_key_session_queries import (
     GetPrivateKeySignature,
     GetPrivateKeySignatureHandler,
+    private_key_signatures_cache_config,
 )
 from bakery_ecommerce.internal.store import crud_queries, product_queries
+from bakery_ecommerce.internal.store.instrumentation import QueryInstrumentation
 from bakery_ecommerce.internal.store.join_queries import (
     JoinOperation,
     JoinOperationHandler,
 )
+from bakery_ecommerce.internal.store.local_cache import LocalQueryCache
 from bakery_ecommerce.internal.store.query import (
+    KeyValueBuckets,
     QueryCache,
+    QueryCacheWatcher,
     QueryProcessor,
     QueryProcessorHandlers,
 )
+from bakery_ecommerce.internal.store.query_memo import QueryMemo
 from bakery_ecommerce.internal.store.session import (
     DatabaseSessionManager,
     PostgresDatabaseConfig,
+    env,
 )
+from bakery_ecommerce.internal.store.single_flight import SingleFlight
+from bakery_ecommerce.nats_connection import NatsConnection
 from bakery_ecommerce.object_store import MinioStore, ObjectStore
 from bakery_ecommerce.worker.image import product_image_transcoding_handler
+from bakery_ecommerce.worker.runtime import (
+    ConsumerWorker,
+    PullConsumerWorker,
+    PushConsumerWorker,
+    per_message_batch_handler,
+)
 from bakery_ecommerce.worker.stripe import (
+    charge_succeeded_batch_handler,
     charge_succeeded_worker_handler,
+    payment_intent_created_batch_handler,
     payment_intent_created_handler,
 )
 from nats.aio.client import Client as NATS
-from nats.aio.msg import Msg
 from nats.js import JetStreamContext
 from nats.js.api import (
     AckPolicy,
     ConsumerConfig,
     DeliverPolicy,
     DiscardPolicy,
+    KeyValueConfig,
     RetentionPolicy,
     StreamConfig,
 )
@@ -61,10 +87,26 @@ def cache_request_attr(
     return request.state._state[attr_type]
 
 
-session_manager = DatabaseSessionManager(PostgresDatabaseConfig().get_uri())
+database_config = PostgresDatabaseConfig()
+session_manager = DatabaseSessionManager(
+    database_config.get_uri(),
+    replica_hosts=database_config.get_replica_uris(),
+    max_replica_lag=float(env("DB_REPLICA_MAX_LAG", "5")),
+    replica_check_interval=float(env("DB_REPLICA_CHECK_INTERVAL", "5")),
+)
+
+
+async def context_delivery_outbox():
+    outbox = ContextDeliveryOutbox(context_event_delivery)
+    # A failed request, its rollback included, raises here and drops them
+    yield outbox
+    await outbox.flush()
 
 
-async def transaction():
+async def transaction(
+    # Entered first, so the outbox exits and publishes after the commit
+    _: ContextDeliveryOutbox = fastapi.Depends(context_delivery_outbox),
+):
     async with session_manager.tx() as tx:
         print("run transaction")
         yield tx
@@ -77,6 +119,12 @@ def request_transaction(
     return cache_request_attr(request, tx)
 
 
+async def read_transaction():
+    # Read-only routes, runs on a replica when one is within the lag limit
+    async with session_manager.read_tx() as tx:
+        yield tx
+
+
 async def session():
     async with session_manager.session() as session:
         yield session
@@ -92,10 +140,11 @@ def request_object_store() -> Generator[ObjectStore, Any, None]:
 
 nats_server = "nats://localhost:4222"
 
+nats_connection = NatsConnection(nats_server, name="bakery_ecommerce_api")
 
-async def nats_session():
-    async with await nats.connect(nats_server) as nc:
-        yield nc
+
+def nats_session() -> NATS:
+    return nats_connection.client()
 
 
 def request_nats_session(
@@ -104,100 +153,27 @@ def request_nats_session(
     return cache_request_attr(request, nc)
 
 
-async def nats_worker_task(
-    stream: str,
-    consumer: ConsumerConfig,
-    consumer_name: str,
-    msg_cb_f: Callable[
-        [Msg, QueryProcessor, *tuple[Any, ...]], Coroutine[Any, Any, None]
-    ],
-    *args,
-):
-    lock = asyncio.Lock()
-    async with await nats.connect(nats_server) as nc:
-        print(
-            "{consumer_name} | connected {nats_server}".format(
-                consumer_name=consumer_name,
-                nats_server=nats_server,
-            )
-        )
-
-        async def cb(msg: Msg):
-            subject = msg.subject
-            reply = msg.reply
-            print(
-                "'{subject} {reply}' | Received a message".format(
-                    subject=subject,
-                    reply=reply,
-                )
-            )
-            try:
-                async with lock:
-                    await msg_cb_f(msg, query_processor_factory(nc), *args)
-
-            except ValueError as e:
-                await msg.ack()
-                print(
-                    "'{subject} {reply}' | Skip the message catch value error: {error}".format(
-                        subject=subject, reply=reply, error=e
-                    )
-                )
-            except Exception as e:
-                print(
-                    "'{subject} {reply}' | Error: {error}".format(
-                        subject=subject, reply=reply, error=e
-                    )
-                )
-
-            print(
-                "'{subject} {reply}' | Done ".format(
-                    subject=subject,
-                    reply=reply,
-                )
-            )
-
-        js = nc.jetstream()
-        sub = await js.subscribe_bind(
-            stream,
-            consumer=consumer_name,
-            config=consumer,
-            cb=cb,
-            manual_ack=True,
-        )
-        await asyncio.sleep(10)
-        await sub.unsubscribe()
-        async with lock:
-            await nc.drain()
-
-
-async def spawn_nats_worker(
-    stream: str,
-    consumer: ConsumerConfig,
-    consumer_name: str,
-    msg_cb_f: Callable[..., Coroutine],
-    *args,
-):
-    loop = asyncio.get_running_loop()
-    delay = 2.0
-    while True:
-        try:
-            await loop.create_task(
-                nats_worker_task(
-                    stream,
-                    consumer,
-                    consumer_name,
-                    msg_cb_f,
-                    *args,
-                )
-            )
-        except Exception as e:
-            if "Event loop stopped before Future completed" in str(e):
-                print("Stop worker loop")
-                break
-            print(f"catch error in loop routine. Delay {delay}. {e}")
-        finally:
-            await asyncio.sleep(delay)
+# Messages a worker keeps in flight per consumer. The consumer max_ack_pending
+# is aligned to it, so the server never delivers more than the worker can hold
+payments_stripe_concurrency = int(env("PAYMENTS_STRIPE_CONCURRENCY", "8"))
+product_images_transcoding_concurrency = int(
+    env("PRODUCT_IMAGES_TRANSCODING_CONCURRENCY", "2")
+)
 
+# push - the server delivers messages one by one to a queue group
+# pull - the worker fetches batches and settles a batch in one transaction
+payments_stripe_consumer_mode = env("PAYMENTS_STRIPE_CONSUMER_MODE", "push")
+payments_stripe_batch_size = int(env("PAYMENTS_STRIPE_BATCH_SIZE", "64"))
+payments_stripe_batch_max_wait = float(env("PAYMENTS_STRIPE_BATCH_MAX_WAIT", "1.0"))
+product_images_transcoding_consumer_mode = env(
+    "PRODUCT_IMAGES_TRANSCODING_CONSUMER_MODE", "push"
+)
+product_images_transcoding_batch_size = int(
+    env("PRODUCT_IMAGES_TRANSCODING_BATCH_SIZE", "8")
+)
+product_images_transcoding_batch_max_wait = float(
+    env("PRODUCT_IMAGES_TRANSCODING_BATCH_MAX_WAIT", "1.0")
+)
 
 any_payment_intent_subject = "payment_intent.created.>"
 any_charge_subject = "charge.succeeded.>"
@@ -227,7 +203,52 @@ product_images_transcoding_stream_config = StreamConfig(
 )
 
 
-def product_images_transcoding_consumer_config(consumer_name: str) -> ConsumerConfig:
+# Events of the asynchronous ContextBus executors, run by the worker
+context_events_concurrency = int(env("CONTEXT_EVENTS_CONCURRENCY", "8"))
+context_events_ack_wait = float(env("CONTEXT_EVENTS_ACK_WAIT", "30"))
+context_events_max_deliver = int(env("CONTEXT_EVENTS_MAX_DELIVER", "5"))
+
+context_events_stream = "CONTEXT_EVENTS"
+
+context_events_stream_config = StreamConfig(
+    name=context_events_stream,
+    retention=RetentionPolicy.WORK_QUEUE,
+    discard=DiscardPolicy.OLD,
+    subjects=["context.event.>"],
+)
+
+context_event_delivery = ContextEventDelivery(
+    context_events_stream, "context.event", nats_connection.jetstream
+).on(
+    CatalogItemDeletedEvent,
+    lambda scope, e: NormalizeCatalogItemsPositions(
+        scope.session, scope.queries
+    ).execute(e),
+)
+
+
+def context_events_consumer_config(
+    consumer_name: str,
+    max_ack_pending: int = context_events_concurrency,
+) -> ConsumerConfig:
+    # Unacked events are redelivered after ack_wait, up to max_deliver times
+    return ConsumerConfig(
+        name=consumer_name,
+        deliver_policy=DeliverPolicy.ALL,
+        deliver_group="context_events_group_0",
+        deliver_subject="context.event",
+        filter_subjects=["context.event.*"],
+        ack_policy=AckPolicy.EXPLICIT,
+        ack_wait=context_events_ack_wait,
+        max_deliver=context_events_max_deliver,
+        max_ack_pending=max_ack_pending,
+    )
+
+
+def product_images_transcoding_consumer_config(
+    consumer_name: str,
+    max_ack_pending: int = product_images_transcoding_concurrency,
+) -> ConsumerConfig:
     return ConsumerConfig(
         name=consumer_name,
         deliver_policy=DeliverPolicy.ALL,
@@ -235,11 +256,13 @@ def product_images_transcoding_consumer_config(consumer_name: str) -> ConsumerCo
         deliver_subject="image.transcoding.required",
         filter_subjects=[product_image_transcoding_required_subject("*")],
         ack_policy=AckPolicy.EXPLICIT,
+        max_ack_pending=max_ack_pending,
     )
 
 
 def payments_stripe_payment_intent_created_consumer_config(
     consumer_name: str,
+    max_ack_pending: int = payments_stripe_concurrency,
 ) -> ConsumerConfig:
     return ConsumerConfig(
         name=consumer_name,
@@ -248,11 +271,13 @@ def payments_stripe_payment_intent_created_consumer_config(
         deliver_subject="payment_intent.created",
         filter_subjects=["payment_intent.created.*"],
         ack_policy=AckPolicy.EXPLICIT,
+        max_ack_pending=max_ack_pending,
     )
 
 
 def payments_stripe_charge_succeeded_consumer_config(
     consumer_name: str,
+    max_ack_pending: int = payments_stripe_concurrency,
 ) -> ConsumerConfig:
     return ConsumerConfig(
         name=consumer_name,
@@ -261,9 +286,192 @@ def payments_stripe_charge_succeeded_consumer_config(
         deliver_subject="charge.succeeded",
         filter_subjects=["charge.succeeded.*"],
         ack_policy=AckPolicy.EXPLICIT,
+        max_ack_pending=max_ack_pending,
+    )
+
+
+def pull_consumer_config(
+    consumer_name: str, filter_subject: str, max_ack_pending: int
+) -> ConsumerConfig:
+    # Acks stay explicit, several pullers share the consumer and AckPolicy.ALL
+    # would ack messages another worker still holds
+    return ConsumerConfig(
+        name=consumer_name,
+        durable_name=consumer_name,
+        deliver_policy=DeliverPolicy.ALL,
+        filter_subjects=[filter_subject],
+        ack_policy=AckPolicy.EXPLICIT,
+        max_ack_pending=max_ack_pending,
     )
 
 
+stripe_payment_intent_created_consumer = "stripe_payment_intent_created_0"
+stripe_charge_succeeded_consumer = "stripe_charge_succeeded_0"
+product_images_transcoding_consumer = "product_images_transcoding_0"
+context_events_consumer = "context_events_0"
+
+# A push consumer can't be turned into a pull one, pull mode binds its own durables
+stripe_payment_intent_created_pull_consumer = "stripe_payment_intent_created_pull_0"
+stripe_charge_succeeded_pull_consumer = "stripe_charge_succeeded_pull_0"
+product_images_transcoding_pull_consumer = "product_images_transcoding_pull_0"
+
+
+def consumer_configs() -> list[tuple[StreamConfig, ConsumerConfig]]:
+    configs = list[tuple[StreamConfig, ConsumerConfig]]()
+
+    if payments_stripe_consumer_mode == "pull":
+        configs += [
+            (
+                payments_stripe_stream_config,
+                pull_consumer_config(
+                    stripe_payment_intent_created_pull_consumer,
+                    "payment_intent.created.*",
+                    payments_stripe_batch_size,
+                ),
+            ),
+            (
+                payments_stripe_stream_config,
+                pull_consumer_config(
+                    stripe_charge_succeeded_pull_consumer,
+                    "charge.succeeded.*",
+                    payments_stripe_batch_size,
+                ),
+            ),
+        ]
+    else:
+        configs += [
+            (
+                payments_stripe_stream_config,
+                payments_stripe_payment_intent_created_consumer_config(
+                    stripe_payment_intent_created_consumer
+                ),
+            ),
+            (
+                payments_stripe_stream_config,
+                payments_stripe_charge_succeeded_consumer_config(
+                    stripe_charge_succeeded_consumer
+                ),
+            ),
+        ]
+
+    if product_images_transcoding_consumer_mode == "pull":
+        configs.append(
+            (
+                product_images_transcoding_stream_config,
+                pull_consumer_config(
+                    product_images_transcoding_pull_consumer,
+                    product_image_transcoding_required_subject("*"),
+                    product_images_transcoding_batch_size,
+                ),
+            )
+        )
+    else:
+        configs.append(
+            (
+                product_images_transcoding_stream_config,
+                product_images_transcoding_consumer_config(
+                    product_images_transcoding_consumer
+                ),
+            )
+        )
+
+    configs.append(
+        (
+            context_events_stream_config,
+            context_events_consumer_config(context_events_consumer),
+        )
+    )
+
+    return configs
+
+
+def consumer_names() -> list[str]:
+    return [consumer.name for _, consumer in consumer_configs()]  # pyright: ignore
+
+
+def create_consumer_workers(
+    selected: Collection[str] | None = None,
+) -> list[ConsumerWorker]:
+    """
+    Workers for the consumers of the current modes, selected may hold consumer
+    or stream names, by default every consumer gets a worker.
+    """
+    workers = list[ConsumerWorker]()
+
+    def worker_connection(consumer_name: str) -> NatsConnection:
+        return NatsConnection(nats_server, name=consumer_name)
+
+    stripe_handlers = {
+        stripe_charge_succeeded_consumer: charge_succeeded_worker_handler,
+        stripe_payment_intent_created_consumer: payment_intent_created_handler,
+        stripe_charge_succeeded_pull_consumer: charge_succeeded_batch_handler,
+        stripe_payment_intent_created_pull_consumer: payment_intent_created_batch_handler,
+    }
+
+    for stream_config, consumer_config in consumer_configs():
+        stream: str = stream_config.name  # pyright: ignore
+        consumer_name: str = consumer_config.name  # pyright: ignore
+        if selected is not None and not {stream, consumer_name} & set(selected):
+            continue
+
+        if handler := stripe_handlers.get(consumer_name):
+            args = (session_manager,)
+        elif consumer_name == context_events_consumer:
+            handler = context_event_delivery.handle
+            args = (session_manager,)
+        else:
+            handler = product_image_transcoding_handler
+            args = (session_manager, minio_object_store_factory())
+
+        if consumer_config.deliver_subject:
+            workers.append(
+                PushConsumerWorker(
+                    worker_connection(consumer_name),
+                    stream,
+                    consumer_config,
+                    consumer_name,
+                    handler,
+                    query_processor_factory,
+                    *args,
+                    max_in_flight=consumer_config.max_ack_pending or 1,
+                )
+            )
+            continue
+
+        if stream_config is payments_stripe_stream_config:
+            batch_size = payments_stripe_batch_size
+            max_wait = payments_stripe_batch_max_wait
+        else:
+            handler = per_message_batch_handler(
+                handler, product_images_transcoding_concurrency
+            )
+            batch_size = product_images_transcoding_batch_size
+            max_wait = product_images_transcoding_batch_max_wait
+
+        workers.append(
+            PullConsumerWorker(
+                worker_connection(consumer_name),
+                stream,
+                consumer_config,
+                consumer_name,
+                handler,
+                query_processor_factory,
+                *args,
+                batch_size=batch_size,
+                max_wait=max_wait,
+            )
+        )
+
+    return workers
+
+
+consumer_workers = list[ConsumerWorker]()
+
+# Disable to keep the API process for HTTP only and run the consumers with
+# `python -m bakery_ecommerce.worker`
+api_run_consumers = env("API_RUN_CONSUMERS", "true").lower() in ("1", "true")
+
+
 async def get_or_create_stream(js: JetStreamContext, config: StreamConfig):
     if not config.name:
         raise ValueError("Stream config must have a name")
@@ -288,81 +496,53 @@ async def get_or_create_consumer(
         consumer = await js.consumer_info(stream_config.name, consumer_config.name, 1)
     except Exception as e:
         print(f"not found consumer {e}", type(e))
+        return await js.add_consumer(stream_config.name, consumer_config, 1)
+
+    if consumer.config.max_ack_pending != consumer_config.max_ack_pending:
+        # Adding a durable consumer with the same name updates its config
         consumer = await js.add_consumer(stream_config.name, consumer_config, 1)
 
     return consumer
 
 
+async def setup_jetstream(js: JetStreamContext):
+    await get_or_create_stream(js, payments_stripe_stream_config)
+    await get_or_create_stream(js, product_images_transcoding_stream_config)
+    await get_or_create_stream(js, context_events_stream_config)
+    for stream_config, consumer_config in consumer_configs():
+        await get_or_create_consumer(js, stream_config, consumer_config)
+
+
 @contextlib.asynccontextmanager
 async def lifespan(_: fastapi.FastAPI):
-    async with await nats.connect(nats_server) as nc:
-        js = nc.jetstream()
-        await get_or_create_stream(js, payments_stripe_stream_config)
-        await get_or_create_stream(js, product_images_transcoding_stream_config)
-        await get_or_create_consumer(
-            js,
-            payments_stripe_stream_config,
-            payments_stripe_payment_intent_created_consumer_config(
-                "stripe_payment_intent_created_0"
-            ),
-        )
-        await get_or_create_consumer(
-            js,
-            payments_stripe_stream_config,
-            payments_stripe_charge_succeeded_consumer_config(
-                "stripe_charge_succeeded_0"
-            ),
-        )
-        await get_or_create_consumer(
-            js,
-            product_images_transcoding_stream_config,
-            product_images_transcoding_consumer_config(
-                "product_images_transcoding_0",
-            ),
-        )
+    await nats_connection.connect()
+    await setup_jetstream(nats_connection.jetstream())
 
     stripe_secret_key = os.environ.get("STRIPE_SECRET_KEY")
     print("Use stripe secret key:", stripe_secret_key)
     stripe.api_key = stripe_secret_key
 
-    name = "stripe_charge_succeeded_consumer_0"
-    stream: str = payments_stripe_stream_config.name  # pyright: ignore
-    asyncio.ensure_future(
-        spawn_nats_worker(
-            stream,
-            payments_stripe_charge_succeeded_consumer_config(name),
-            name,
-            charge_succeeded_worker_handler,
-            session_manager,
-        )
-    )
+    consumer_workers.clear()
+    if api_run_consumers:
+        consumer_workers.extend(create_consumer_workers())
+    for worker in consumer_workers:
+        asyncio.ensure_future(worker.run())
 
-    name = "stripe_payment_intent_created_consumer_0"
-    asyncio.ensure_future(
-        spawn_nats_worker(
-            stream,
-            payments_stripe_payment_intent_created_consumer_config(name),
-            name,
-            payment_intent_created_handler,
-            session_manager,
-        )
-    )
+    buckets = query_cache_buckets(nats_connection.client())
+    await buckets.create_all()
 
-    name = "product_images_transcoding_consumer_0"
-    stream: str = product_images_transcoding_stream_config.name  # pyright: ignore
-    asyncio.ensure_future(
-        spawn_nats_worker(
-            stream,
-            product_images_transcoding_consumer_config(name),
-            name,
-            product_image_transcoding_handler,
-            session_manager,
-            minio_object_store_factory(),
-        )
-    )
+    cache_watcher = QueryCacheWatcher(buckets, query_local_cache, query_cache_configs)
+    cache_watcher.start()
 
     yield
 
+    await cache_watcher.stop()
+
+    for worker in consumer_workers:
+        await worker.stop()
+
+    await nats_connection.close()
+
     if not session_manager.is_closed():
         await session_manager.close()
 
@@ -379,12 +559,60 @@ query_handlers = QueryProcessorHandlers(
 )
 
 
+# Buckets of the cacheable queries, watched to keep query_local_cache coherent
+query_cache_configs: list[KeyValueConfig] = [
+    private_key_signatures_cache_config,
+]
+
+# Shared by every request of the process, TTLs come from the query cache_config
+query_local_cache = LocalQueryCache(
+    max_size=int(env("QUERY_LOCAL_CACHE_SIZE", "1024")),
+    max_ttl=float(env("QUERY_LOCAL_CACHE_MAX_TTL", "60")),
+)
+
+
+query_single_flight = SingleFlight()
+
+query_instrumentation = QueryInstrumentation()
+query_instrumentation.track_statements(session_manager.engine())
+for replica_engine in session_manager.replica_engines():
+    query_instrumentation.track_statements(replica_engine)
+
+# Bucket handles belong to the JetStream context of a connection, the API and
+# each consumer worker connection keep their own
+__query_cache_buckets = weakref.WeakKeyDictionary[NATS, KeyValueBuckets]()
+
+
+def query_cache_buckets(nats: NATS) -> KeyValueBuckets:
+    if nats not in __query_cache_buckets:
+        __query_cache_buckets[nats] = KeyValueBuckets(
+            nats.jetstream(), query_cache_configs
+        )
+    return __query_cache_buckets[nats]
+
+
 def query_processor_factory(nats: NATS) -> QueryProcessor:
-    return QueryProcessor(query_handlers, QueryCache(nats))
+    return QueryProcessor(
+        query_handlers,
+        QueryCache(query_cache_buckets(nats), query_local_cache, query_instrumentation),
+        query_single_flight,
+        query_instrumentation,
+    )
 
 
-def query_processor(nats: NATS = fastapi.Depends(request_nats_session)):
-    yield QueryProcessor(query_handlers, QueryCache(nats))
+def query_processor():
+    # Created once per request, so the memo lives as long as the request
+    yield QueryProcessor(
+        query_handlers,
+        QueryCache(
+            query_cache_buckets(nats_connection.client()),
+            query_local_cache,
+            query_instrumentation,
+        ),
+        query_single_flight,
+        query_instrumentation,
+        QueryMemo(),
+    )
 
 
 def request_query_processor(
@@ -394,5 +622,50 @@ def request_query_processor(
     return cache_request_attr(request, queries)
 
 
-def request_context_bus(request: fastapi.Request) -> ContextBus:
-    return cache_request_attr(request, ContextBus(session_manager.session_maker()))
+# Spans of the ContextBus executors, reported in the Server-Timing header and
+# kept for /api/metrics/context-bus. Off by default, the spans expose handler names
+context_bus_trace = env("CONTEXT_BUS_TRACE", "false").lower() in ("1", "true")
+context_trace_log = ContextTraceLog(int(env("CONTEXT_BUS_TRACE_LOG_SIZE", "100")))
+
+
+def request_context_trace(request: fastapi.Request) -> ContextTrace | None:
+    if not context_bus_trace:
+        return None
+
+    trace = ContextTrace()
+    # Set by the server timing middleware, absent when a route runs without it
+    if (traces := getattr(request.state, "context_traces", None)) is not None:
+        traces.append(trace)
+    return trace
+
+
+# Seconds a request ContextBus may run from its first publish, 0 disables it
+context_bus_timeout = float(env("CONTEXT_BUS_TIMEOUT", "30")) or None
+
+
+def request_context_bus(
+    request: fastapi.Request,
+    outbox: ContextDeliveryOutbox = fastapi.Depends(context_delivery_outbox),
+) -> ContextBus:
+    return cache_request_attr(
+        request,
+        ContextBus(
+            session_manager.session_maker(),
+            trace=request_context_trace(request),
+            timeout=context_bus_timeout,
+            delivery=outbox,
+        ),
+    )
+
+
+async def request_read_context_bus(
+    request: fastapi.Request,
+    outbox: ContextDeliveryOutbox = fastapi.Depends(context_delivery_outbox),
+) -> ContextBus:
+    # Not cached by type on the request, it would collide with request_context_bus
+    return ContextBus(
+        await session_manager.read_session_maker(),
+        trace=request_context_trace(request),
+        timeout=context_bus_timeout,
+        delivery=outbox,
+    )
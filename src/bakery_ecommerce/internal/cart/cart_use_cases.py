@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from sqlalchemy import and_, delete, select
+from sqlalchemy import and_, bindparam, delete, select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,6 +22,9 @@ class GetUserCartResult:
     cart: Cart
 
 
+_user_cart_stmt = select(Cart).where(Cart.user_id == bindparam("user_id"))
+
+
 class GetUserCart:
     def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
         self.__context = context
@@ -29,9 +32,10 @@ class GetUserCart:
 
     async def execute(self, params: GetUserCartEvent) -> GetUserCartResult:
         async def query(session: AsyncSession) -> Cart:
-            stmt = select(Cart).where(Cart.user_id == params.user_id)
             try:
-                result = await session.execute(stmt)
+                result = await session.execute(
+                    _user_cart_stmt, {"user_id": params.user_id}
+                )
                 return result.unique().scalar_one()
             except NoResultFound:
                 cart = Cart()
@@ -42,7 +46,10 @@ class GetUserCart:
             except Exception as e:
                 raise ValueError(f"Unable get or create cart. Err: {e}")
 
-        result = await self.__queries.process(params.session, CustomBuilder(query))
+        result = await self.__queries.process(
+            params.session,
+            CustomBuilder(query, memo_key=("user_id", params.user_id), memo_model=Cart),
+        )
         await self.__context.publish(UserCartRetrievedEvent(result))
         return GetUserCartResult(result)
 
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
 from typing import Any, Self, Sequence
 
-from sqlalchemy import func, insert, select
+from sqlalchemy import bindparam, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bakery_ecommerce.context_bus import ContextEventProtocol, impl_event
+from bakery_ecommerce.context_bus import ContextBus, ContextEventProtocol, impl_event
 from bakery_ecommerce.internal.catalog.store.catalog_queries import (
     NormalizeCatalogItemsPosition,
 )
@@ -15,7 +15,9 @@ from bakery_ecommerce.internal.store.join_queries import (
     JoinRoot,
 )
 from bakery_ecommerce.internal.store.persistence.catalog import Catalog, CatalogItem
+from bakery_ecommerce.internal.store.persistence.product import Product
 
+from bakery_ecommerce.internal.store.pagination import KeysetPagination, Page
 from bakery_ecommerce.internal.store.query import QueryProcessor
 
 
@@ -64,6 +66,11 @@ class GetCatalogListResult:
     catalogs: Sequence[Catalog]
 
 
+_catalog_list_stmt = (
+    select(Catalog).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+
+
 class GetCatalogList:
     def __init__(self, session: AsyncSession, queries: QueryProcessor) -> None:
         self.__session = session
@@ -73,8 +80,10 @@ class GetCatalogList:
         async def get_catalog_by_cursor(
             session: AsyncSession,
         ) -> Sequence[Catalog]:
-            stmt = select(Catalog).limit(params.page_size).offset(params.page)
-            row = await session.execute(stmt)
+            row = await session.execute(
+                _catalog_list_stmt,
+                {"limit": params.page_size, "offset": params.page},
+            )
             return row.scalars().unique().all()
 
         operation = CustomBuilder(get_catalog_by_cursor)
@@ -82,6 +91,45 @@ class GetCatalogList:
         return GetCatalogListResult(catalogs)
 
 
+@dataclass
+@impl_event(ContextEventProtocol)
+class GetCatalogCursorListEvent:
+    cursor: str | None
+    page_size: int
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
+@dataclass
+class GetCatalogCursorListResult:
+    catalogs: Sequence[Catalog]
+    next_cursor: str | None
+
+
+_catalog_pages = KeysetPagination(select(Catalog), Catalog.id)
+
+
+class GetCatalogCursorList:
+    def __init__(self, session: AsyncSession, queries: QueryProcessor) -> None:
+        self.__session = session
+        self.__queries = queries
+
+    async def execute(
+        self, params: GetCatalogCursorListEvent
+    ) -> GetCatalogCursorListResult:
+        async def get_catalog_page(session: AsyncSession) -> Page[Catalog]:
+            stmt, values = _catalog_pages.statement(params.cursor, params.page_size)
+            row = await session.execute(stmt, values)
+            return _catalog_pages.page(row.scalars().unique().all(), params.page_size)
+
+        page = await self.__queries.process(
+            self.__session, CustomBuilder(get_catalog_page)
+        )
+        return GetCatalogCursorListResult(page.items, page.next_cursor)
+
+
 @dataclass
 @impl_event(ContextEventProtocol)
 class GetCatalogByIdEvent:
@@ -112,8 +160,15 @@ class GetCatalogById:
                     model=CatalogItem,
                     field="catalog_id",
                     root_field="id",
-                )
+                ),
+                Product: JoinOn(
+                    model=Product,
+                    field="id",
+                    root_field="product_id",
+                    parent=CatalogItem,
+                ),
             },
+            order_by=[CatalogItem.position],
         )
 
         result = await self.__queries.process(self.__session, operation)
@@ -181,8 +236,10 @@ class CreateCatalogItem:
 
     async def execute(self, params: CreateCatalogItemEvent) -> CreateCatalogItemResult:
         async def query(session: AsyncSession):
+            # After the last item, positions have gaps until the worker
+            # normalizes them after a delete, a count would repeat one
             position_query = (
-                select(func.count(CatalogItem.id))
+                select(func.coalesce(func.max(CatalogItem.position), 0))
                 .where(CatalogItem.catalog_id == params.catalog_id)
                 .scalar_subquery()
             )
@@ -219,8 +276,21 @@ class DeleteCatalogItemResult:
     success: bool
 
 
+@dataclass
+@impl_event(ContextEventProtocol)
+class CatalogItemDeletedEvent:
+    catalog_id: str
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
 class DeleteCatalogItem:
-    def __init__(self, session: AsyncSession, queries: QueryProcessor) -> None:
+    def __init__(
+        self, context: ContextBus, session: AsyncSession, queries: QueryProcessor
+    ) -> None:
+        self.__context = context
         self.__session = session
         self.__queries = queries
 
@@ -232,11 +302,21 @@ class DeleteCatalogItem:
         if not isinstance(result, bool):
             raise ValueError(f"DeleteCatalogItem must return bool got: {type(result)}")
 
-        normalize_position = NormalizeCatalogItemsPosition(params.catalog_id)
-        await self.__queries.process(self.__session, normalize_position)
+        # The positions are closed up by the worker, a gap keeps the order
+        await self.__context.publish(CatalogItemDeletedEvent(params.catalog_id))
         return DeleteCatalogItemResult(result)
 
 
+class NormalizeCatalogItemsPositions:
+    def __init__(self, session: AsyncSession, queries: QueryProcessor) -> None:
+        self.__session = session
+        self.__queries = queries
+
+    async def execute(self, params: CatalogItemDeletedEvent) -> bool:
+        normalize_position = NormalizeCatalogItemsPosition(params.catalog_id)
+        return await self.__queries.process(self.__session, normalize_position)
+
+
 @dataclass
 @impl_event(ContextEventProtocol)
 class UpdateCatalogItemProductEvent:
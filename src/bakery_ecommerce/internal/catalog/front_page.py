@@ -8,6 +8,7 @@ from bakery_ecommerce.internal.catalog.store.front_page_model import FrontPage
 from bakery_ecommerce.internal.store.crud_queries import CrudOperation
 from bakery_ecommerce.internal.store.join_queries import JoinOn, JoinOperation, JoinRoot
 from bakery_ecommerce.internal.store.persistence.catalog import CatalogItem
+from bakery_ecommerce.internal.store.persistence.product import Product
 from bakery_ecommerce.internal.store.query import QueryProcessor
 
 
@@ -39,8 +40,15 @@ class GetFrontPage:
                     model=CatalogItem,
                     field="catalog_id",
                     root_field="catalog_id",
-                )
+                ),
+                Product: JoinOn(
+                    model=Product,
+                    field="id",
+                    root_field="product_id",
+                    parent=CatalogItem,
+                ),
             },
+            order_by=[CatalogItem.position],
         )
 
         result = await self.__queries.process(self.__session, operation)
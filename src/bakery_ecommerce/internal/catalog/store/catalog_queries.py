@@ -3,6 +3,7 @@ from typing import override
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from bakery_ecommerce.internal.store.crud_queries import AsyncCrud
 from bakery_ecommerce.internal.store.persistence.catalog import CatalogItem
 from bakery_ecommerce.internal.store.query import Query, QueryHandler
 
@@ -30,10 +31,13 @@ class NormalizeCatalogItemsPositionHandler(
         rows = await self.__executor.execute(stmt)
 
         catalog_items = rows.scalars().all()
-        for idx, catalog_item in enumerate(catalog_items, start=1):
-            catalog_item.position = idx
-
-        self.__executor.add_all(catalog_items)
-        await self.__executor.flush()
+        positions = [
+            {"id": catalog_item.id, "position": idx}
+            for idx, catalog_item in enumerate(catalog_items, start=1)
+            if catalog_item.position != idx
+        ]
+
+        # One UPDATE ... FROM (VALUES ...) for every moved item
+        await AsyncCrud(self.__executor, CatalogItem).update_many("id", positions)
 
         return True
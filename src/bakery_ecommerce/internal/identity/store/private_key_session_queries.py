@@ -12,6 +12,13 @@ from bakery_ecommerce.internal.identity.store.private_key_session_model import (
 from bakery_ecommerce.internal.store import query
 
 
+private_key_signatures_cache_config = KeyValueConfig(
+    bucket="private_key_signatures",
+    storage=StorageType.MEMORY,
+    ttl=60 * 5,
+)
+
+
 @dataclass
 @query.impl_cache(query.QueryCacheKeyProtocol[dict[str, Any] | None])
 class GetPrivateKeySignature(query.Query[dict[str, Any] | None]):
@@ -22,11 +29,7 @@ class GetPrivateKeySignature(query.Query[dict[str, Any] | None]):
         return f"{self.user_id}.{self.kid}"
 
     def cache_config(self) -> KeyValueConfig:
-        return KeyValueConfig(
-            bucket="private_key_signatures",
-            storage=StorageType.MEMORY,
-            ttl=60 * 5,
-        )
+        return private_key_signatures_cache_config
 
     def cache_serialize(self, model: dict[str, Any] | None) -> str:
         if model is None:
@@ -36,6 +39,10 @@ class GetPrivateKeySignature(query.Query[dict[str, Any] | None]):
     def cache_deserialize(self, value: str) -> dict[str, Any] | None:
         return json.loads(value)
 
+    def cache_negative_ttl(self) -> float:
+        # Tokens with an unknown kid must not reach the database on every request
+        return 10
+
 
 class GetPrivateKeySignatureHandler(
     query.QueryHandler[GetPrivateKeySignature, dict[str, Any] | None]
@@ -1,32 +1,58 @@
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
 from typing import Self
 from uuid import UUID
 from bakery_ecommerce.context_bus import (
     ContextEventProtocol,
     ContextPersistenceEvent,
+    ContextReadEvent,
     impl_event,
 )
 from bakery_ecommerce.internal.cart.store.cart_model import Cart
 from bakery_ecommerce.internal.order.store.order_model import (
     Order,
+    Order_Status_Enum,
     Payment_Provider_Enum,
 )
 
 
+class Orders_Sort_Enum(StrEnum):
+    CREATED_AT = "created_at"
+    ORDER_STATUS = "order_status"
+
+
 @dataclass
 @impl_event(ContextEventProtocol)
-class GetOrdersEvent(ContextPersistenceEvent):
+class GetOrdersEvent(ContextReadEvent):
     page: int
     page_size: int
+    order_status: Order_Status_Enum | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    sort: Orders_Sort_Enum = Orders_Sort_Enum.CREATED_AT
+    descending: bool = True
+
+    def __post_init__(self):
+        # orders.created_at is a naive UTC timestamp, asyncpg can't bind an
+        # aware datetime to it
+        self.created_from = _naive_utc(self.created_from)
+        self.created_to = _naive_utc(self.created_to)
 
     @property
     def payload(self) -> Self:
         return self
 
 
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
 @dataclass
 @impl_event(ContextEventProtocol)
-class GetUserOrdersEvent(ContextPersistenceEvent):
+class GetUserOrdersEvent(ContextReadEvent):
     page: int
     page_size: int
     user_id: UUID
@@ -36,6 +62,18 @@ class GetUserOrdersEvent(ContextPersistenceEvent):
         return self
 
 
+@dataclass
+@impl_event(ContextEventProtocol)
+class GetUserOrdersCursorEvent(ContextReadEvent):
+    cursor: str | None
+    page_size: int
+    user_id: UUID
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
 @dataclass
 @impl_event(ContextEventProtocol)
 class GetUserDraftOrderEvent(ContextPersistenceEvent):
@@ -1,10 +1,20 @@
+import functools
 from dataclasses import dataclass
 from typing import Any, Sequence, TypedDict
 from uuid import UUID
 from fastapi import HTTPException
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    Select,
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    select,
+    text,
+)
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load
 
 from bakery_ecommerce.context_bus import ContextBus
 from bakery_ecommerce.internal.cart.store.cart_item_model import CartItem
@@ -16,7 +26,9 @@ from bakery_ecommerce.internal.order.order_events import (
     ChangePaymentMethodEvent,
     GetOrdersEvent,
     GetUserDraftOrderEvent,
+    GetUserOrdersCursorEvent,
     GetUserOrdersEvent,
+    Orders_Sort_Enum,
     UserDraftOrderRetrievedEvent,
 )
 from bakery_ecommerce.internal.order.store.order_model import (
@@ -28,14 +40,11 @@ from bakery_ecommerce.internal.order.store.order_model import (
 from bakery_ecommerce.internal.store.crud_queries import (
     CrudOperation,
     CustomBuilder,
+    load_options,
 )
-from bakery_ecommerce.internal.store.join_queries import (
-    JoinOn,
-    JoinOperation,
-    JoinRoot,
-)
+from bakery_ecommerce.internal.store.pagination import KeysetPagination, Page
+from bakery_ecommerce.internal.store.persistence.product import Product
 from bakery_ecommerce.internal.store.query import QueryProcessor
-from bakery_ecommerce.utils import get_model_dict
 
 
 @dataclass
@@ -53,6 +62,84 @@ class OrderWithCustomer(TypedDict):
 @dataclass
 class GetOrdersResult:
     orders_with_customers: list[OrderWithCustomer]
+    # Exact when total_exact. Past ORDERS_COUNT_LIMIT a filtered list only
+    # reports that there are at least ORDERS_COUNT_LIMIT orders, an unfiltered
+    # one reports the table estimate
+    total: int
+    total_exact: bool
+
+
+# Orders counted exactly, past it the total is a lower bound or an estimate
+ORDERS_COUNT_LIMIT = 10_000
+
+
+# Only what GetOrdersResult serializes, the customer columns and the order
+# items products without their images. The order items are selectin loaded so
+# the page limit applies to the orders rows. Built on first use, loader
+# options need the configured mappers
+@functools.cache
+def _orders_load_options() -> list[Load]:
+    return [
+        *load_options(User, columns=["first_name", "last_name", "email"]),
+        Load(Order)
+        .selectinload(Order.order_items)
+        .joinedload(OrderItem.product)
+        .raiseload(Product.product_images),
+    ]
+
+
+def _orders_where(status: bool, created_from: bool, created_to: bool) -> list[Any]:
+    where = list[Any]()
+    if status:
+        where.append(Order.order_status == bindparam("order_status"))
+    if created_from:
+        where.append(Order.created_at >= bindparam("created_from"))
+    if created_to:
+        where.append(Order.created_at < bindparam("created_to"))
+    return where
+
+
+# Needs the (created_at, id) and (order_status, created_at, id) indexes of the
+# orders table
+@functools.cache
+def _orders_stmt(
+    status: bool,
+    created_from: bool,
+    created_to: bool,
+    sort: Orders_Sort_Enum,
+    descending: bool,
+) -> Select:
+    columns = [getattr(Order, sort), Order.id]
+    if sort is Orders_Sort_Enum.ORDER_STATUS:
+        columns.insert(1, Order.created_at)
+
+    return (
+        select(Order, User)
+        .outerjoin(User, User.id == Order.user_id)
+        .where(*_orders_where(status, created_from, created_to))
+        .order_by(*(column.desc() if descending else column for column in columns))
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+        .options(*_orders_load_options())
+    )
+
+
+@functools.cache
+def _orders_count_stmt(status: bool, created_from: bool, created_to: bool) -> Select:
+    # Stops counting past the limit, the cost doesn't grow with the table
+    matched = (
+        select(literal_column("1"))
+        .select_from(Order)
+        .where(*_orders_where(status, created_from, created_to))
+        .limit(bindparam("count_limit"))
+        .subquery()
+    )
+    return select(func.count()).select_from(matched)
+
+
+_orders_estimate_stmt = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'orders'::regclass"
+)
 
 
 class GetOrders:
@@ -60,32 +147,65 @@ class GetOrders:
         self.__queries = queries
 
     async def execute(self, params: GetOrdersEvent) -> GetOrdersResult:
-        operation = JoinOperation(
-            where_value=None,
-            join_root=JoinRoot(model=Order, field="id"),
-            join_on={User: JoinOn(model=User, field="id", root_field="user_id")},
+        filters = (
+            params.order_status is not None,
+            params.created_from is not None,
+            params.created_to is not None,
         )
-        result = await self.__queries.process(params.session, operation)
+        values: dict[str, Any] = {
+            "order_status": params.order_status,
+            "created_from": params.created_from,
+            "created_to": params.created_to,
+        }
+        values = {key: value for key, value in values.items() if value is not None}
+
+        async def query(session: AsyncSession) -> GetOrdersResult:
+            page_size = max(params.page_size, 1)
+            stmt = _orders_stmt(*filters, params.sort, params.descending)
+            result = await session.execute(
+                stmt,
+                {
+                    **values,
+                    "limit": page_size,
+                    "offset": max(params.page - 1, 0) * page_size,
+                },
+            )
 
-        orders = result.get_strict(Order)
-        users = {user.id: user for user in result.get_strict(User)}
+            orders_with_customers = list[OrderWithCustomer]()
+            for order, user in result.unique().all():
+                customer: Customer | None = None
+                if user:
+                    customer = Customer(user.first_name, user.last_name, user.email)
+                orders_with_customers.append(
+                    OrderWithCustomer(order=order.to_dict(), customer=customer)
+                )
 
-        orders_with_customers = list[OrderWithCustomer]()
+            total, total_exact = await self.__count(session, filters, values)
+            return GetOrdersResult(orders_with_customers, total, total_exact)
 
-        for order in orders:
-            user = users.get(order.user_id)
-            customer: Customer | None = None
-            if user:
-                customer = Customer(user.first_name, user.last_name, user.email)
+        return await self.__queries.process(params.session, CustomBuilder(query))
 
-            orders_with_customers.append(
-                OrderWithCustomer(
-                    order=order.to_dict(),
-                    customer=customer,
-                )
-            )
+    async def __count(
+        self,
+        session: AsyncSession,
+        filters: tuple[bool, bool, bool],
+        values: dict[str, Any],
+    ) -> tuple[int, bool]:
+        result = await session.execute(
+            _orders_count_stmt(*filters),
+            {**values, "count_limit": ORDERS_COUNT_LIMIT + 1},
+        )
+        total = result.scalar_one()
+        if total <= ORDERS_COUNT_LIMIT:
+            return total, True
+
+        # A lower bound, the counting stopped at the limit
+        if any(filters):
+            return ORDERS_COUNT_LIMIT, False
 
-        return GetOrdersResult(orders_with_customers)
+        # reltuples is -1 until the table is analyzed
+        estimate = (await session.execute(_orders_estimate_stmt)).scalar_one()
+        return max(estimate, ORDERS_COUNT_LIMIT), False
 
 
 @dataclass
@@ -93,35 +213,89 @@ class GetUserOrdersResult:
     orders: Sequence[Order]
 
 
+_user_orders_stmt = (
+    select(Order)
+    .where(
+        and_(
+            Order.user_id == bindparam("user_id"),
+            Order.order_status != Order_Status_Enum.DRAFT,
+        )
+    )
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+
 class GetUserOrders:
     def __init__(self, queries: QueryProcessor) -> None:
         self.__queries = queries
 
     async def execute(self, params: GetUserOrdersEvent) -> GetUserOrdersResult:
         async def query(session: AsyncSession) -> Sequence[Order]:
-            stmt = (
-                select(Order)
-                .where(
-                    and_(
-                        Order.user_id == params.user_id,
-                        Order.order_status != Order_Status_Enum.DRAFT,
-                    )
-                )
-                .limit(params.page_size)
-                .offset(params.page)
+            result = await session.execute(
+                _user_orders_stmt,
+                {
+                    "user_id": params.user_id,
+                    "limit": params.page_size,
+                    "offset": params.page,
+                },
             )
-            result = await session.execute(stmt)
             return result.unique().scalars().all()
 
         result = await self.__queries.process(params.session, CustomBuilder(query))
         return GetUserOrdersResult(result)
 
 
+@dataclass
+class GetUserOrdersCursorResult:
+    orders: Sequence[Order]
+    next_cursor: str | None
+
+
+# Needs the (user_id, id) index of the orders table
+_user_order_pages = KeysetPagination(
+    select(Order).where(
+        and_(
+            Order.user_id == bindparam("user_id"),
+            Order.order_status != Order_Status_Enum.DRAFT,
+        )
+    ),
+    Order.id,
+)
+
+
+class GetUserOrdersCursor:
+    def __init__(self, queries: QueryProcessor) -> None:
+        self.__queries = queries
+
+    async def execute(
+        self, params: GetUserOrdersCursorEvent
+    ) -> GetUserOrdersCursorResult:
+        async def query(session: AsyncSession) -> Page[Order]:
+            stmt, values = _user_order_pages.statement(params.cursor, params.page_size)
+            values["user_id"] = params.user_id
+            result = await session.execute(stmt, values)
+            return _user_order_pages.page(
+                result.unique().scalars().all(), params.page_size
+            )
+
+        page = await self.__queries.process(params.session, CustomBuilder(query))
+        return GetUserOrdersCursorResult(page.items, page.next_cursor)
+
+
 @dataclass
 class GetUserDraftOrderResult:
     order: Order
 
 
+_user_draft_order_stmt = select(Order).where(
+    and_(
+        Order.user_id == bindparam("user_id"),
+        Order.order_status == Order_Status_Enum.DRAFT,
+    ),
+)
+
+
 class GetUserDraftOrder:
     def __init__(self, context: ContextBus, queries: QueryProcessor) -> None:
         self.__context = context
@@ -129,14 +303,10 @@ class GetUserDraftOrder:
 
     async def execute(self, params: GetUserDraftOrderEvent) -> GetUserDraftOrderResult:
         async def query(session: AsyncSession) -> Order:
-            stmt = select(Order).where(
-                and_(
-                    Order.user_id == params.user_id,
-                    Order.order_status == Order_Status_Enum.DRAFT,
-                ),
-            )
             try:
-                result = await session.execute(stmt)
+                result = await session.execute(
+                    _user_draft_order_stmt, {"user_id": params.user_id}
+                )
                 return result.unique().scalar_one()
             except NoResultFound:
                 order = Order()
@@ -152,7 +322,10 @@ class GetUserDraftOrder:
             except Exception as e:
                 raise ValueError(f"Unable get or create order. Err: {e}")
 
-        result = await self.__queries.process(params.session, CustomBuilder(query))
+        result = await self.__queries.process(
+            params.session,
+            CustomBuilder(query, memo_key=("draft", params.user_id), memo_model=Order),
+        )
         await self.__context.publish(UserDraftOrderRetrievedEvent(order=result))
         return GetUserDraftOrderResult(result)
 
@@ -216,7 +389,11 @@ class CartItemsToOrderItems:
         await params.session.flush()
         result = await self.__queries.process(
             params.session,
-            CrudOperation(Order, lambda q: q.get_one_by_field("id", params.order.id)),
+            CrudOperation(
+                Order,
+                lambda q: q.get_one_by_field("id", params.order.id),
+                memo_key=("id", params.order.id),
+            ),
         )
         await self.__context.publish(CartItemsToOrderItemsConvertedEvent(result))
         return CartItemsToOrderItemsResult(result)
@@ -228,39 +405,41 @@ class CartItemsToOrderItems:
         cart_items: list[CartItem],
     ):
         existing_order_items = {i.product_id: i for i in order.order_items}
+        updated_order_items = list[dict[str, Any]]()
+        created_order_items = list[dict[str, Any]]()
 
         for cart_item in cart_items:
-            if cart_item.product_id in existing_order_items:
-                order_item = existing_order_items[cart_item.product_id]
-                order_item.quantity = cart_item.quantity
-                order_item.price = cart_item.product.price
-
-                price_multiplied, price_multiplier = (
-                    self.__billing.convert_price_to_price_with_cents(order_item.price)
-                )
-                order_item.price_multiplied = price_multiplied
-                order_item.price_multiplier = price_multiplier
+            price = cart_item.product.price
+            price_multiplied, price_multiplier = (
+                self.__billing.convert_price_to_price_with_cents(price)
+            )
+            order_item = {
+                "quantity": cart_item.quantity,
+                "price": price,
+                "price_multiplied": price_multiplied,
+                "price_multiplier": price_multiplier,
+            }
 
-                order_item_dict = get_model_dict(order_item)
-                operation = CrudOperation(
-                    OrderItem,
-                    lambda q: q.update_partial("id", order_item.id, order_item_dict),
-                )
-                await self.__queries.process(session, operation)
+            if cart_item.product_id in existing_order_items:
+                order_item["id"] = existing_order_items[cart_item.product_id].id
+                updated_order_items.append(order_item)
             else:
-                order_item = OrderItem()
-                order_item.order_id = order.id
-                order_item.product_id = cart_item.product_id
-
-                order_item.price = cart_item.product.price
-                order_item.quantity = cart_item.quantity
+                order_item["order_id"] = order.id
+                order_item["product_id"] = cart_item.product_id
+                created_order_items.append(order_item)
 
-                price_multiplied, price_multiplier = (
-                    self.__billing.convert_price_to_price_with_cents(order_item.price)
-                )
-                order_item.price_multiplied = price_multiplied
-                order_item.price_multiplier = price_multiplier
-                session.add(order_item)
+        if updated_order_items:
+            await self.__queries.process(
+                session,
+                CrudOperation(
+                    OrderItem, lambda q: q.update_many("id", updated_order_items)
+                ),
+            )
+        if created_order_items:
+            await self.__queries.process(
+                session,
+                CrudOperation(OrderItem, lambda q: q.create_many(created_order_items)),
+            )
 
     async def __sanitize_order_items(
         self,
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from bakery_ecommerce.internal.order.order_events import (
+    GetOrdersEvent,
+    Orders_Sort_Enum,
+)
+from bakery_ecommerce.internal.order.order_use_cases import (
+    _orders_count_stmt,
+    _orders_stmt,
+)
+
+
+def compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_orders_stmt_filters_and_sort():
+    stmt = compile(_orders_stmt(True, False, True, Orders_Sort_Enum.CREATED_AT, True))
+
+    assert "orders.order_status = %(order_status)s" in stmt
+    assert "orders.created_at < %(created_to)s" in stmt
+    assert "created_from" not in stmt
+    assert "ORDER BY orders.created_at DESC, orders.id DESC" in stmt
+    assert "LIMIT %(limit)s OFFSET %(offset)s" in stmt
+    # The order items are selectin loaded, the limit applies to the orders
+    assert "order_items" not in stmt
+
+
+def test_orders_stmt_is_cached_per_shape():
+    first = _orders_stmt(False, False, False, Orders_Sort_Enum.ORDER_STATUS, False)
+    second = _orders_stmt(False, False, False, Orders_Sort_Enum.ORDER_STATUS, False)
+
+    assert first is second
+    assert "WHERE" not in compile(first)
+    assert "ORDER BY orders.order_status, orders.created_at, orders.id" in compile(
+        first
+    )
+
+
+def test_orders_count_stmt_is_bounded():
+    stmt = compile(_orders_count_stmt(False, True, False))
+
+    assert "orders.created_at >= %(created_from)s" in stmt
+    assert "LIMIT %(count_limit)s" in stmt
+
+
+def test_get_orders_event_converts_aware_dates_to_naive_utc():
+    event = GetOrdersEvent(
+        page=1,
+        page_size=20,
+        created_from=datetime(2026, 1, 1, 2, 0, tzinfo=timezone(timedelta(hours=2))),
+        created_to=datetime(2026, 1, 2),
+    )
+
+    assert event.created_from == datetime(2026, 1, 1, 0, 0)
+    assert event.created_to == datetime(2026, 1, 2)
@@ -5,7 +5,11 @@ from uuid import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.orm.properties import ForeignKey
 
-from bakery_ecommerce.internal.store.persistence.base import PersistanceBase, ScalarID
+from bakery_ecommerce.internal.store.persistence.base import (
+    PersistanceBase,
+    ScalarID,
+    ScalarTimestamp,
+)
 from bakery_ecommerce.internal.store.persistence.product import Product
 
 
@@ -44,7 +48,7 @@ class PaymentDetail(PersistanceBase, ScalarID):
     client_secret: Mapped[str | None] = mapped_column()
 
 
-class Order(PersistanceBase, ScalarID):
+class Order(PersistanceBase, ScalarID, ScalarTimestamp):
     __tablename__ = "orders"
 
     order_status: Mapped[Order_Status_Enum] = mapped_column(
@@ -69,5 +73,6 @@ class Order(PersistanceBase, ScalarID):
             "order_items": self.order_items,
             "order_status": self.order_status,
             "amount": self.total_price(),
+            "created_at": self.created_at,
             "id": self.id,
         }
@@ -1,12 +1,13 @@
+import functools
 from dataclasses import dataclass
 from typing import Any, Self, Sequence
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bakery_ecommerce.context_bus import (
     ContextBus,
     ContextEventProtocol,
-    ContextPersistenceEvent,
+    ContextReadEvent,
     impl_event,
 )
 from bakery_ecommerce.internal.product_events import ProductByIdRetrievedEvent
@@ -14,7 +15,8 @@ from bakery_ecommerce.internal.product_events import ProductByIdRetrievedEvent
 from . import store
 from .store import persistence
 
-from .store.crud_queries import CrudOperation
+from .store.crud_queries import CrudOperation, load_options
+from .store.pagination import KeysetPagination, Page
 from .store.persistence.product import Product
 from .store.query import QueryProcessor
 
@@ -25,6 +27,7 @@ class GetProductListEvent:
     page: int
     page_size: int
     name: str | None
+    images: bool = True
 
     @property
     def payload(self) -> Self:
@@ -36,6 +39,27 @@ class GetProductListResult:
     products: Sequence[Product]
 
 
+def _product_select(by_name: bool, images: bool):
+    product = persistence.product.Product
+    stmt = select(product)
+    if by_name:
+        stmt = stmt.where(product.name.ilike(bindparam("name")))
+    if not images:
+        stmt = stmt.options(*load_options(product, relationships=[]))
+    return stmt
+
+
+# Built once per (by_name, images) on first use, loader options need the
+# configured mappers, and executed with bind parameters
+@functools.cache
+def _product_list_stmt(by_name: bool, images: bool):
+    return (
+        _product_select(by_name, images)
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+
+
 class GetProductList:
     def __init__(
         self, session: AsyncSession, queries: store.query.QueryProcessor
@@ -44,16 +68,15 @@ class GetProductList:
         self.__session = session
 
     async def execute(self, params: GetProductListEvent) -> GetProductListResult:
-        product = persistence.product.Product
-
         async def get_product_by_cursor(
             session: AsyncSession,
         ) -> Sequence[persistence.product.Product]:
-            stmt = select(product).limit(params.page_size).offset(params.page)
+            values: dict[str, Any] = {"limit": params.page_size, "offset": params.page}
+            stmt = _product_list_stmt(bool(params.name), params.images)
             if params.name:
-                stmt = stmt.where(product.name.ilike(f"%{params.name}%"))
+                values["name"] = f"%{params.name}%"
 
-            row = await session.execute(stmt)
+            row = await session.execute(stmt, values)
             return row.scalars().all()
 
         operation = store.crud_queries.CustomBuilder(get_product_by_cursor)
@@ -63,7 +86,63 @@ class GetProductList:
 
 @dataclass
 @impl_event(ContextEventProtocol)
-class GetProductByIdEvent(ContextPersistenceEvent):
+class GetProductCursorListEvent:
+    cursor: str | None
+    page_size: int
+    name: str | None
+    images: bool = True
+
+    @property
+    def payload(self) -> Self:
+        return self
+
+
+@dataclass
+class GetProductCursorListResult:
+    products: Sequence[Product]
+    next_cursor: str | None
+
+
+# Needs the (created_at, id) index of the products table
+@functools.cache
+def _product_pages(by_name: bool, images: bool) -> KeysetPagination:
+    return KeysetPagination(
+        _product_select(by_name, images),
+        persistence.product.Product.created_at,
+        persistence.product.Product.id,
+    )
+
+
+class GetProductCursorList:
+    def __init__(
+        self, session: AsyncSession, queries: store.query.QueryProcessor
+    ) -> None:
+        self.__queries = queries
+        self.__session = session
+
+    async def execute(
+        self, params: GetProductCursorListEvent
+    ) -> GetProductCursorListResult:
+        pages = _product_pages(bool(params.name), params.images)
+
+        async def get_product_page(
+            session: AsyncSession,
+        ) -> Page[persistence.product.Product]:
+            stmt, values = pages.statement(params.cursor, params.page_size)
+            if params.name:
+                values["name"] = f"%{params.name}%"
+
+            row = await session.execute(stmt, values)
+            return pages.page(row.scalars().all(), params.page_size)
+
+        operation = store.crud_queries.CustomBuilder(get_product_page)
+        page = await self.__queries.process(self.__session, operation)
+        return GetProductCursorListResult(page.items, page.next_cursor)
+
+
+@dataclass
+@impl_event(ContextEventProtocol)
+class GetProductByIdEvent(ContextReadEvent):
     product_id: str
 
     @property
@@ -91,6 +170,7 @@ class GetProductById:
             store.crud_queries.CrudOperation(
                 persistence.product.Product,
                 lambda q: q.get_one_by_field("id", params.product_id),
+                memo_key=("id", params.product_id),
             ),
         )
         if result:
@@ -0,0 +1,132 @@
+import asyncio
+import uuid
+from typing import Any, TypeVar
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import MultipleResultsFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .statement_cache import statement_cache
+
+_BatchLoaderModel_T = TypeVar("_BatchLoaderModel_T")
+
+_session_info_key = "batch_loader"
+
+
+class BatchLoader:
+    """
+    Coalesces get-one lookups made through one session within the same event
+    loop tick, lookups of the same model and field are resolved by a single
+    `WHERE field IN (...)` query.
+
+    The loader lives in the session info, so it's scoped to the request
+    transaction or to the transaction of a persistence event.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.__session = session
+        self.__pending = dict[tuple[type, str], dict[Any, list[asyncio.Future]]]()
+        self.__scheduled = False
+        self.__tasks = set[asyncio.Task]()
+
+    @staticmethod
+    def for_session(session: AsyncSession) -> "BatchLoader":
+        if loader := session.info.get(_session_info_key):
+            return loader
+        loader = session.info[_session_info_key] = BatchLoader(session)
+        return loader
+
+    async def load(
+        self, model: type[_BatchLoaderModel_T], field: str, value: Any
+    ) -> _BatchLoaderModel_T | None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        column = getattr(model, field)
+        by_value = self.__pending.setdefault((model, field), {})
+        by_value.setdefault(_normalize(column, value), []).append(future)
+
+        if not self.__scheduled:
+            self.__scheduled = True
+            loop.call_soon(self.__dispatch)
+
+        return await future
+
+    def __dispatch(self):
+        pending, self.__pending = self.__pending, {}
+        self.__scheduled = False
+
+        task = asyncio.create_task(self.__flush(pending))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __flush(
+        self, pending: dict[tuple[type, str], dict[Any, list[asyncio.Future]]]
+    ):
+        # One statement at a time, a session can't run queries concurrently
+        for (model, field), by_value in pending.items():
+            try:
+                rows = await self.__fetch(model, field, list(by_value.keys()))
+            except Exception as e:
+                for futures in by_value.values():
+                    _set_exception(futures, e)
+                continue
+
+            for value, futures in by_value.items():
+                found = rows.get(value, [])
+                if len(found) > 1:
+                    _set_exception(
+                        futures,
+                        MultipleResultsFound(
+                            f"Multiple rows were found for {model.__name__}.{field}"
+                        ),
+                    )
+                else:
+                    _set_result(futures, found[0] if found else None)
+
+    async def __fetch(
+        self, model: type, field: str, values: list[Any]
+    ) -> dict[Any, list[Any]]:
+        column = getattr(model, field)
+        if len(values) == 1:
+            stmt = statement_cache.get(
+                (model, "get_one_by_field", field),
+                lambda: select(model).where(column == bindparam("value")),
+            )
+            result = await self.__session.execute(stmt, {"value": values[0]})
+        else:
+            stmt = statement_cache.get(
+                (model, "get_many_by_field", field),
+                lambda: select(model).where(
+                    column.in_(bindparam("values", expanding=True))
+                ),
+            )
+            result = await self.__session.execute(stmt, {"values": values})
+
+        rows = dict[Any, list[Any]]()
+        for row in result.unique().scalars().all():
+            rows.setdefault(_normalize(column, getattr(row, field)), []).append(row)
+        return rows
+
+
+def _normalize(column: Any, value: Any) -> Any:
+    # Path and body params often carry ids as str while rows hold uuid.UUID
+    if isinstance(value, str):
+        try:
+            if column.type.python_type is uuid.UUID:
+                return uuid.UUID(value)
+        except (AttributeError, NotImplementedError, ValueError):
+            pass
+    return value
+
+
+def _set_result(futures: list[asyncio.Future], value: Any):
+    for future in futures:
+        if not future.done():
+            future.set_result(value)
+
+
+def _set_exception(futures: list[asyncio.Future], e: Exception):
+    for future in futures:
+        if not future.done():
+            future.set_exception(e)
@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from bakery_ecommerce.internal.store.batch_loader import BatchLoader
+
+
+class Base(DeclarativeBase): ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+
+
+class FakeResult:
+    def __init__(self, rows: list[Item]) -> None:
+        self.__rows = rows
+
+    def unique(self):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.__rows
+
+
+class FakeSession:
+    def __init__(self, rows: list[Item]) -> None:
+        self.info = {}
+        self.statements = []
+        self.__rows = rows
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return FakeResult(self.__rows)
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_coalesce_lookups():
+    first = Item(id=uuid.uuid4(), name="first")
+    second = Item(id=uuid.uuid4(), name="second")
+    session = FakeSession([first, second])
+    loader = BatchLoader.for_session(session)  # pyright: ignore
+
+    results = await asyncio.gather(
+        loader.load(Item, "id", first.id),
+        loader.load(Item, "id", str(second.id)),
+        loader.load(Item, "id", first.id),
+        loader.load(Item, "id", uuid.uuid4()),
+    )
+
+    assert results == [first, second, first, None]
+    assert len(session.statements) == 1
+    assert " IN " in str(session.statements[0])
+    assert BatchLoader.for_session(session) is loader  # pyright: ignore
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_query_per_field():
+    item = Item(id=uuid.uuid4(), name="item")
+    session = FakeSession([item])
+    loader = BatchLoader.for_session(session)  # pyright: ignore
+
+    results = await asyncio.gather(
+        loader.load(Item, "id", item.id),
+        loader.load(Item, "name", "item"),
+    )
+
+    assert results == [item, item]
+    assert len(session.statements) == 2
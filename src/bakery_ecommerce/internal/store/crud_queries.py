@@ -3,15 +3,29 @@ from typing import (
     Callable,
     Coroutine,
     Generic,
+    Hashable,
+    Sequence,
     TypeVar,
     override,
 )
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import (
+    bindparam,
+    column,
+    delete,
+    insert,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load
+from sqlalchemy.orm.attributes import set_committed_value
 
 from . import query
+from .batch_loader import BatchLoader
+from .statement_cache import statement_cache
 
 
 class SnippetException(Exception):
@@ -31,9 +45,20 @@ AsyncCrudBuilder_T = TypeVar("AsyncCrudBuilder_T")
 
 class CustomBuilder(query.Query[AsyncCrudBuilder_T], Generic[AsyncCrudBuilder_T]):
     def __init__(
-        self, fn: Callable[[AsyncSession], Coroutine[None, None, AsyncCrudBuilder_T]]
+        self,
+        fn: Callable[[AsyncSession], Coroutine[None, None, AsyncCrudBuilder_T]],
+        memo_key: Hashable | None = None,
+        memo_model: type | None = None,
     ) -> None:
         self.fn = fn
+        self.__memo_key = memo_key
+        self.__memo_model = memo_model
+
+    def memo_key(self) -> Hashable | None:
+        return self.__memo_key
+
+    def memo_model(self) -> type | None:
+        return self.__memo_model
 
 
 class CustomBuilderHandler(
@@ -48,8 +73,45 @@ class CustomBuilderHandler(
         return await query.fn(self.__executor)
 
 
+def load_options(
+    model: type,
+    columns: Sequence[str] | None = None,
+    relationships: Sequence[str] | None = None,
+) -> list[Load]:
+    """
+    Loader options of model entities. columns limits the loaded columns, the
+    primary key is always loaded. relationships limits the loaded
+    relationships to the listed ones, loaded with selectin, the others raise
+    on access instead of emitting a lazy load. None keeps the mapper default.
+    """
+    options = list[Load]()
+    if columns is not None:
+        options.append(
+            Load(model).load_only(*[getattr(model, name) for name in columns])
+        )
+    if relationships is not None:
+        for name in relationships:
+            options.append(Load(model).selectinload(getattr(model, name)))
+        options.append(Load(model).raiseload("*"))
+    return options
+
+
 AsyncCrud_T = TypeVar("AsyncCrud_T")
 
+# Rows per UPDATE ... FROM (VALUES ...) statement, each row takes one bind
+# parameter per column and asyncpg allows at most 32767 per statement
+UPDATE_MANY_BATCH_SIZE = 1000
+
+
+def _typed_id(id_column: Any, value: Any) -> Hashable:
+    try:
+        python_type = id_column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    return python_type(value)
+
 
 class AsyncCrud(Generic[AsyncCrud_T]):
     def __init__(self, session: AsyncSession, model: type[AsyncCrud_T]) -> None:
@@ -61,14 +123,13 @@ class AsyncCrud(Generic[AsyncCrud_T]):
         field: str = "id",
         value: Any = Any,
     ) -> AsyncCrud_T | None:
-        try:
-            stmt = select(self.__model).where(getattr(self.__model, field) == value)
-        except AttributeError:
+        if not hasattr(self.__model, field):
             raise SnippetException(
                 f"Column {field} not found on {self.__model}.",
             )
-        result = await self.__session.execute(stmt)
-        return result.unique().scalar_one_or_none()
+        # Concurrent lookups of the same model and field share one IN query
+        loader = BatchLoader.for_session(self.__session)
+        return await loader.load(self.__model, field, value)
 
     async def create_one(self, model: AsyncCrud_T) -> AsyncCrud_T:
         try:
@@ -81,33 +142,163 @@ class AsyncCrud(Generic[AsyncCrud_T]):
         except Exception as e:
             raise SnippetException(f"Unknown error occurred: {e}") from e
 
+    async def create_many(self, rows: list[dict[str, Any]]) -> Sequence[AsyncCrud_T]:
+        """
+        Inserts all rows with one executemany INSERT ... RETURNING, the driver
+        sends them in batches of insertmanyvalues_page_size rows.
+        """
+        if not rows:
+            return []
+        stmt = statement_cache.get(
+            (self.__model, "create_many"),
+            lambda: insert(self.__model).returning(self.__model),
+        )
+        try:
+            result = await self.__session.execute(stmt, rows)
+        except IntegrityError as e:
+            raise IntegrityConflictException(
+                f"{self.__model} conflicts with existing data.",
+            ) from e
+        return result.scalars().all()
+
+    async def upsert_many(
+        self,
+        rows: list[dict[str, Any]],
+        conflict_fields: list[str],
+        update_fields: list[str] | None = None,
+    ) -> Sequence[AsyncCrud_T]:
+        """
+        INSERT ... ON CONFLICT (conflict_fields) DO UPDATE of update_fields, by
+        default every field of the rows except the conflict ones. Rows left
+        untouched by DO NOTHING, when there is nothing to update, are not
+        returned.
+        """
+        if not rows:
+            return []
+        if update_fields is None:
+            update_fields = [name for name in rows[0] if name not in conflict_fields]
+        stmt = statement_cache.get(
+            (self.__model, "upsert_many", tuple(conflict_fields), tuple(update_fields)),
+            lambda: self.__upsert_statement(conflict_fields, update_fields),
+        )
+        result = await self.__session.execute(stmt, rows)
+        return result.scalars().all()
+
+    async def update_many(
+        self, id_field: str, rows: list[dict[str, Any]]
+    ) -> Sequence[AsyncCrud_T]:
+        """
+        Updates rows matched by id_field with UPDATE ... FROM (VALUES ...), one
+        statement per UPDATE_MANY_BATCH_SIZE rows. Every row must have the same
+        fields.
+        """
+        if not rows:
+            return []
+        names = [name for name in rows[0] if name != id_field]
+        id_column = getattr(self.__model, id_field)
+
+        updated = list[AsyncCrud_T]()
+        for start in range(0, len(rows), UPDATE_MANY_BATCH_SIZE):
+            batch = rows[start : start + UPDATE_MANY_BATCH_SIZE]
+            data = values(
+                *[
+                    column(name, getattr(self.__model, name).type)
+                    for name in [id_field, *names]
+                ],
+                name="bulk_values",
+            ).data([tuple(row[name] for name in [id_field, *names]) for row in batch])
+            stmt = (
+                update(self.__model)
+                .where(id_column == data.c[id_field])
+                .values({getattr(self.__model, name): data.c[name] for name in names})
+                .returning(self.__model)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.__session.execute(stmt)
+
+            # Keyed by the typed id, a caller may pass it in another string form
+            by_id = {_typed_id(id_column, row[id_field]): row for row in batch}
+            for instance in result.unique().scalars().all():
+                row = by_id[_typed_id(id_column, getattr(instance, id_field))]
+                for name in names:
+                    set_committed_value(instance, name, row[name])
+                updated.append(instance)
+
+        return updated
+
     async def update_partial(
         self, id_field: str, id_value: Any, fields: dict[str, Any]
     ) -> AsyncCrud_T:
         if id_field in fields:
             del fields[id_field]
-        stmt = (
-            update(self.__model)
-            .where(getattr(self.__model, id_field) == id_value)
-            .values(fields)
-            .returning(self.__model)
+        names = tuple(sorted(fields.keys()))
+        stmt = statement_cache.get(
+            (self.__model, "update_partial", id_field, names),
+            lambda: self.__update_partial_statement(id_field, names),
         )
-        result = await self.__session.execute(stmt)
+        params = {f"set_{name}": value for name, value in fields.items()}
+        params["id_value"] = id_value
+        result = await self.__session.execute(stmt, params)
         result = result.unique().scalar_one_or_none()
         if not result:
             raise ValueError(f"Column {id_field} not found on {self.__model}.",)
+        # RETURNING doesn't refresh an instance already in the session
+        for name, value in fields.items():
+            set_committed_value(result, name, value)
         return result
 
     async def remove_by_field(self, field: str = "id", value: Any = Any) -> bool:
-        stmt = delete(self.__model).where(getattr(self.__model, field) == value)
-        result = await self.__session.execute(stmt)
+        stmt = statement_cache.get(
+            (self.__model, "remove_by_field", field),
+            lambda: self.__delete_statement(
+                getattr(self.__model, field) == bindparam("value")
+            ),
+        )
+        result = await self.__session.execute(stmt, {"value": value})
         return result.rowcount == 1
 
     async def remove_many_by_field(self, field: str = "id", values: list[Any] = list()):
-        stmt = delete(self.__model).where(getattr(self.__model, field).in_(values))
-        result = await self.__session.execute(stmt)
+        stmt = statement_cache.get(
+            (self.__model, "remove_many_by_field", field),
+            lambda: self.__delete_statement(
+                getattr(self.__model, field).in_(bindparam("values", expanding=True))
+            ),
+        )
+        result = await self.__session.execute(stmt, {"values": values})
         return result.rowcount == 1
 
+    # Session synchronization evaluates bind parameters by their build time
+    # value, which is None for cached statements, so update_partial writes the
+    # values to the instance itself and deletes fetch the removed rows
+    def __update_partial_statement(self, id_field: str, names: tuple[str, ...]):
+        return (
+            update(self.__model)
+            .where(getattr(self.__model, id_field) == bindparam("id_value"))
+            .values({name: bindparam(f"set_{name}") for name in names})
+            .returning(self.__model)
+            .execution_options(synchronize_session=False)
+        )
+
+    def __upsert_statement(self, conflict_fields: list[str], update_fields: list[str]):
+        stmt = pg_insert(self.__model)
+        index_elements = [getattr(self.__model, name) for name in conflict_fields]
+        if not update_fields:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={name: stmt.excluded[name] for name in update_fields},
+            )
+        # Refresh the instances already in the session with the upserted rows
+        return stmt.returning(self.__model).execution_options(populate_existing=True)
+
+    def __delete_statement(self, where: Any):
+        return (
+            delete(self.__model)
+            .where(where)
+            .execution_options(synchronize_session="fetch")
+        )
+
 
 CrudQueryResult_T = TypeVar("CrudQueryResult_T")
 
@@ -117,9 +308,21 @@ class CrudOperation(query.Query[AsyncCrud_T], Generic[AsyncCrud_T]):
         self,
         model: type[AsyncCrud_T],
         operation: Callable[[AsyncCrud[AsyncCrud_T]], Coroutine[Any, Any, AsyncCrud_T]],
+        memo_key: Hashable | None = None,
     ) -> None:
         self.model = model
         self.operation = operation
+        self.__memo_key = memo_key
+
+    def memo_key(self) -> Hashable | None:
+        """
+        Set only for read operations, the result is reused within the request
+        until a write touches the model.
+        """
+        return self.__memo_key
+
+    def memo_model(self) -> type | None:
+        return self.model
 
 
 class CrudOperationHandler(query.QueryHandler[CrudOperation[AsyncCrud_T], AsyncCrud_T]):
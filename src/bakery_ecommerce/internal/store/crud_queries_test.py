@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import ForeignKey, create_engine, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    relationship,
+)
+
+from uuid import UUID
+
+from bakery_ecommerce.internal.store.crud_queries import _typed_id, load_options
+from bakery_ecommerce.internal.store.persistence.catalog import CatalogItem
+
+
+class Base(DeclarativeBase): ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+    description: Mapped[str]
+
+    tags: Mapped[list["Tag"]] = relationship(lazy="selectin")
+    images: Mapped[list["Image"]] = relationship(lazy=False)
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"))
+
+
+class Image(Base):
+    __tablename__ = "images"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Item(
+                id=1,
+                name="item",
+                description="description",
+                tags=[Tag(id=1)],
+                images=[Image(id=1)],
+            )
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+def loaded(item: Item) -> list[str]:
+    return sorted(name for name in vars(item) if not name.startswith("_"))
+
+
+def test_load_options_default(session: Session):
+    [item] = session.execute(select(Item).options(*load_options(Item))).unique()
+    assert loaded(item[0]) == ["description", "id", "images", "name", "tags"]
+
+
+def test_load_options_columns_and_relationships(session: Session):
+    options = load_options(Item, columns=["name"], relationships=["tags"])
+    [item] = session.execute(select(Item).options(*options)).scalars().all()
+
+    assert loaded(item) == ["id", "name", "tags"]
+    with pytest.raises(InvalidRequestError):
+        item.images
+
+
+def test_typed_id_matches_string_forms():
+    value = UUID("6f1c2a9e-7d3b-4e8a-9c5f-0a1b2c3d4e5f")
+
+    assert _typed_id(CatalogItem.id, value) == value
+    assert _typed_id(CatalogItem.id, str(value).upper()) == value
+    assert _typed_id(CatalogItem.id, value.hex) == value
+    assert _typed_id(Item.id, "5") == 5
@@ -0,0 +1,153 @@
+import contextvars
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Upper bounds in milliseconds, the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_current_query = contextvars.ContextVar[str | None]("current_query", default=None)
+
+
+@dataclass
+class QueryStats:
+    calls: int = 0
+    errors: int = 0
+    handler_calls: int = 0
+    handler_total_ms: float = 0.0
+    # Count per LATENCY_BUCKETS_MS bound, not cumulative, plus the +Inf bucket
+    handler_latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_errors: int = 0
+    sql_statements: int = 0
+
+
+class QueryInstrumentation:
+    """
+    Counters per query type name, updated by QueryProcessor and QueryCache.
+
+    SQL statements are attributed to the query whose handler is running in the
+    current task, statements issued outside a handler are not counted.
+    """
+
+    def __init__(self) -> None:
+        self.__stats = dict[str, QueryStats]()
+
+    def track_statements(self, engine: AsyncEngine):
+        event.listen(engine.sync_engine, "before_cursor_execute", self.__on_statement)
+
+    def query_name(self, query: Any) -> str:
+        return type(query).__name__
+
+    def record_call(self, query: Any):
+        self.__get(self.query_name(query)).calls += 1
+
+    def handler(self, query: Any) -> "_HandlerTimer":
+        return _HandlerTimer(self.__get(self.query_name(query)), self.query_name(query))
+
+    def record_cache_hit(self, query: Any):
+        self.__get(self.query_name(query)).cache_hits += 1
+
+    def record_cache_miss(self, query: Any):
+        self.__get(self.query_name(query)).cache_misses += 1
+
+    def record_cache_error(self, query: Any):
+        self.__get(self.query_name(query)).cache_errors += 1
+
+    def snapshot(self) -> dict[str, QueryStats]:
+        return {
+            name: QueryStats(
+                calls=stats.calls,
+                errors=stats.errors,
+                handler_calls=stats.handler_calls,
+                handler_total_ms=stats.handler_total_ms,
+                handler_latency_buckets=list(stats.handler_latency_buckets),
+                cache_hits=stats.cache_hits,
+                cache_misses=stats.cache_misses,
+                cache_errors=stats.cache_errors,
+                sql_statements=stats.sql_statements,
+            )
+            for name, stats in self.__stats.items()
+        }
+
+    def reset(self):
+        self.__stats.clear()
+
+    def prometheus(self) -> str:
+        lines = list[str]()
+
+        def counter(name: str, help: str, attr: str):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for query, stats in snapshot.items():
+                lines.append(f'{name}{{query="{query}"}} {getattr(stats, attr)}')
+
+        snapshot = self.snapshot()
+        counter("query_calls_total", "QueryProcessor.process calls", "calls")
+        counter("query_errors_total", "Failed query handlers", "errors")
+        counter("query_cache_hits_total", "Query cache hits", "cache_hits")
+        counter("query_cache_misses_total", "Query cache misses", "cache_misses")
+        counter("query_cache_errors_total", "Query cache errors", "cache_errors")
+        counter("query_sql_statements_total", "SQL statements", "sql_statements")
+
+        name = "query_handler_duration_ms"
+        lines.append(f"# HELP {name} Query handler latency")
+        lines.append(f"# TYPE {name} histogram")
+        for query, stats in snapshot.items():
+            cumulative = 0
+            bounds = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+            for bound, count in zip(bounds, stats.handler_latency_buckets):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{query="{query}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{name}_sum{{query="{query}"}} {stats.handler_total_ms}')
+            lines.append(f'{name}_count{{query="{query}"}} {stats.handler_calls}')
+
+        return "\n".join(lines) + "\n"
+
+    def __get(self, name: str) -> QueryStats:
+        if stats := self.__stats.get(name):
+            return stats
+        stats = self.__stats[name] = QueryStats()
+        return stats
+
+    def __on_statement(self, *_):
+        if name := _current_query.get():
+            self.__get(name).sql_statements += 1
+
+
+class _HandlerTimer:
+    def __init__(self, stats: QueryStats, name: str) -> None:
+        self.__stats = stats
+        self.__name = name
+        self.__start = 0.0
+        self.__token: contextvars.Token | None = None
+
+    def __enter__(self):
+        self.__token = _current_query.set(self.__name)
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        elapsed_ms = (time.perf_counter() - self.__start) * 1000
+        if self.__token:
+            _current_query.reset(self.__token)
+
+        self.__stats.handler_calls += 1
+        self.__stats.handler_total_ms += elapsed_ms
+        if exc_type:
+            self.__stats.errors += 1
+
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.__stats.handler_latency_buckets[i] += 1
+                break
+        else:
+            self.__stats.handler_latency_buckets[-1] += 1
@@ -0,0 +1,42 @@
+import pytest
+
+from bakery_ecommerce.internal.store.instrumentation import (
+    LATENCY_BUCKETS_MS,
+    QueryInstrumentation,
+)
+
+
+class CountQuery: ...
+
+
+def test_instrumentation_handler_latency():
+    instrumentation = QueryInstrumentation()
+    query = CountQuery()
+
+    instrumentation.record_call(query)
+    with instrumentation.handler(query):
+        pass
+
+    with pytest.raises(ValueError):
+        with instrumentation.handler(query):
+            raise ValueError()
+
+    stats = instrumentation.snapshot()["CountQuery"]
+    assert stats.calls == 1
+    assert stats.handler_calls == 2
+    assert stats.errors == 1
+    assert stats.handler_latency_buckets[0] == 2
+    assert len(stats.handler_latency_buckets) == len(LATENCY_BUCKETS_MS) + 1
+
+
+def test_instrumentation_prometheus():
+    instrumentation = QueryInstrumentation()
+    query = CountQuery()
+    instrumentation.record_cache_hit(query)
+    with instrumentation.handler(query):
+        pass
+
+    text = instrumentation.prometheus()
+    assert 'query_cache_hits_total{query="CountQuery"} 1' in text
+    assert 'query_handler_duration_ms_bucket{query="CountQuery",le="+Inf"} 1' in text
+    assert 'query_handler_duration_ms_count{query="CountQuery"} 1' in text
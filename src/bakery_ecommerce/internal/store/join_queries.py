@@ -1,39 +1,50 @@
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncIterator, Generic, Sequence, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load
 
 from bakery_ecommerce.internal.store.query import Query, QueryHandler
 
 _JOIN_T = TypeVar("_JOIN_T", covariant=True)
 
+# Rows fetched per round trip while streaming a join
+JOIN_YIELD_PER = 500
+
 
 class JoinRoot(Generic[_JOIN_T]):
     def __init__(self, model: type[_JOIN_T], field: str) -> None:
         self.model = model
         self.field = getattr(model, field)
-        self.objects = set[_JOIN_T]()
-
-    def add_model(self, model: Any):
-        self.objects.add(model)
 
     def __repr__(self) -> str:
-        return f"{self.objects}"
+        return f"JoinRoot({self.model.__name__})"
 
 
 class JoinOn(Generic[_JOIN_T]):
-    def __init__(self, model: type[_JOIN_T], field: str, root_field: Any) -> None:
+    """
+    Outer join of model where model.field == parent.root_field, parent is the
+    root by default or another joined model for nested joins. where is added
+    to the join condition, so rows of the parent without a match are kept.
+    """
+
+    def __init__(
+        self,
+        model: type[_JOIN_T],
+        field: str,
+        root_field: Any,
+        parent: type | None = None,
+        where: Any | None = None,
+    ) -> None:
         self.model = model
         self.field = getattr(model, field)
         self.root_field = root_field
-        self.objects = set[_JOIN_T]()
-
-    def add_model(self, model: Any):
-        self.objects.add(model)
+        self.parent = parent
+        self.where = where
 
     def __repr__(self) -> str:
-        return f"{self.objects}"
+        return f"JoinOn({self.model.__name__})"
 
 
 _JOIN_RESULT_T = TypeVar("_JOIN_RESULT_T")
@@ -65,46 +76,108 @@ class JoinOperation(Query[JoinResult[_JOIN_T]]):
     join_root: JoinRoot[_JOIN_T]
     join_on: dict[type[_JOIN_T], JoinOn[_JOIN_T]]
     where_value: Any | None
+    # Loader options of the joined entities, see crud_queries.load_options
+    options: Sequence[Any] = ()
+    # Criteria of the WHERE clause, may reference any joined model
+    where: Sequence[Any] = ()
+    # Entities of each model keep the order of their first row
+    order_by: Sequence[Any] = ()
+    yield_per: int = JOIN_YIELD_PER
 
 
 class JoinOperationHandler(QueryHandler[JoinOperation, JoinResult[_JOIN_T]]):
+    """
+    Runs the join as one statement and streams the rows yield_per at a time.
+    Entities are collected per model in the order they first appear.
+    """
+
     def __init__(self, executor: AsyncSession) -> None:
         self.__executor = executor
 
     async def handle(self, query: JoinOperation) -> JoinResult[_JOIN_T]:
-        join_on_models = map(lambda m: m.model, query.join_on.values())
-
-        stmt = select(query.join_root.model, *join_on_models)
-
-        for join_model in query.join_on.values():
-            stmt = stmt.outerjoin(
-                join_model.model,
-                join_model.field
-                == getattr(query.join_root.model, join_model.root_field),
-            )
-
-        if query.where_value:
-            stmt = stmt.where(query.join_root.field == query.where_value)
-
-        rows = await self.__executor.execute(stmt)
-        rows = rows.unique()
-
-        for row in rows:
-            for i in row:
-                model_type = type(i)
-
-                if query.join_root.model == model_type:
-                    query.join_root.add_model(i)
-
-                if join_on := query.join_on.get(model_type):
-                    if join_on.model == model_type:
-                        join_on.add_model(i)
-
-        result = dict[str, list[_JOIN_T]](
-            {str(query.join_root.model): [*query.join_root.objects]}
+        models = _models(query)
+        # Keyed by the identity, the same entity comes back in many rows
+        objects = [dict[int, Any]() for _ in models]
+
+        async for row in self.rows(query):
+            for model_objects, obj in zip(objects, row):
+                if obj is not None:
+                    model_objects.setdefault(id(obj), obj)
+
+        return JoinResult(
+            {
+                str(model): list(model_objects.values())
+                for model, model_objects in zip(models, objects)
+            }
         )
 
-        for join_model in query.join_on.values():
-            result[str(join_model.model)] = [*join_model.objects]
-
-        return JoinResult(result)
+    async def rows(self, query: JoinOperation) -> AsyncIterator[tuple]:
+        """
+        Rows of the join, a tuple of the root and the joined models entities
+        in join_on order, None for the models without a match.
+        """
+        stmt = join_statement(query).execution_options(yield_per=query.yield_per)
+        result = await self.__executor.stream(stmt)
+        async for partition in result.partitions():
+            for row in partition:
+                yield tuple(row)
+
+
+def _models(query: JoinOperation) -> list[type]:
+    return [query.join_root.model, *query.join_on.keys()]
+
+
+def join_statement(query: JoinOperation) -> Select:
+    root = query.join_root.model
+    stmt = select(*_models(query))
+    options = list[Any]()
+
+    for join_model in query.join_on.values():
+        parent = join_model.parent or root
+        on = join_model.field == getattr(parent, join_model.root_field)
+        if join_model.where is not None:
+            on = and_(on, join_model.where)
+        stmt = stmt.outerjoin(join_model.model, on)
+        options += _join_options(parent, join_model.model)
+
+    if query.where_value:
+        stmt = stmt.where(query.join_root.field == query.where_value)
+    if query.where:
+        stmt = stmt.where(*query.where)
+    if query.order_by:
+        stmt = stmt.order_by(*query.order_by)
+
+    options += _streamable_options(_models(query))
+    return stmt.options(*options, *query.options)
+
+
+def _join_options(parent: type, model: type) -> list[Load]:
+    # A scalar relationship to the joined model is filled from the join row
+    # instead of its own eager join
+    options = list[Load]()
+    for relationship in inspect(parent).relationships:
+        if relationship.mapper.class_ is not model or relationship.uselist:
+            continue
+        load = Load(parent).contains_eager(relationship.class_attribute)
+        options += [
+            load.selectinload(collection) for collection in _joined_collections(model)
+        ] or [load]
+    return options
+
+
+def _streamable_options(models: list[type]) -> list[Load]:
+    # Joined eager collections can't be streamed, a collection needs all of its
+    # rows in the same batch, selectin loads them per batch instead
+    return [
+        Load(model).selectinload(collection)
+        for model in models
+        for collection in _joined_collections(model)
+    ]
+
+
+def _joined_collections(model: type) -> list[Any]:
+    return [
+        relationship.class_attribute
+        for relationship in inspect(model).relationships
+        if relationship.uselist and relationship.lazy in ("joined", False)
+    ]
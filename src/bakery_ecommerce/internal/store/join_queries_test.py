@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from bakery_ecommerce.internal.store.join_queries import (
+    JoinOn,
+    JoinOperation,
+    JoinOperationHandler,
+    JoinRoot,
+    join_statement,
+)
+
+
+class Base(DeclarativeBase): ...
+
+
+class Shelf(Base):
+    __tablename__ = "shelves"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+class Slot(Base):
+    __tablename__ = "slots"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    position: Mapped[int]
+    visible: Mapped[bool]
+    shelf_id: Mapped[int] = mapped_column(ForeignKey("shelves.id"))
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"))
+
+    item: Mapped["Item"] = relationship(lazy=False)
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    tags: Mapped[list["Tag"]] = relationship(lazy=False)
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"))
+
+
+def shelf_operation() -> JoinOperation:
+    return JoinOperation(
+        join_root=JoinRoot(Shelf, "id"),
+        join_on={
+            Slot: JoinOn(Slot, "shelf_id", "id", where=Slot.visible.is_(True)),
+            Item: JoinOn(Item, "id", "item_id", parent=Slot),
+        },
+        where_value=1,
+        order_by=[Slot.position],
+    )
+
+
+def test_join_statement_nested():
+    stmt = str(join_statement(shelf_operation()))
+
+    assert (
+        "LEFT OUTER JOIN slots ON slots.shelf_id = shelves.id AND slots.visible" in stmt
+    )
+    assert "LEFT OUTER JOIN items ON items.id = slots.item_id" in stmt
+    assert "ORDER BY slots.position" in stmt
+    # Slot.item comes from the joined items, not from its own eager join
+    assert "items_1" not in stmt
+    # Item.tags is a joined collection, loaded with selectin instead
+    assert "tags" not in stmt
+
+
+class FakeStreamResult:
+    def __init__(self, partitions: list[list[tuple]]) -> None:
+        self.__partitions = partitions
+
+    async def partitions(self):
+        for partition in self.__partitions:
+            yield partition
+
+
+class FakeSession:
+    def __init__(self, partitions: list[list[tuple]]) -> None:
+        self.__partitions = partitions
+        self.statements = []
+
+    async def stream(self, stmt):
+        self.statements.append(stmt)
+        return FakeStreamResult(self.__partitions)
+
+
+@pytest.mark.asyncio
+async def test_join_operation_keep_row_order():
+    shelf = Shelf(id=1)
+    first, second = Item(id=1), Item(id=2)
+    slots = [Slot(id=3, position=1), Slot(id=1, position=2), Slot(id=2, position=3)]
+    session = FakeSession(
+        [
+            [(shelf, slots[0], second), (shelf, slots[1], first)],
+            [(shelf, slots[2], second)],
+        ]
+    )
+
+    result = await JoinOperationHandler(session).handle(shelf_operation())  # pyright: ignore
+
+    assert result.get_strict(Shelf) == [shelf]
+    assert result.get_strict(Slot) == slots
+    assert result.get_strict(Item) == [second, first]
+    assert session.statements[0].get_execution_options()["yield_per"] == 500
+
+
+@pytest.mark.asyncio
+async def test_join_operation_skip_missing_join():
+    shelf = Shelf(id=1)
+    session = FakeSession([[(shelf, None, None)]])
+
+    result = await JoinOperationHandler(session).handle(shelf_operation())  # pyright: ignore
+
+    assert result.get_strict(Shelf) == [shelf]
+    assert result.get(Slot) == []
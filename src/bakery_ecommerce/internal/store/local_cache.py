@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class LocalCacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class LocalQueryCache:
+    """
+    Process-wide LRU in front of the NATS KV buckets.
+
+    Values are kept serialized, every hit is deserialized into a fresh object so
+    a caller can't mutate what another request will read. A None value is a
+    negative entry, the query is known to have no result.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        max_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.__max_size = max_size
+        self.__max_ttl = max_ttl
+        self.__clock = clock
+        self.__entries = OrderedDict[str, tuple[float, str | None]]()
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    def lookup(self, bucket: str, key: str) -> tuple[bool, str | None]:
+        cache_key = f"{bucket}.{key}"
+        entry = self.__entries.get(cache_key)
+        if entry is None:
+            self.__misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= self.__clock():
+            del self.__entries[cache_key]
+            self.__expirations += 1
+            self.__misses += 1
+            return False, None
+
+        self.__entries.move_to_end(cache_key)
+        self.__hits += 1
+        return True, value
+
+    def get(self, bucket: str, key: str) -> str | None:
+        _, value = self.lookup(bucket, key)
+        return value
+
+    def set(self, bucket: str, key: str, value: str | None, ttl: float | None = None):
+        """
+        The entry lives for the bucket ttl, capped by max_ttl, so a key the
+        bucket never expires is still re-read from KV now and then.
+        """
+        ttl = min(ttl, self.__max_ttl) if ttl else self.__max_ttl
+        cache_key = f"{bucket}.{key}"
+
+        self.__entries[cache_key] = (self.__clock() + ttl, value)
+        self.__entries.move_to_end(cache_key)
+
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def replace(
+        self, bucket: str, key: str, value: str, ttl: float | None = None
+    ) -> bool:
+        """
+        Updates an entry only when it's cached, a write seen on another node
+        should not pull cold keys into this process.
+        """
+        if f"{bucket}.{key}" not in self.__entries:
+            return False
+        self.set(bucket, key, value, ttl)
+        return True
+
+    def delete(self, bucket: str, key: str) -> bool:
+        return self.__entries.pop(f"{bucket}.{key}", None) is not None
+
+    def clear(self, bucket: str | None = None):
+        if bucket is None:
+            self.__entries.clear()
+            return
+
+        prefix = f"{bucket}."
+        for cache_key in [k for k in self.__entries if k.startswith(prefix)]:
+            del self.__entries[cache_key]
+
+    def stats(self) -> LocalCacheStats:
+        return LocalCacheStats(
+            size=len(self.__entries),
+            max_size=self.__max_size,
+            hits=self.__hits,
+            misses=self.__misses,
+            evictions=self.__evictions,
+            expirations=self.__expirations,
+        )
@@ -0,0 +1,66 @@
+from bakery_ecommerce.internal.store.local_cache import LocalQueryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_local_cache_lru_eviction():
+    cache = LocalQueryCache(max_size=2)
+    cache.set("bucket", "a", "1")
+    cache.set("bucket", "b", "2")
+
+    assert cache.get("bucket", "a") == "1"
+
+    cache.set("bucket", "c", "3")
+
+    assert cache.get("bucket", "b") is None
+    assert cache.get("bucket", "a") == "1"
+    assert cache.get("bucket", "c") == "3"
+
+    stats = cache.stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+    assert stats.hits == 3
+    assert stats.misses == 1
+
+
+def test_local_cache_ttl():
+    clock = FakeClock()
+    cache = LocalQueryCache(max_ttl=60, clock=clock)
+    cache.set("bucket", "short", "1", ttl=5)
+    cache.set("bucket", "unbounded", "2")
+
+    clock.now = 5
+    assert cache.get("bucket", "short") is None
+    assert cache.get("bucket", "unbounded") == "2"
+
+    clock.now = 60
+    assert cache.get("bucket", "unbounded") is None
+    assert cache.stats().expirations == 2
+
+
+def test_local_cache_clear_bucket():
+    cache = LocalQueryCache()
+    cache.set("a", "key", "1")
+    cache.set("b", "key", "2")
+
+    cache.clear("a")
+
+    assert cache.get("a", "key") is None
+    assert cache.get("b", "key") == "2"
+
+
+def test_local_cache_negative_entry():
+    cache = LocalQueryCache()
+    cache.set("bucket", "key", None)
+
+    assert cache.lookup("bucket", "key") == (True, None)
+    assert cache.lookup("bucket", "missing") == (False, None)
+
+    assert cache.replace("bucket", "key", "1")
+    assert cache.lookup("bucket", "key") == (True, "1")
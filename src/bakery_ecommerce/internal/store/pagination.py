@@ -0,0 +1,103 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import Select, bindparam, tuple_
+
+_Page_T = TypeVar("_Page_T")
+
+
+class InvalidCursorException(ValueError):
+    pass
+
+
+@dataclass
+class Page(Generic[_Page_T]):
+    items: Sequence[_Page_T]
+    next_cursor: str | None
+
+
+class KeysetPagination:
+    """
+    Cursor pages of a select ordered by the key columns, the last of which
+    must be unique (the id). A page continues after the key of the previous
+    page last row, `WHERE (key...) > (cursor...)`, so with an index on the
+    key columns any page costs the same as the first one.
+
+    The first page and the next pages statements are built once and take the
+    cursor and the limit as bind parameters.
+    """
+
+    def __init__(self, stmt: Select, *columns: Any, descending: bool = False):
+        self.__columns = columns
+
+        order_by = [column.desc() if descending else column for column in columns]
+        first = stmt.order_by(*order_by).limit(bindparam("keyset_limit"))
+
+        keys = [
+            bindparam(f"keyset_{i}", type_=column.type)
+            for i, column in enumerate(columns)
+        ]
+        key_columns, key_values = columns[0], keys[0]
+        if len(columns) > 1:
+            key_columns, key_values = tuple_(*columns), tuple_(*keys)
+        after = key_columns < key_values if descending else key_columns > key_values
+
+        self.__first = first
+        self.__after = first.where(after)
+
+    def statement(self, cursor: str | None, page_size: int) -> tuple[Select, dict]:
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1 got: {page_size}")
+
+        # One more row than asked tells whether there is a next page
+        params: dict[str, Any] = {"keyset_limit": page_size + 1}
+        if not cursor:
+            return self.__first, params
+
+        for i, value in enumerate(self.decode(cursor)):
+            params[f"keyset_{i}"] = value
+        return self.__after, params
+
+    def page(self, rows: Sequence[_Page_T], page_size: int) -> Page[_Page_T]:
+        if len(rows) <= page_size:
+            return Page(rows, None)
+        rows = rows[:page_size]
+        return Page(rows, self.encode(rows[-1]))
+
+    def encode(self, row: Any) -> str:
+        values = [_dump(getattr(row, column.key)) for column in self.__columns]
+        cursor = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(cursor).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if not isinstance(values, list) or len(values) != len(self.__columns):
+                raise ValueError("cursor size mismatch")
+            return [
+                _load(column, value) for column, value in zip(self.__columns, values)
+            ]
+        except (ValueError, TypeError, AttributeError) as e:
+            raise InvalidCursorException(f"Invalid cursor {cursor}. Err: {e}") from e
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _load(column: Any, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
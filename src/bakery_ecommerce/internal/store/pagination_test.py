@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import DateTime, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from bakery_ecommerce.internal.store.pagination import (
+    InvalidCursorException,
+    KeysetPagination,
+)
+
+
+class Base(DeclarativeBase): ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+def items(count: int) -> list[Item]:
+    return [
+        Item(id=uuid.uuid4(), created_at=datetime(2024, 1, 1, 0, 0, i))
+        for i in range(count)
+    ]
+
+
+def test_keyset_pagination_first_page():
+    pages = KeysetPagination(select(Item), Item.created_at, Item.id)
+
+    stmt, params = pages.statement(None, 2)
+
+    assert params == {"keyset_limit": 3}
+    assert "WHERE" not in str(stmt)
+    assert pages.page(items(2), 2).next_cursor is None
+
+
+def test_keyset_pagination_next_page():
+    pages = KeysetPagination(select(Item), Item.created_at, Item.id)
+    rows = items(3)
+
+    page = pages.page(rows, 2)
+    assert page.items == rows[:2]
+    assert page.next_cursor
+
+    stmt, params = pages.statement(page.next_cursor, 2)
+    assert "(items.created_at, items.id) >" in str(stmt)
+    assert params["keyset_0"] == rows[1].created_at
+    assert params["keyset_1"] == rows[1].id
+
+
+def test_keyset_pagination_descending():
+    pages = KeysetPagination(select(Item), Item.id, descending=True)
+    [row] = items(1)
+
+    stmt, params = pages.statement(pages.encode(row), 10)
+
+    assert "items.id <" in str(stmt)
+    assert params["keyset_0"] == row.id
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4Il0"])
+def test_keyset_pagination_invalid_cursor(cursor: str):
+    pages = KeysetPagination(select(Item), Item.created_at, Item.id)
+
+    with pytest.raises(InvalidCursorException):
+        pages.statement(cursor, 10)
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_keyset_pagination_invalid_page_size(page_size: int):
+    pages = KeysetPagination(select(Item), Item.created_at, Item.id)
+
+    with pytest.raises(ValueError):
+        pages.statement(None, page_size)
@@ -6,16 +6,31 @@ And remove that repository pattern
 The QueryProcessor Mediator pattern allow to not know a concrete query handler type
 """
 
+import asyncio
 import inspect
 from abc import ABC, abstractmethod
-from typing import Generic, Protocol, Type, TypeVar, TypeAlias, runtime_checkable
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Protocol,
+    Type,
+    TypeVar,
+    TypeAlias,
+    runtime_checkable,
+)
 
+import nats.errors
+from nats.js import JetStreamContext
 from nats.js.api import KeyValueConfig
-from nats.js.errors import BucketNotFoundError
+from nats.js.errors import BucketNotFoundError, KeyNotFoundError
 from nats.js.kv import KeyValue
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nats.aio.client import Client as NATS
+from bakery_ecommerce.internal.store.instrumentation import QueryInstrumentation
+from bakery_ecommerce.internal.store.local_cache import LocalQueryCache
+from bakery_ecommerce.internal.store.query_memo import QueryMemo, QueryMemoKeyProtocol
+from bakery_ecommerce.internal.store.single_flight import SingleFlight
 
 QueryResult_T = TypeVar(
     "QueryResult_T",
@@ -35,6 +50,16 @@ class QueryCacheKeyProtocol(Protocol[QueryResult_T]):
     def cache_deserialize(self, value: str) -> QueryResult_T: ...
 
 
+@runtime_checkable
+class QueryNegativeCacheProtocol(Protocol):
+    """
+    Opt-in for cacheable queries that may return None, the None is kept in the
+    in-process cache for a short ttl so missing rows don't hit the database.
+    """
+
+    def cache_negative_ttl(self) -> float: ...
+
+
 Query_T = TypeVar("Query_T", bound=Query)
 
 
@@ -47,34 +72,110 @@ class QueryHandler(ABC, Generic[Query_T, QueryResult_T]):
     async def handle(self, query: Query_T) -> QueryResult_T: ...
 
 
+class KeyValueBuckets:
+    """
+    Bucket handles of one JetStream context, resolved once and reused so a
+    cache lookup costs a single KV get.
+    """
+
+    def __init__(self, js: JetStreamContext, configs: list[KeyValueConfig]) -> None:
+        self.__js = js
+        self.__configs = configs
+        self.__buckets = dict[str, KeyValue]()
+        self.__lock = asyncio.Lock()
+
+    async def create_all(self):
+        for config in self.__configs:
+            await self.get(config)
+
+    async def get(self, config: KeyValueConfig) -> KeyValue:
+        if bucket := self.__buckets.get(config.bucket):
+            return bucket
+
+        async with self.__lock:
+            if bucket := self.__buckets.get(config.bucket):
+                return bucket
+
+            if config not in self.__configs:
+                print(f"Cache bucket {config.bucket} is not registered at startup")
+
+            try:
+                bucket = await self.__js.key_value(config.bucket)
+            except BucketNotFoundError:
+                bucket = await self.__js.create_key_value(config)
+
+            self.__buckets[config.bucket] = bucket
+            return bucket
+
+
 class QueryCache:
-    def __init__(self, nats: NATS) -> None:
-        self.__js = nats.jetstream()
+    """
+    Reads go to the in-process cache first and fall back to the NATS KV bucket,
+    a KV hit fills the in-process cache for the next request.
+    """
+
+    def __init__(
+        self,
+        buckets: KeyValueBuckets,
+        local: LocalQueryCache | None = None,
+        instrumentation: QueryInstrumentation | None = None,
+    ) -> None:
+        self.__buckets = buckets
+        self.__local = local
+        self.__instrumentation = instrumentation
 
     async def get_cache_or_none(
         self, query: Query[QueryResult_T]
     ) -> QueryResult_T | None:
+        _, value = await self.lookup(query)
+        return value
+
+    async def lookup(
+        self, query: Query[QueryResult_T]
+    ) -> tuple[bool, QueryResult_T | None]:
+        """
+        Returns whether the query result is cached, a cached result may be a
+        negative None entry.
+        """
         cacheable_query = isinstance(query, QueryCacheKeyProtocol)
         if not cacheable_query:
-            return None
+            return False, None
+
+        config = query.cache_config()
+        if self.__local:
+            found, local_value = self.__local.lookup(config.bucket, query.cache_key())
+            if found:
+                self.__record(QueryInstrumentation.record_cache_hit, query)
+                if local_value is None:
+                    return True, None
+                return True, query.cache_deserialize(local_value)
 
         try:
-            bucket = await self.__create_or_get_kv_bucket(query.cache_config())
+            bucket = await self.__buckets.get(config)
             kv = await bucket.get(query.cache_key())
 
             if kv.value is None:
-                return None
+                self.__record(QueryInstrumentation.record_cache_miss, query)
+                return False, None
 
             # TODO: Too much unsafe place
             value = query.cache_deserialize(kv.value.decode())
             assert value
             print(f"Get from cache bucket {query.cache_key()} data: {value}")
-            return value
-        except BucketNotFoundError:
-            return None
+
+            if self.__local:
+                self.__local.set(
+                    config.bucket, query.cache_key(), kv.value.decode(), config.ttl
+                )
+            self.__record(QueryInstrumentation.record_cache_hit, query)
+            return True, value
+        except (BucketNotFoundError, KeyNotFoundError):
+            self.__record(QueryInstrumentation.record_cache_miss, query)
+            return False, None
         except Exception as e:
             print(f"Bucket error nats {e}")
-            return None
+            self.__record(QueryInstrumentation.record_cache_error, query)
+            return False, None
 
     async def set_cache(
         self, query: Query[QueryResult_T], value: QueryResult_T
@@ -83,45 +184,182 @@ class QueryCache:
         if not cacheable_query:
             return None
 
+        if value is None and isinstance(query, QueryNegativeCacheProtocol):
+            if self.__local:
+                self.__local.set(
+                    query.cache_config().bucket,
+                    query.cache_key(),
+                    None,
+                    query.cache_negative_ttl(),
+                )
+            return None
+
         try:
-            bucket = await self.__create_or_get_kv_bucket(query.cache_config())
-            data = query.cache_serialize(value).encode()
+            config = query.cache_config()
+            data = query.cache_serialize(value)
+            if self.__local:
+                self.__local.set(config.bucket, query.cache_key(), data, config.ttl)
+
+            bucket = await self.__buckets.get(config)
             print(f"Store in cache bucket {query.cache_key()} data: {data}")
-            return await bucket.put(query.cache_key(), data)
+            return await bucket.put(query.cache_key(), data.encode())
         except Exception as e:
             print(f"Unable store cache for {query}. Err: {e}")
+            self.__record(QueryInstrumentation.record_cache_error, query)
             return None
 
-    async def __create_or_get_kv_bucket(self, config: KeyValueConfig) -> KeyValue:
-        try:
-            return await self.__js.key_value(config.bucket)
-        except BucketNotFoundError:
-            return await self.__js.create_key_value(config)
+    def __record(
+        self, record: Callable[[QueryInstrumentation, Any], None], query: Query
+    ):
+        if self.__instrumentation:
+            record(self.__instrumentation, query)
+
+
+class QueryCacheWatcher:
+    """
+    Watches every cache bucket and applies KV writes made by any node to the
+    in-process cache, a put refreshes a cached entry, a delete or purge evicts it.
+    """
+
+    def __init__(
+        self,
+        buckets: KeyValueBuckets,
+        local: LocalQueryCache,
+        configs: list[KeyValueConfig],
+        retry_delay: float = 2.0,
+    ) -> None:
+        self.__buckets = buckets
+        self.__local = local
+        self.__configs = configs
+        self.__retry_delay = retry_delay
+        self.__tasks = list[asyncio.Task]()
+        self.__stopped = asyncio.Event()
+
+    def start(self):
+        self.__stopped.clear()
+        for config in self.__configs:
+            self.__tasks.append(asyncio.create_task(self.__watch(config)))
+
+    async def stop(self):
+        self.__stopped.set()
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks.clear()
+
+    async def __watch(self, config: KeyValueConfig):
+        while not self.__stopped.is_set():
+            watcher = None
+            try:
+                bucket = await self.__buckets.get(config)
+                watcher = await bucket.watchall()
+                # Writes may have been missed while the watch was down
+                self.__local.clear(config.bucket)
+                print(f"Watch cache bucket {config.bucket}")
+
+                while not self.__stopped.is_set():
+                    try:
+                        entry = await watcher.updates(timeout=5.0)
+                    except nats.errors.TimeoutError:
+                        continue
+
+                    # The None marker ends the replay of current values
+                    if entry is None:
+                        continue
+                    self.__apply(config, entry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Cache bucket {config.bucket} watch error: {e}")
+                self.__local.clear(config.bucket)
+                await asyncio.sleep(self.__retry_delay)
+            finally:
+                if watcher:
+                    try:
+                        await watcher.stop()
+                    except Exception:
+                        pass
+
+    def __apply(self, config: KeyValueConfig, entry: KeyValue.Entry):
+        if entry.operation in ("DEL", "PURGE") or entry.value is None:
+            self.__local.delete(config.bucket, entry.key)
+            return
+        self.__local.replace(config.bucket, entry.key, entry.value.decode(), config.ttl)
 
 
 QueryProcessorHandlers: TypeAlias = dict[type[Query], type[QueryHandler]]
 
 
 class QueryProcessor:
-    def __init__(self, handlers: QueryProcessorHandlers, cache: QueryCache):
+    def __init__(
+        self,
+        handlers: QueryProcessorHandlers,
+        cache: QueryCache,
+        single_flight: SingleFlight | None = None,
+        instrumentation: QueryInstrumentation | None = None,
+        memo: QueryMemo | None = None,
+    ):
         self.__handlers = handlers
         self.__cache = cache
+        self.__single_flight = single_flight
+        self.__instrumentation = instrumentation
+        self.__memo = memo
 
     async def process(
         self, executor: AsyncSession, query: Query[QueryResult_T]
+    ) -> QueryResult_T:
+        if self.__instrumentation:
+            self.__instrumentation.record_call(query)
+
+        if not self.__memo:
+            return await self.__process_shared(executor, query)
+
+        # Every session of the request is watched, so writes made outside of
+        # the processor invalidate the memo too
+        self.__memo.watch(executor)
+        if not isinstance(query, QueryMemoKeyProtocol):
+            return await self.__process_shared(executor, query)
+
+        found, value = self.__memo.get(query)
+        if found:
+            return value
+
+        value = await self.__process_shared(executor, query)
+        self.__memo.set(query, value)
+        return value
+
+    async def __process_shared(
+        self, executor: AsyncSession, query: Query[QueryResult_T]
+    ) -> QueryResult_T:
+        if self.__single_flight and isinstance(query, QueryCacheKeyProtocol):
+            # Concurrent misses of one key wait for a single handler execution
+            # instead of each of them querying the database and writing the KV
+            key = f"{query.cache_config().bucket}.{query.cache_key()}"
+            return await self.__single_flight.do(
+                key, lambda: self.__process(executor, query)
+            )
+
+        return await self.__process(executor, query)
+
+    async def __process(
+        self, executor: AsyncSession, query: Query[QueryResult_T]
     ) -> QueryResult_T:
         query_type = type(query)
 
-        cache_result = await self.__cache.get_cache_or_none(query)
-        if cache_result is not None:
-            return cache_result
+        cached, cache_result = await self.__cache.lookup(query)
+        if cached:
+            return cache_result  # pyright: ignore
 
         handler_type = self.__handlers.get(query_type)
         if not handler_type:
             raise ValueError(f"No handler found for query type {query_type}")
 
         handler = handler_type(executor)
-        value = await handler.handle(query)
+        if self.__instrumentation:
+            with self.__instrumentation.handler(query):
+                value = await handler.handle(query)
+        else:
+            value = await handler.handle(query)
 
         if isinstance(query, QueryCacheKeyProtocol):
             await self.__cache.set_cache(query, value)
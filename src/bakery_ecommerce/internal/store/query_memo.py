@@ -0,0 +1,84 @@
+import weakref
+from itertools import chain
+from typing import Any, Hashable, Protocol, runtime_checkable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+
+@runtime_checkable
+class QueryMemoKeyProtocol(Protocol):
+    def memo_key(self) -> Hashable | None: ...
+    def memo_model(self) -> type | None: ...
+
+
+class QueryMemo:
+    """
+    Request-scoped memo of read queries, keyed by query type and memo_key().
+
+    Entries of a model are dropped when a session the memo has seen writes to
+    that model, or to a model it has a relationship with, so an Order is read
+    again once its order items change.
+    """
+
+    def __init__(self) -> None:
+        self.__entries = dict[type, dict[Hashable, Any]]()
+        self.__sessions = weakref.WeakSet[Session]()
+        self.__hits = 0
+
+    def hits(self) -> int:
+        return self.__hits
+
+    def get(self, query: QueryMemoKeyProtocol) -> tuple[bool, Any]:
+        model, key = query.memo_model(), query.memo_key()
+        if model is None or key is None:
+            return False, None
+
+        entries = self.__entries.get(model)
+        if entries is None:
+            return False, None
+
+        key = (type(query), key)
+        if key not in entries:
+            return False, None
+
+        self.__hits += 1
+        return True, entries[key]
+
+    def set(self, query: QueryMemoKeyProtocol, value: Any):
+        model, key = query.memo_model(), query.memo_key()
+        if model is None or key is None:
+            return
+        self.__entries.setdefault(model, {})[(type(query), key)] = value
+
+    def invalidate(self, model: type):
+        for memo_model in list(self.__entries.keys()):
+            if memo_model is model or _has_relationship(memo_model, model):
+                del self.__entries[memo_model]
+
+    def watch(self, session: AsyncSession):
+        sync_session = session.sync_session
+        if sync_session in self.__sessions:
+            return
+        self.__sessions.add(sync_session)
+
+        event.listen(sync_session, "after_flush", self.__after_flush)
+        event.listen(sync_session, "do_orm_execute", self.__do_orm_execute)
+
+    def __after_flush(self, session: Session, _):
+        for instance in chain(session.new, session.dirty, session.deleted):
+            self.invalidate(type(instance))
+
+    def __do_orm_execute(self, state: ORMExecuteState):
+        if state.is_insert or state.is_update or state.is_delete:
+            for mapper in state.all_mappers:
+                self.invalidate(mapper.class_)
+
+
+def _has_relationship(model: type, target: type) -> bool:
+    try:
+        relationships = inspect(model).relationships
+    except Exception:
+        return False
+    return any(relationship.mapper.class_ is target for relationship in relationships)
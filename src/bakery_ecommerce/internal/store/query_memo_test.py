@@ -0,0 +1,76 @@
+from sqlalchemy import ForeignKey, create_engine, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+
+from bakery_ecommerce.internal.store.query_memo import QueryMemo
+
+
+class Base(DeclarativeBase): ...
+
+
+class Parent(Base):
+    __tablename__ = "parents"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    children: Mapped[list["Child"]] = relationship()
+
+
+class Child(Base):
+    __tablename__ = "children"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("parents.id"))
+
+
+class GetById:
+    def __init__(self, model: type, id: int) -> None:
+        self.model = model
+        self.id = id
+
+    def memo_key(self):
+        return ("id", self.id)
+
+    def memo_model(self):
+        return self.model
+
+
+class FakeAsyncSession:
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+
+def test_query_memo_invalidate_on_write():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        memo = QueryMemo()
+        memo.watch(FakeAsyncSession(session))  # pyright: ignore
+
+        parent = Parent(id=1)
+        session.add(parent)
+        session.flush()
+
+        memo.set(GetById(Parent, 1), parent)
+        memo.set(GetById(Child, 1), None)
+        assert memo.get(GetById(Parent, 1)) == (True, parent)
+
+        session.add(Child(id=1, parent_id=1))
+        session.flush()
+
+        # A parent relationship loads children, so it is stale as well
+        assert memo.get(GetById(Parent, 1)) == (False, None)
+        assert memo.get(GetById(Child, 1)) == (False, None)
+
+        memo.set(GetById(Child, 1), None)
+        session.execute(update(Child).where(Child.id == 1).values(parent_id=1))
+        assert memo.get(GetById(Child, 1)) == (False, None)
+
+
+def test_query_memo_keep_unrelated():
+    memo = QueryMemo()
+    memo.set(GetById(Child, 1), "child")
+
+    memo.invalidate(Parent)
+
+    assert memo.get(GetById(Child, 1)) == (True, "child")
+    assert memo.hits() == 1
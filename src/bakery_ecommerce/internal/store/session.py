@@ -1,7 +1,11 @@
+import asyncio
 import contextlib
 import os
+import time
+from dataclasses import dataclass
 from typing import AsyncIterator, Any
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -26,24 +30,100 @@ class PostgresDatabaseConfig:
         self.__database = env("DB_DATABASE", "postgres")
 
     def get_uri(self) -> str:
+        return self.__uri(self.__host, self.__port)
+
+    def get_replica_uris(self) -> list[str]:
+        """
+        Replicas from DB_REPLICA_HOSTS, comma separated host[:port] entries that
+        share the primary credentials and database.
+        """
+        uris = list[str]()
+        for replica in env("DB_REPLICA_HOSTS").split(","):
+            if not (replica := replica.strip()):
+                continue
+            host, _, port = replica.partition(":")
+            uris.append(self.__uri(host, port or self.__port))
+        return uris
+
+    def __uri(self, host: str, port: str) -> str:
         return "%s://%s:%s@%s:%s/%s" % (
             self.__provider,
             self.__username,
             self.__password,
-            self.__host,
-            self.__port,
+            host,
+            port,
             self.__database,
         )
 
 
+# Zero when the replica replayed everything it received, an idle primary
+# would otherwise look like a lagging replica
+_replica_lag_sql = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+@dataclass
+class ReplicaStatus:
+    host: str
+    healthy: bool
+    lag: float | None
+    error: str | None = None
+
+
+class _Replica:
+    def __init__(self, uri: str, engine_kwargs: dict[str, Any]) -> None:
+        self.engine = create_async_engine(uri, **engine_kwargs)
+        self.session_maker = async_sessionmaker(
+            self.engine, autoflush=False, expire_on_commit=False
+        )
+        self.status = ReplicaStatus(self.engine.url.host or uri, False, None)
+        self.checked_at: float | None = None
+        self.lock = asyncio.Lock()
+
+    async def check(self, max_lag: float, timeout: float):
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    lag = float((await conn.execute(_replica_lag_sql)).scalar_one())
+            self.status.lag = lag
+            self.status.healthy = lag <= max_lag
+            self.status.error = None
+        except Exception as e:
+            self.status.healthy = False
+            self.status.error = str(e) or type(e).__name__
+        self.checked_at = time.monotonic()
+
+
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}) -> None:
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        replica_hosts: list[str] = [],
+        max_replica_lag: float = 5.0,
+        replica_check_interval: float = 5.0,
+        replica_check_timeout: float = 1.0,
+    ) -> None:
         # TODO: Is the engine will contain a pool ???
         self.__engine: AsyncEngine | None = create_async_engine(host, **engine_kwargs)
         self.__session_maker: async_sessionmaker[AsyncSession] | None = (
             async_sessionmaker(self.__engine, autoflush=False, expire_on_commit=False)
         )
 
+        self.__replicas = [_Replica(uri, engine_kwargs) for uri in replica_hosts]
+        self.__replica_index = 0
+        self.__max_replica_lag = max_replica_lag
+        self.__replica_check_interval = replica_check_interval
+        self.__replica_check_timeout = replica_check_timeout
+
     def is_closed(self) -> bool:
         return self.__engine is None
 
@@ -51,6 +131,8 @@ class DatabaseSessionManager:
         if not self.__engine:
             raise Exception("DatabaseSessionManager is not initialized")
         await self.__engine.dispose()
+        for replica in self.__replicas:
+            await replica.engine.dispose()
 
         self.__engine = None
         self.__session_maker = None
@@ -81,7 +163,59 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_tx(self) -> AsyncIterator[AsyncSession]:
+        session_maker = await self.read_session_maker()
+        async with session_maker.begin() as conn:
+            try:
+                yield conn
+            except Exception as e:
+                await conn.rollback()
+                raise e
+
+    async def read_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """
+        Session maker of the next replica in round-robin order whose lag is
+        within max_replica_lag, or of the primary when none is.
+        """
+        for _ in range(len(self.__replicas)):
+            replica = self.__replicas[self.__replica_index]
+            self.__replica_index = (self.__replica_index + 1) % len(self.__replicas)
+
+            await self.__refresh_replica(replica)
+            if replica.status.healthy:
+                return replica.session_maker
+
+        return self.session_maker()
+
+    def replica_statuses(self) -> list[ReplicaStatus]:
+        return [replica.status for replica in self.__replicas]
+
+    def engine(self) -> AsyncEngine:
+        if not self.__engine:
+            raise Exception("DatabaseSessionManager is not initialized")
+        return self.__engine
+
+    def replica_engines(self) -> list[AsyncEngine]:
+        return [replica.engine for replica in self.__replicas]
+
     def session_maker(self) -> async_sessionmaker[AsyncSession]:
         if not self.__engine or not self.__session_maker:
             raise Exception("DatabaseSessionManager is not initialized")
         return self.__session_maker
+
+    async def __refresh_replica(self, replica: _Replica):
+        if replica.checked_at is not None:
+            if time.monotonic() - replica.checked_at < self.__replica_check_interval:
+                return
+            # Somebody is checking it already, use the last known status
+            if replica.lock.locked():
+                return
+
+        async with replica.lock:
+            if replica.checked_at is None or (
+                time.monotonic() - replica.checked_at >= self.__replica_check_interval
+            ):
+                await replica.check(
+                    self.__max_replica_lag, self.__replica_check_timeout
+                )
@@ -0,0 +1,58 @@
+import asyncio
+import copy
+from typing import Any, Callable, Coroutine, TypeVar
+
+_SingleFlightResult_T = TypeVar("_SingleFlightResult_T")
+
+
+class SingleFlight:
+    """
+    Process-wide coalescing of concurrent calls with the same key, the first
+    caller runs the call and the others await its result or its error.
+
+    Each waiter gets a deep copy of the result, so a caller mutating it
+    doesn't change what the others see.
+    """
+
+    def __init__(self) -> None:
+        self.__calls = dict[str, asyncio.Future]()
+        self.__shared = 0
+
+    def in_flight(self) -> int:
+        return len(self.__calls)
+
+    def shared(self) -> int:
+        return self.__shared
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Coroutine[Any, Any, _SingleFlightResult_T]],
+    ) -> _SingleFlightResult_T:
+        if future := self.__calls.get(key):
+            self.__shared += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                # The caller running the call was cancelled, not this one
+                if future.cancelled():
+                    return await self.do(key, fn)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self.__calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved, nobody may be waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.__calls[key]
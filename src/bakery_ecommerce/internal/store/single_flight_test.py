@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from bakery_ecommerce.internal.store.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesce_calls():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(single_flight.do("key", load) for _ in range(5)))
+
+    assert results == [1, 1, 1, 1, 1]
+    assert calls == 1
+    assert single_flight.shared() == 4
+    assert single_flight.in_flight() == 0
+
+    assert await single_flight.do("key", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiters_get_copies():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return {"keys": ["a"]}
+
+    leader, *waiters = await asyncio.gather(
+        *(single_flight.do("key", load) for _ in range(3))
+    )
+    leader["keys"].append("b")
+
+    assert all(waiter == {"keys": ["a"]} for waiter in waiters)
+    assert waiters[0] is not waiters[1]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_share_error():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError("load error")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", load) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_leader_cancelled():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    leader = asyncio.create_task(single_flight.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.do("key", load))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == 2
@@ -0,0 +1,45 @@
+from typing import Callable, Hashable, TypeVar
+
+_Statement_T = TypeVar("_Statement_T")
+
+
+class StatementCache:
+    """
+    Statements built once per key and executed with bind parameters.
+
+    A statement object memoizes its SQLAlchemy cache key, so reusing it skips
+    both the construction and the cache key generation, the compiled form is
+    then found in the engine compiled cache. Values must go through
+    `bindparam`, a literal in the statement would be shared by every caller.
+    """
+
+    def __init__(self) -> None:
+        self.__statements = dict[Hashable, object]()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], _Statement_T]) -> _Statement_T:
+        if (stmt := self.__statements.get(key)) is not None:
+            self.__hits += 1
+            return stmt  # pyright: ignore
+
+        self.__misses += 1
+        stmt = self.__statements[key] = factory()
+        return stmt
+
+    def hits(self) -> int:
+        return self.__hits
+
+    def misses(self) -> int:
+        return self.__misses
+
+    def size(self) -> int:
+        return len(self.__statements)
+
+    def clear(self):
+        self.__statements.clear()
+
+
+# Keys are built from models and column names, so the cache is bounded by the
+# schema
+statement_cache = StatementCache()
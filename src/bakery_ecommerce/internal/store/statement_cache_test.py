@@ -0,0 +1,42 @@
+import uuid
+
+from sqlalchemy import String, bindparam, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from bakery_ecommerce.internal.store.statement_cache import StatementCache
+
+
+class Base(DeclarativeBase): ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+
+
+def test_statement_cache_build_once_per_key():
+    cache = StatementCache()
+    built = list[str]()
+
+    def factory(field: str):
+        built.append(field)
+        return select(Item).where(getattr(Item, field) == bindparam("value"))
+
+    first = cache.get((Item, "get", "id"), lambda: factory("id"))
+    second = cache.get((Item, "get", "id"), lambda: factory("id"))
+    other = cache.get((Item, "get", "name"), lambda: factory("name"))
+
+    assert first is second
+    assert other is not first
+    assert built == ["id", "name"]
+    assert (cache.hits(), cache.misses(), cache.size()) == (1, 2, 2)
+
+
+def test_statement_cache_reuse_cache_key():
+    cache = StatementCache()
+    stmt = cache.get("item", lambda: select(Item).where(Item.id == bindparam("value")))
+
+    # Memoized on the statement, so a cached statement skips key generation
+    assert stmt._generate_cache_key() is stmt._generate_cache_key()
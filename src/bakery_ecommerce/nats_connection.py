@@ -0,0 +1,124 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import nats
+from nats.aio.client import Client as NATS
+from nats.js import JetStreamContext
+
+
+class NatsConnectionClosedError(Exception): ...
+
+
+@dataclass
+class NatsHealth:
+    connected: bool
+    server: str | None
+    latency_ms: float | None
+    reconnects: int
+    error: str | None = None
+
+
+class NatsConnection:
+    """
+    Process-wide NATS client shared by every request.
+
+    The connection is opened once by the app lifespan and relies on the
+    nats-py reconnect loop, so a request never pays the TCP + INFO/CONNECT
+    handshake. The JetStream context is created once and reused.
+    """
+
+    def __init__(
+        self,
+        servers: str | list[str],
+        name: str | None = None,
+        max_reconnect_attempts: int = -1,
+        reconnect_time_wait: float = 2.0,
+    ) -> None:
+        self.__servers = servers
+        self.__name = name
+        self.__max_reconnect_attempts = max_reconnect_attempts
+        self.__reconnect_time_wait = reconnect_time_wait
+
+        self.__nc: NATS | None = None
+        self.__js: JetStreamContext | None = None
+        self.__lock = asyncio.Lock()
+        self.__reconnects = 0
+
+    async def connect(self) -> NATS:
+        async with self.__lock:
+            if self.__nc and not self.__nc.is_closed:
+                return self.__nc
+
+            self.__nc = await nats.connect(
+                self.__servers,
+                name=self.__name,
+                max_reconnect_attempts=self.__max_reconnect_attempts,
+                reconnect_time_wait=self.__reconnect_time_wait,
+                disconnected_cb=self.__disconnected_cb,
+                reconnected_cb=self.__reconnected_cb,
+                error_cb=self.__error_cb,
+                closed_cb=self.__closed_cb,
+            )
+            self.__js = self.__nc.jetstream()
+            print(f"{self.__name} | connected {self.__nc.connected_url}")
+            return self.__nc
+
+    def client(self) -> NATS:
+        if not self.__nc or self.__nc.is_closed:
+            raise NatsConnectionClosedError(
+                f"{self.__name} | NATS connection is not established"
+            )
+        return self.__nc
+
+    def jetstream(self) -> JetStreamContext:
+        self.client()
+        assert self.__js
+        return self.__js
+
+    def reconnects(self) -> int:
+        return self.__reconnects
+
+    def is_connected(self) -> bool:
+        return self.__nc is not None and self.__nc.is_connected
+
+    async def health(self, timeout: float = 1.0) -> NatsHealth:
+        if not self.__nc or self.__nc.is_closed:
+            return NatsHealth(False, None, None, self.__reconnects, "closed")
+
+        server = str(self.__nc.connected_url) if self.__nc.connected_url else None
+        try:
+            start = time.perf_counter()
+            await self.__nc.flush(timeout)
+            latency_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            return NatsHealth(
+                self.__nc.is_connected, server, None, self.__reconnects, str(e)
+            )
+
+        return NatsHealth(self.__nc.is_connected, server, latency_ms, self.__reconnects)
+
+    async def close(self):
+        async with self.__lock:
+            if not self.__nc or self.__nc.is_closed:
+                return
+            try:
+                await self.__nc.drain()
+            except Exception as e:
+                print(f"{self.__name} | drain error: {e}")
+                await self.__nc.close()
+            self.__js = None
+
+    async def __disconnected_cb(self):
+        print(f"{self.__name} | disconnected")
+
+    async def __reconnected_cb(self):
+        self.__reconnects += 1
+        assert self.__nc
+        print(f"{self.__name} | reconnected {self.__nc.connected_url}")
+
+    async def __error_cb(self, e: Exception):
+        print(f"{self.__name} | error: {e}")
+
+    async def __closed_cb(self):
+        print(f"{self.__name} | connection closed")
@@ -0,0 +1,112 @@
+"""
+Runs the JetStream consumers apart from the API process.
+
+    python -m bakery_ecommerce.worker --consumers PAYMENTS_STRIPE --processes 2
+
+Push consumers share a deliver group and pull consumers share a durable, so
+any number of processes on any node split the messages between them.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import signal
+
+from dotenv import load_dotenv
+
+# Before dependencies, its settings are read from the environment at import.
+# Spawned processes import this module again, so they load it too
+load_dotenv()
+
+from bakery_ecommerce import dependencies  # noqa: E402
+from bakery_ecommerce.nats_connection import NatsConnection  # noqa: E402
+
+
+async def setup():
+    connection = NatsConnection(dependencies.nats_server, name="bakery_ecommerce_setup")
+    await connection.connect()
+    try:
+        await dependencies.setup_jetstream(connection.jetstream())
+    finally:
+        await connection.close()
+
+
+async def serve(selected: list[str] | None):
+    workers = dependencies.create_consumer_workers(selected)
+    if not workers:
+        print(f"No consumers selected from {dependencies.consumer_names()}")
+        return
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    print(f"Run consumers {[worker.consumer_name for worker in workers]}")
+
+    await stopped.wait()
+
+    for worker in workers:
+        await worker.stop()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    if not dependencies.session_manager.is_closed():
+        await dependencies.session_manager.close()
+
+
+def run_process(selected: list[str] | None):
+    asyncio.run(serve(selected))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bakery_ecommerce.worker")
+    parser.add_argument(
+        "--consumers",
+        nargs="*",
+        help="Consumer or stream names to run, all consumers by default. "
+        f"Available: {', '.join(dependencies.consumer_names())}",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of worker processes, each one runs every selected consumer",
+    )
+    args = parser.parse_args()
+
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+
+    asyncio.run(setup())
+
+    if args.processes == 1:
+        asyncio.run(serve(args.consumers))
+        return
+
+    # The engine pool and NATS sockets must not be shared with forked children
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=run_process, args=(args.consumers,), name=f"worker_{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def terminate(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # The children got the same SIGINT from the terminal, wait for their shutdown
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, override
+
+from nats.aio.client import Client as NATS
+from nats.aio.msg import Msg
+from nats.errors import MsgAlreadyAckdError, TimeoutError as NatsTimeoutError
+from nats.js import JetStreamContext
+from nats.js.api import ConsumerConfig
+
+from bakery_ecommerce.internal.store.query import QueryProcessor
+from bakery_ecommerce.nats_connection import NatsConnection
+
+MessageHandler = Callable[..., Coroutine[Any, Any, None]]
+BatchMessageHandler = Callable[..., Coroutine[Any, Any, None]]
+QueryProcessorFactory = Callable[[NATS], QueryProcessor]
+
+
+@dataclass
+class ConsumerWorkerStats:
+    consumer_name: str
+    running: bool
+    max_in_flight: int
+    in_flight: int
+    connection_reconnects: int
+    resubscribes: int
+    received: int
+    failed: int
+
+
+class ConsumerWorker(ABC):
+    """
+    Keeps one NATS connection and one subscription for the worker lifetime.
+
+    The subscription is only re-created when the connection is closed for good
+    or the bound consumer disappears, the nats-py reconnect loop covers short
+    network failures without dropping the subscription.
+    """
+
+    def __init__(
+        self,
+        connection: NatsConnection,
+        stream: str,
+        consumer: ConsumerConfig,
+        consumer_name: str,
+        queries_factory: QueryProcessorFactory,
+        *args,
+        max_in_flight: int = 1,
+        health_check_interval: float = 30.0,
+        retry_delay: float = 2.0,
+        max_retry_delay: float = 30.0,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self._connection = connection
+        self._stream = stream
+        self._consumer = consumer
+        self._consumer_name = consumer_name
+        self._queries_factory = queries_factory
+        self._args = args
+        self._max_in_flight = max_in_flight
+        self._health_check_interval = health_check_interval
+        self._stopped = asyncio.Event()
+        self._in_flight = set[asyncio.Task]()
+        self._received = 0
+        self._failed = 0
+
+        self.__retry_delay = retry_delay
+        self.__max_retry_delay = max_retry_delay
+        self.__running = False
+        self.__resubscribes = 0
+
+    @property
+    def consumer_name(self) -> str:
+        return self._consumer_name
+
+    def stats(self) -> ConsumerWorkerStats:
+        return ConsumerWorkerStats(
+            consumer_name=self._consumer_name,
+            running=self.__running,
+            max_in_flight=self._max_in_flight,
+            in_flight=len(self._in_flight),
+            connection_reconnects=self._connection.reconnects(),
+            resubscribes=self.__resubscribes,
+            received=self._received,
+            failed=self._failed,
+        )
+
+    async def run(self):
+        delay = self.__retry_delay
+        self.__running = True
+        try:
+            while not self._stopped.is_set():
+                try:
+                    await self._consume()
+                    delay = self.__retry_delay
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.__resubscribes += 1
+                    print(
+                        f"{self._consumer_name} | consumer failure, resubscribe in {delay}s. Err: {e}"
+                    )
+                    await self._sleep_or_stop(delay)
+                    delay = min(delay * 2, self.__max_retry_delay)
+        finally:
+            self.__running = False
+            await self._connection.close()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await self._connection.close()
+
+    @abstractmethod
+    async def _consume(self): ...
+
+    def _check_connection(self, nc: NATS):
+        if nc.is_closed:
+            raise ConnectionError("NATS connection closed")
+
+    async def _check_consumer(self, js: JetStreamContext):
+        if not self._connection.is_connected():
+            # Reconnecting, the nats-py client will restore the subscription
+            return
+        await js.consumer_info(self._stream, self._consumer_name)
+
+    async def _sleep_or_stop(self, delay: float):
+        try:
+            await asyncio.wait_for(self._stopped.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+class PushConsumerWorker(ConsumerWorker):
+    def __init__(
+        self,
+        connection: NatsConnection,
+        stream: str,
+        consumer: ConsumerConfig,
+        consumer_name: str,
+        msg_cb_f: MessageHandler,
+        queries_factory: QueryProcessorFactory,
+        *args,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            connection,
+            stream,
+            consumer,
+            consumer_name,
+            queries_factory,
+            *args,
+            **kwargs,
+        )
+        self.__msg_cb_f = msg_cb_f
+        self.__semaphore = asyncio.Semaphore(self._max_in_flight)
+
+    @override
+    async def _consume(self):
+        nc = await self._connection.connect()
+        js = self._connection.jetstream()
+
+        sub = await js.subscribe_bind(
+            self._stream,
+            consumer=self._consumer_name,
+            config=self._consumer,
+            cb=self.__message_callback(nc),
+            manual_ack=True,
+        )
+        print(f"{self._consumer_name} | subscribed {self._stream}")
+
+        try:
+            while not self._stopped.is_set():
+                await self._sleep_or_stop(self._health_check_interval)
+                if self._stopped.is_set():
+                    break
+                self._check_connection(nc)
+                await self._check_consumer(js)
+        finally:
+            if not nc.is_closed:
+                try:
+                    await sub.unsubscribe()
+                except Exception as e:
+                    print(f"{self._consumer_name} | unsubscribe error: {e}")
+
+    def __message_callback(self, nc: NATS):
+        async def process(msg: Msg):
+            subject = msg.subject
+            reply = msg.reply
+            try:
+                await self.__msg_cb_f(msg, self._queries_factory(nc), *self._args)
+
+            except ValueError as e:
+                await msg.ack()
+                print(
+                    "'{subject} {reply}' | Skip the message catch value error: {error}".format(
+                        subject=subject, reply=reply, error=e
+                    )
+                )
+            except Exception as e:
+                self._failed += 1
+                print(
+                    "'{subject} {reply}' | Error: {error}".format(
+                        subject=subject, reply=reply, error=e
+                    )
+                )
+
+            print(
+                "'{subject} {reply}' | Done ".format(
+                    subject=subject,
+                    reply=reply,
+                )
+            )
+
+        def release(task: asyncio.Task):
+            self._in_flight.discard(task)
+            self.__semaphore.release()
+
+        # nats-py awaits the callback before delivering the next message of the
+        # subscription, so blocking on the semaphore applies backpressure while
+        # up to max_in_flight handlers keep running in their own tasks.
+        async def cb(msg: Msg):
+            self._received += 1
+            print(
+                "'{subject} {reply}' | Received a message".format(
+                    subject=msg.subject,
+                    reply=msg.reply,
+                )
+            )
+            await self.__semaphore.acquire()
+            task = asyncio.create_task(process(msg))
+            self._in_flight.add(task)
+            task.add_done_callback(release)
+
+        return cb
+
+
+class PullConsumerWorker(ConsumerWorker):
+    """
+    Fetches up to batch_size messages, waiting at most max_wait seconds, and
+    hands the whole batch to a handler so it can be applied in one transaction.
+
+    Messages the handler left unacknowledged are acked together once it returns,
+    or nak'ed for redelivery when it raises.
+    """
+
+    def __init__(
+        self,
+        connection: NatsConnection,
+        stream: str,
+        consumer: ConsumerConfig,
+        consumer_name: str,
+        batch_cb_f: BatchMessageHandler,
+        queries_factory: QueryProcessorFactory,
+        *args,
+        batch_size: int = 64,
+        max_wait: float = 1.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            connection,
+            stream,
+            consumer,
+            consumer_name,
+            queries_factory,
+            *args,
+            max_in_flight=batch_size,
+            **kwargs,
+        )
+        self.__batch_cb_f = batch_cb_f
+        self.__batch_size = batch_size
+        self.__max_wait = max_wait
+
+    @override
+    async def _consume(self):
+        nc = await self._connection.connect()
+        js = self._connection.jetstream()
+
+        sub = await js.pull_subscribe_bind(
+            durable=self._consumer_name,
+            stream=self._stream,
+        )
+        print(f"{self._consumer_name} | pull subscribed {self._stream}")
+
+        last_health_check = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                if time.monotonic() - last_health_check > self._health_check_interval:
+                    self._check_connection(nc)
+                    await self._check_consumer(js)
+                    last_health_check = time.monotonic()
+
+                try:
+                    msgs = await sub.fetch(self.__batch_size, timeout=self.__max_wait)
+                except NatsTimeoutError:
+                    continue
+
+                task = asyncio.create_task(self.__process_batch(nc, msgs))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                await asyncio.shield(task)
+        finally:
+            if not nc.is_closed:
+                try:
+                    await sub.unsubscribe()
+                except Exception as e:
+                    print(f"{self._consumer_name} | unsubscribe error: {e}")
+
+    async def __process_batch(self, nc: NATS, msgs: list[Msg]):
+        self._received += len(msgs)
+        print(f"{self._consumer_name} | Received a batch of {len(msgs)} messages")
+
+        try:
+            await self.__batch_cb_f(msgs, self._queries_factory(nc), *self._args)
+        except Exception as e:
+            self._failed += len(msgs)
+            print(f"{self._consumer_name} | Batch error, nak messages: {e}")
+            await asyncio.gather(*(_settle(msg.nak) for msg in msgs))
+            return
+
+        await asyncio.gather(*(_settle(msg.ack) for msg in msgs))
+        print(f"{self._consumer_name} | Done batch of {len(msgs)} messages")
+
+
+async def _settle(settle: Callable[[], Coroutine[Any, Any, None]]):
+    try:
+        await settle()
+    except MsgAlreadyAckdError:
+        pass
+
+
+def per_message_batch_handler(
+    msg_cb_f: MessageHandler, max_in_flight: int = 1
+) -> BatchMessageHandler:
+    """
+    Adapts a single message handler to the pull worker, each message is settled
+    on its own with the same ack/skip rules the push worker applies.
+    """
+
+    async def batch_handler(msgs: list[Msg], queries: QueryProcessor, *args):
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def process(msg: Msg):
+            async with semaphore:
+                try:
+                    await msg_cb_f(msg, queries, *args)
+                except ValueError as e:
+                    print(f"'{msg.subject}' | Skip the message catch value error: {e}")
+                    await _settle(msg.ack)
+                except Exception as e:
+                    print(f"'{msg.subject}' | Error: {e}")
+                    await _settle(msg.nak)
+
+        await asyncio.gather(*(process(msg) for msg in msgs))
+
+    return batch_handler
@@ -3,6 +3,8 @@ from typing import Generic, TypeVar
 from uuid import UUID
 from nats.aio.msg import Msg
 from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from bakery_ecommerce.internal.order.store.order_model import (
@@ -10,7 +12,7 @@ from bakery_ecommerce.internal.order.store.order_model import (
     Order_Status_Enum,
     PaymentDetail,
 )
-from bakery_ecommerce.internal.store.crud_queries import CrudOperation
+from bakery_ecommerce.internal.store.crud_queries import CrudOperation, CustomBuilder
 from bakery_ecommerce.internal.store.query import QueryProcessor
 from bakery_ecommerce.internal.store.session import DatabaseSessionManager
 
@@ -93,3 +95,72 @@ async def charge_succeeded_worker_handler(
             raise ValueError(f"not found order: {order_id}")
 
     await msg.ack()
+
+
+def _parse_batch(
+    msgs: list[Msg], object_type: type[StripeObject_T]
+) -> list[tuple[Msg, StripeEvent[StripeObject_T]]]:
+    parsed = list[tuple[Msg, StripeEvent[StripeObject_T]]]()
+    for msg in msgs:
+        try:
+            parsed.append((msg, StripeEvent[object_type](**loads(msg.data))))
+        except ValueError as e:
+            print(f"'{msg.subject}' | Skip the message catch value error: {e}")
+    return parsed
+
+
+async def payment_intent_created_batch_handler(
+    msgs: list[Msg], queries: QueryProcessor, session_manager: DatabaseSessionManager
+):
+    events = _parse_batch(msgs, PaymentIntentStripeObject)
+    if not events:
+        return
+
+    # Stripe may redeliver an event, the last one for a payment detail wins
+    updates = dict[UUID, dict[str, str]]()
+    for _, event in events:
+        updates[event.data.object.metadata.payment_detail_id] = {
+            "payment_intent": event.data.object.id,
+            "client_secret": event.data.object.client_secret,
+        }
+
+    async def update_payment_details(session: AsyncSession):
+        stmt = select(PaymentDetail.id).where(PaymentDetail.id.in_(updates.keys()))
+        found = set((await session.execute(stmt)).scalars().all())
+        for payment_detail_id in updates.keys() - found:
+            print(f"not found payment detail: {payment_detail_id}")
+
+        if found:
+            await session.execute(
+                update(PaymentDetail),
+                [{"id": id, **updates[id]} for id in found],
+            )
+        return len(found)
+
+    async with session_manager.tx() as session:
+        await queries.process(session, CustomBuilder(update_payment_details))
+
+
+async def charge_succeeded_batch_handler(
+    msgs: list[Msg], queries: QueryProcessor, session_manager: DatabaseSessionManager
+):
+    events = _parse_batch(msgs, BaseStripeObject)
+    if not events:
+        return
+
+    order_ids = {event.data.object.metadata.order_id for _, event in events}
+
+    async def complete_orders(session: AsyncSession):
+        stmt = (
+            update(Order)
+            .where(Order.id.in_(order_ids))
+            .values(order_status=Order_Status_Enum.COMPLETED)
+            .returning(Order.id)
+        )
+        updated = set((await session.execute(stmt)).scalars().all())
+        for order_id in order_ids - updated:
+            print(f"not found order: {order_id}")
+        return len(updated)
+
+    async with session_manager.tx() as session:
+        await queries.process(session, CustomBuilder(complete_orders))
@@ -150,7 +150,7 @@ function useModelSelector({ productsRoute, catalogsRoute, catalogId, catalogItem
     const mutateSelectors = useMutation({
       mutationKey: ["selectors"],
       mutationFn: async (name: string) => {
-        const response = await fetch(`${productsRoute}?name=${name}`, {
+        const response = await fetch(`${productsRoute}?name=${name}&images=false`, {
           headers: {
             "content-type": "application/json",
           }